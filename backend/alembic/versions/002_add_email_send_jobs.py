@@ -0,0 +1,58 @@
+"""Add email_send_jobs table
+
+Revision ID: 002_add_email_send_jobs
+Revises: 001_add_deferred, 001_add_settings, 001_update_lead_status_enum, 1f1edf84ce57
+Create Date: 2026-10-19
+
+Also merges the four independent initial revisions into one head.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002_add_email_send_jobs'
+down_revision: Union[str, Sequence[str], None] = (
+    '001_add_deferred',
+    '001_add_settings',
+    '001_update_lead_status_enum',
+    '1f1edf84ce57',
+)
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'email_send_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('pending', 'running', 'completed', 'failed', name='emailjobstatus'), nullable=False),
+        sa.Column('recipients', sa.Text(), nullable=False),
+        sa.Column('subject_override', sa.String(length=500), nullable=True),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('processed', sa.Integer(), nullable=False),
+        sa.Column('sent', sa.Integer(), nullable=False),
+        sa.Column('skipped', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.String(length=100), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('template_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['template_id'], ['email_templates.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_email_send_jobs_id'), 'email_send_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_email_send_jobs_status'), 'email_send_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_email_send_jobs_template_id'), 'email_send_jobs', ['template_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_email_send_jobs_template_id'), table_name='email_send_jobs')
+    op.drop_index(op.f('ix_email_send_jobs_status'), table_name='email_send_jobs')
+    op.drop_index(op.f('ix_email_send_jobs_id'), table_name='email_send_jobs')
+    op.drop_table('email_send_jobs')
+    sa.Enum(name='emailjobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,57 @@
+"""Add email_outbox table
+
+Revision ID: 003_add_email_outbox
+Revises: 002_add_email_send_jobs
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_add_email_outbox'
+down_revision: Union[str, None] = '002_add_email_send_jobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('pending', 'sending', 'sent', 'dead', name='outboxstatus'), nullable=False),
+        sa.Column('to_email', sa.String(length=255), nullable=False),
+        sa.Column('to_name', sa.String(length=255), nullable=True),
+        sa.Column('subject', sa.String(length=500), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('contact_id', sa.Integer(), nullable=True),
+        sa.Column('template_id', sa.Integer(), nullable=True),
+        sa.Column('send_job_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['template_id'], ['email_templates.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['send_job_id'], ['email_send_jobs.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_email_outbox_id'), 'email_outbox', ['id'], unique=False)
+    op.create_index(op.f('ix_email_outbox_contact_id'), 'email_outbox', ['contact_id'], unique=False)
+    op.create_index(op.f('ix_email_outbox_send_job_id'), 'email_outbox', ['send_job_id'], unique=False)
+    op.create_index('ix_email_outbox_status_next_attempt_at', 'email_outbox', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_outbox_status_next_attempt_at', table_name='email_outbox')
+    op.drop_index(op.f('ix_email_outbox_send_job_id'), table_name='email_outbox')
+    op.drop_index(op.f('ix_email_outbox_contact_id'), table_name='email_outbox')
+    op.drop_index(op.f('ix_email_outbox_id'), table_name='email_outbox')
+    op.drop_table('email_outbox')
+    sa.Enum(name='outboxstatus').drop(op.get_bind(), checkfirst=True)
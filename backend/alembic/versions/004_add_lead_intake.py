@@ -0,0 +1,45 @@
+"""Add lead_intake table
+
+Revision ID: 004_add_lead_intake
+Revises: 003_add_email_outbox
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004_add_lead_intake'
+down_revision: Union[str, None] = '003_add_email_outbox'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'lead_intake',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('pending', 'processing', 'done', 'failed', name='intakestatus'), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('lead_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['lead_id'], ['leads.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_lead_intake_id'), 'lead_intake', ['id'], unique=False)
+    op.create_index('ix_lead_intake_status_id', 'lead_intake', ['status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_lead_intake_status_id', table_name='lead_intake')
+    op.drop_index(op.f('ix_lead_intake_id'), table_name='lead_intake')
+    op.drop_table('lead_intake')
+    sa.Enum(name='intakestatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,49 @@
+"""Add contacts.email_normalized with a partial unique index
+
+Revision ID: 006_add_contact_email_normalized
+Revises: 005_add_submission_keys
+Create Date: 2026-10-19
+
+Existing duplicates (same address ignoring case and surrounding whitespace)
+are left in place; only the oldest contact of each address gets the
+normalized value, so it is the one matched from now on.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006_add_contact_email_normalized'
+down_revision: Union[str, None] = '005_add_submission_keys'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('contacts', sa.Column('email_normalized', sa.String(length=255), nullable=True))
+    op.execute(
+        """
+        UPDATE contacts
+        SET email_normalized = lower(trim(email))
+        WHERE id IN (
+            SELECT min(id) FROM contacts
+            WHERE email IS NOT NULL AND trim(email) <> ''
+            GROUP BY lower(trim(email))
+        )
+        """
+    )
+    op.create_index(
+        'uq_contacts_email_normalized',
+        'contacts',
+        ['email_normalized'],
+        unique=True,
+        postgresql_where=sa.text('email_normalized IS NOT NULL'),
+        sqlite_where=sa.text('email_normalized IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_contacts_email_normalized', table_name='contacts')
+    op.drop_column('contacts', 'email_normalized')
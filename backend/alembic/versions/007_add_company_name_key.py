@@ -0,0 +1,66 @@
+"""Add companies.name_key with a partial unique index
+
+Revision ID: 007_add_company_name_key
+Revises: 006_add_contact_email_normalized
+Create Date: 2026-10-19
+
+Existing companies sharing a key (e.g. "Muster GmbH" and "Muster Gmbh") are
+left in place; only the oldest one gets the key and is matched from now on.
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007_add_company_name_key'
+down_revision: Union[str, None] = '006_add_contact_email_normalized'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of src.models.company.normalize_company_name at this revision
+_LEGAL_FORM = re.compile(
+    r"[\s,]+(gmbh\s*&\s*co\.?\s*kg|ges\.?\s*m\.?\s*b\.?\s*h\.?|gmbh|ag|kg|og|e\.\s*u\.?)$"
+)
+
+
+def _name_key(name):
+    if name is None:
+        return None
+    key = " ".join(name.casefold().split())
+    while (stripped := _LEGAL_FORM.sub("", key)) != key:
+        key = stripped
+    return key.strip(" ,") or None
+
+
+def upgrade() -> None:
+    op.add_column('companies', sa.Column('name_key', sa.String(length=255), nullable=True))
+
+    companies = sa.table('companies', sa.column('id', sa.Integer), sa.column('name', sa.String), sa.column('name_key', sa.String))
+    bind = op.get_bind()
+    keys: dict[str, int] = {}
+    for company_id, name in bind.execute(sa.select(companies.c.id, companies.c.name).order_by(companies.c.id)):
+        key = _name_key(name)
+        if key is not None and key not in keys:
+            keys[key] = company_id
+    if keys:
+        bind.execute(
+            companies.update().where(companies.c.id == sa.bindparam('company_id')).values(name_key=sa.bindparam('key')),
+            [{'company_id': company_id, 'key': key} for key, company_id in keys.items()],
+        )
+
+    op.create_index(
+        'uq_companies_name_key',
+        'companies',
+        ['name_key'],
+        unique=True,
+        postgresql_where=sa.text('name_key IS NOT NULL'),
+        sqlite_where=sa.text('name_key IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_companies_name_key', table_name='companies')
+    op.drop_column('companies', 'name_key')
@@ -0,0 +1,28 @@
+"""Add email_outbox.created_by
+
+Revision ID: 008_add_outbox_created_by
+Revises: 007_add_company_name_key
+Create Date: 2026-10-19
+
+The sender is kept on the message so the contact history entry can be
+written by the delivery worker once SMTP accepts it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008_add_outbox_created_by'
+down_revision: Union[str, None] = '007_add_company_name_key'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('email_outbox', sa.Column('created_by', sa.String(length=100), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('email_outbox', 'created_by')
@@ -0,0 +1,36 @@
+"""Add system_markers table
+
+Revision ID: 009_add_system_markers
+Revises: 008_add_outbox_created_by
+Create Date: 2026-10-19
+
+The startup fingerprint moves here from the settings table, where it was
+listed by the settings API and could be edited or deleted there.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009_add_system_markers'
+down_revision: Union[str, None] = '008_add_outbox_created_by'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'system_markers',
+        sa.Column('key', sa.String(length=100), nullable=False),
+        sa.Column('value', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+    op.execute("DELETE FROM settings WHERE key = 'system.startup_fingerprint'")
+
+
+def downgrade() -> None:
+    op.drop_table('system_markers')
@@ -0,0 +1,33 @@
+"""Add email_send_jobs.last_contact_id and locked_at
+
+Revision ID: 010_add_send_job_resume
+Revises: 009_add_system_markers
+Create Date: 2026-10-19
+
+Running jobs refresh locked_at per batch and record the last contact
+queued, so the send job worker can resume jobs orphaned by a restart.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010_add_send_job_resume'
+down_revision: Union[str, None] = '009_add_system_markers'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'email_send_jobs',
+        sa.Column('last_contact_id', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.add_column('email_send_jobs', sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('email_send_jobs', 'locked_at')
+    op.drop_column('email_send_jobs', 'last_contact_id')
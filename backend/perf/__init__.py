@@ -0,0 +1 @@
+# Performance tooling: benchmarks, budgets and load tests
@@ -0,0 +1,174 @@
+"""Service-level micro-benchmarks with JSON baselines.
+
+Benchmarks are registered with @benchmark in perf.benchmarks. Each one
+receives a session on a database loaded with perf.dataset at a fixed scale
+and returns the callable to time; every round runs in its own session and
+is rolled back, so all rounds see the same data.
+
+Usage:
+    python -m perf.bench run --output perf/baselines/sqlite.json
+    python -m perf.bench run --backend postgresql --pg-url postgresql+asyncpg://... -k search
+    python -m perf.bench compare perf/baselines/sqlite.json perf/results/bench-sqlite.json --threshold 0.1
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from perf.benchmarks import BENCHMARKS
+from perf.dataset import load_dataset
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Fixed data size, so results are comparable across runs
+BENCH_SCALE = 0.1
+
+DEFAULT_THRESHOLD = 0.10
+
+
+async def _time_round(session_factory: async_sessionmaker[AsyncSession], bench: dict) -> float:
+    """Set up and time one round; returns seconds per call."""
+    async with session_factory() as db:
+        args = (db, bench["param"]) if bench["has_param"] else (db,)
+        target = await bench["setup"](*args)
+        started = time.perf_counter()
+        for _ in range(bench["number"]):
+            result = target()
+            if inspect.isawaitable(result):
+                await result
+        elapsed = time.perf_counter() - started
+        await db.rollback()
+    return elapsed / bench["number"]
+
+
+def summarize_timings(timings: list[float]) -> dict:
+    """Statistics of per-call timings, in milliseconds."""
+    return {
+        "rounds": len(timings),
+        "min_ms": round(min(timings) * 1000, 4),
+        "median_ms": round(statistics.median(timings) * 1000, 4),
+        "mean_ms": round(statistics.fmean(timings) * 1000, 4),
+        "stddev_ms": round(statistics.stdev(timings) * 1000, 4) if len(timings) > 1 else 0.0,
+    }
+
+
+async def run_benchmarks(url: str, keyword: Optional[str] = None, scale: float = BENCH_SCALE) -> dict:
+    """
+    Load the dataset into `url` (all tables are recreated) and run the benchmarks.
+
+    Returns:
+        {"meta": ..., "benchmarks": {name: statistics}}.
+    """
+    engine = create_async_engine(url, poolclass=NullPool)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    results = {}
+    try:
+        await load_dataset(engine, scale=scale, recreate=True)
+        for bench in BENCHMARKS:
+            if keyword and keyword not in bench["name"]:
+                continue
+            for _ in range(bench["warmup"]):
+                await _time_round(session_factory, bench)
+            timings = [await _time_round(session_factory, bench) for _ in range(bench["rounds"])]
+            results[bench["name"]] = summarize_timings(timings)
+            print(f"{bench['name']:<40} median {results[bench['name']]['median_ms']:>10.3f} ms")
+    finally:
+        await engine.dispose()
+
+    return {
+        "meta": {
+            "backend": engine.dialect.name,
+            "scale": scale,
+            "python": platform.python_version(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "benchmarks": results,
+    }
+
+
+def compare_benchmarks(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """
+    Compare medians of two runs.
+
+    Returns:
+        One row per benchmark in both runs with the relative change and
+        whether it exceeds the threshold.
+    """
+    rows = []
+    for name, stats in current["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if not before or not before["median_ms"]:
+            continue
+        change = (stats["median_ms"] - before["median_ms"]) / before["median_ms"]
+        rows.append({
+            "name": name,
+            "baseline_ms": before["median_ms"],
+            "current_ms": stats["median_ms"],
+            "change": round(change, 4),
+            "regression": change > threshold,
+        })
+    return rows
+
+
+def _default_url(backend: str, pg_url: Optional[str]) -> str:
+    if backend == "postgresql":
+        url = pg_url or os.environ.get("PG_BENCH_DATABASE_URL")
+        if not url:
+            raise SystemExit("PostgreSQL benchmarks need --pg-url or PG_BENCH_DATABASE_URL")
+        return url
+    return f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmarks and write a JSON result")
+    run.add_argument("--backend", choices=["sqlite", "postgresql"], default="sqlite")
+    run.add_argument("--pg-url", help="disposable PostgreSQL database; all tables are recreated")
+    run.add_argument("-k", dest="keyword", help="only benchmarks whose name contains this")
+    run.add_argument("--output", type=Path, help="result file (default: perf/results/bench-<backend>.json)")
+
+    compare = commands.add_parser("compare", help="flag regressions between two results")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("current", type=Path)
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="relative slowdown, e.g. 0.1")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        url = _default_url(args.backend, args.pg_url)
+        result = asyncio.run(run_benchmarks(url, args.keyword))
+        output = args.output or RESULTS_DIR / f"bench-{args.backend}.json"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(result, indent=2))
+        print(f"Results written to {output}")
+        return 0
+
+    rows = compare_benchmarks(
+        json.loads(args.baseline.read_text()), json.loads(args.current.read_text()), args.threshold
+    )
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"{row['name']:<40} {row['baseline_ms']:>10.3f} -> {row['current_ms']:>10.3f} ms {row['change']:>+7.1%} {flag}")
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
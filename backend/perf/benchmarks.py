@@ -0,0 +1,95 @@
+"""Benchmarks of the hot service functions, run by perf.bench."""
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.templating import CompiledTemplate
+from src.models.company import Company
+from src.models.contact import Contact
+from src.services import contact_service, lead_service, opportunity_service, seed_service, task_service
+
+BENCHMARKS: list[dict] = []
+
+
+def benchmark(
+    rounds: int = 10,
+    warmup: int = 1,
+    number: int = 1,
+    params: Optional[dict] = None,
+) -> Callable:
+    """
+    Register a benchmark.
+
+    The decorated coroutine gets a session (and the parameter value when
+    `params` is given), does its setup and returns the function to time,
+    sync or async. `number` calls are timed together and averaged, for
+    functions too fast to time individually.
+    """
+    def decorator(fn):
+        for label, value in (params or {None: None}).items():
+            BENCHMARKS.append({
+                "name": f"{fn.__name__}[{label}]" if label is not None else fn.__name__,
+                "setup": fn,
+                "param": value,
+                "has_param": label is not None,
+                "rounds": rounds,
+                "warmup": warmup,
+                "number": number,
+            })
+        return fn
+    return decorator
+
+
+IMPORT_SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+TEMPLATE_BODY = (
+    "{{contact.salutation}} {{contact.title}} {{contact.last_name}},\n\n"
+    "vielen Dank für Ihr Interesse an unseren Leistungen für {{company.name}} in {{company.city}}. "
+    "Gerne melden wir uns unter {{contact.phone}} oder {{contact.email}}.\n\n"
+    "Mit freundlichen Grüßen\n" * 3
+)
+
+
+@benchmark(rounds=20)
+async def search_contacts(db: AsyncSession):
+    return lambda: contact_service.search_contacts(db, "grub")
+
+
+@benchmark(rounds=20)
+async def get_leads(db: AsyncSession):
+    return lambda: lead_service.get_leads(db)
+
+
+@benchmark(rounds=20)
+async def get_tasks_overdue(db: AsyncSession):
+    return lambda: task_service.get_tasks(db, is_overdue=True)
+
+
+@benchmark(rounds=20)
+async def get_pipeline_stats(db: AsyncSession):
+    return lambda: opportunity_service.get_pipeline_stats(db)
+
+
+@benchmark(rounds=1, warmup=0, params=IMPORT_SIZES)
+async def import_leads_from_file(db: AsyncSession, rows: int):
+    lines = ["vorname,nachname,email,firma"]
+    lines += [f"Jürgen,Größ{i},bench.import{i}@example.at,Bench GmbH {i % 100}" for i in range(rows)]
+    content = "\n".join(lines).encode()
+    return lambda: lead_service.import_leads_from_file(db, content, "leads.csv")
+
+
+# Target: 100k renders per second, i.e. a median below 0.01 ms
+@benchmark(rounds=20, number=10_000)
+async def render_template(db: AsyncSession):
+    company = Company(name="Alpen Gruber GmbH", city="Wien", website="https://example.at")
+    contact = Contact(
+        first_name="Käthe", last_name="Größ", title="Mag.", salutation="Frau",
+        email="kaethe.groess@example.at", phone="+43 1 234567",
+    )
+    template = CompiledTemplate(TEMPLATE_BODY)
+    return lambda: template.render(contact, company)
+
+
+@benchmark(rounds=10)
+async def seed_lookup_values(db: AsyncSession):
+    return lambda: seed_service.seed_lookup_values(db)
@@ -0,0 +1,394 @@
+"""Synthetic CRM dataset for load tests, benchmarks and plan tests.
+
+Builds companies with Austrian and German addresses, contacts with
+academic titles and umlauts, leads with UTM mixes, opportunities across
+all stages, tasks and contact history. Rows are generated lazily and
+streamed in chunks: PostgreSQL loads them with COPY, other databases with
+bulk INSERTs. The same scale and seed always produce the same rows;
+timestamps are relative to the time of loading.
+
+Scale 1 is about 170k rows; scale 60 is about 10M.
+
+Usage:
+    python -m perf.dataset --scale 1 --seed 42 --recreate
+    python -m perf.dataset --url postgresql+asyncpg://user:pw@localhost:5434/intra_perf --scale 60
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Iterator, Optional
+
+from sqlalchemy import Table, insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.core.database import Base
+from src.models import Setting, LookupValue  # noqa: F401 - needed for metadata
+from src.models.campaign import Campaign
+from src.models.company import Company, normalize_company_name
+from src.models.contact import Contact, normalize_email
+from src.models.contact_history import ContactHistory, HistoryType
+from src.models.lead import Lead, LeadStatus
+from src.models.opportunity import Opportunity, OpportunityStage
+from src.models.task import Task, TaskPriority, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEED = 42
+
+# Rows per table at scale 1; campaigns grow with the square root of the scale
+BASE_SIZES = {
+    "companies": 2_000,
+    "contacts": 20_000,
+    "campaigns": 20,
+    "leads": 20_000,
+    "opportunities": 5_000,
+    "tasks": 20_000,
+    "contact_history": 100_000,
+}
+
+CHUNK_SIZE = 10_000
+
+CITIES = [
+    ("1010", "Wien", "Oesterreich"), ("1100", "Wien", "Oesterreich"), ("1220", "Wien", "Oesterreich"),
+    ("4020", "Linz", "Oesterreich"), ("4600", "Wels", "Oesterreich"), ("5020", "Salzburg", "Oesterreich"),
+    ("6020", "Innsbruck", "Oesterreich"), ("8010", "Graz", "Oesterreich"), ("9020", "Klagenfurt", "Oesterreich"),
+    ("3100", "St. Pölten", "Oesterreich"), ("6900", "Bregenz", "Oesterreich"), ("7000", "Eisenstadt", "Oesterreich"),
+    ("80331", "München", "Deutschland"), ("10115", "Berlin", "Deutschland"), ("20095", "Hamburg", "Deutschland"),
+    ("50667", "Köln", "Deutschland"), ("70173", "Stuttgart", "Deutschland"), ("94032", "Passau", "Deutschland"),
+]
+STREETS = [
+    "Hauptstraße", "Bahnhofstraße", "Kärntner Ring", "Mariahilfer Straße", "Landstraßer Hauptstraße",
+    "Schönbrunner Straße", "Grabenweg", "Mühlgasse", "Kirchengasse", "Lindenallee", "Färbergasse",
+]
+COMPANY_WORDS = [
+    "Alpen", "Donau", "Tauern", "Steirische", "Wiener", "Bergland", "Südbahn", "Inntal", "Gösser",
+    "Mühlviertler", "Bäckerei", "Steuerberatung", "Treuhand", "Elektro", "Holzbau", "Software",
+]
+LEGAL_FORMS = ["GmbH", "GmbH & Co KG", "KG", "OG", "AG", "e.U."]
+INDUSTRIES = ["Steuerberatung", "Handel", "Handwerk", "Gastronomie", "IT", "Industrie", "Tourismus"]
+FIRST_NAMES = [
+    "Jürgen", "Günther", "Sören", "Björn", "Maximilian", "Lukas", "Florian", "Andreas", "Thomas",
+    "Jörg", "Käthe", "Hannelore", "Anna", "Julia", "Katharina", "Lena", "Sophie", "Birgit", "Renée",
+]
+LAST_NAMES = [
+    "Müller", "Gruber", "Huber", "Wagner", "Pichler", "Steiner", "Moser", "Mayer", "Hofer", "Bauer",
+    "Wölfl", "Öztürk", "Schönberger", "Fürst", "Größ", "Weiß", "Brandstätter", "Ebner", "Lehner",
+]
+TITLES = [None] * 6 + ["Mag.", "Dr.", "DI", "Ing.", "MMag.", "Prof. Dr.", "Mag. (FH)"]
+POSITIONS = ["Geschäftsführung", "Steuerberater/in", "Buchhaltung", "Assistenz", "IT-Leitung", "Marketing"]
+
+# (utm_source, utm_medium, weight); None for direct traffic
+UTM_MIX = [
+    ("google", "cpc", 30), ("facebook", "paid_social", 20), ("linkedin", "paid_social", 10),
+    ("newsletter", "email", 15), ("google", "organic", 10), (None, None, 15),
+]
+LEAD_STATUS_WEIGHTS = {
+    LeadStatus.COLD: 45, LeadStatus.WARM: 20, LeadStatus.HOT: 10,
+    LeadStatus.TO_BE_DONE: 5, LeadStatus.CONVERTED: 12, LeadStatus.DISQUALIFIED: 8,
+}
+TASK_STATUS_WEIGHTS = {
+    TaskStatus.OPEN: 15, TaskStatus.IN_PROGRESS: 5, TaskStatus.DEFERRED: 2,
+    TaskStatus.COMPLETED: 73, TaskStatus.CANCELLED: 5,
+}
+STAGE_PROBABILITY = {
+    OpportunityStage.QUALIFICATION: 10, OpportunityStage.DISCOVERY: 25, OpportunityStage.PROPOSAL: 50,
+    OpportunityStage.NEGOTIATION: 75, OpportunityStage.CLOSED_WON: 100, OpportunityStage.CLOSED_LOST: 0,
+}
+
+_TRANSLITERATION = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss", "é": "e", " ": "", ".": ""})
+
+
+def dataset_sizes(scale: float = 1.0) -> dict[str, int]:
+    """Row counts per table for a scale factor."""
+    sizes = {table: max(1, round(count * scale)) for table, count in BASE_SIZES.items()}
+    sizes["campaigns"] = max(1, round(BASE_SIZES["campaigns"] * scale ** 0.5))
+    return sizes
+
+
+def _ascii(value: str) -> str:
+    return value.lower().translate(_TRANSLITERATION)
+
+
+def _weighted(rng: random.Random, weights: dict):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _companies(rng: random.Random, sizes: dict, now: datetime) -> Iterator[dict]:
+    keys: set[str] = set()
+    for i in range(1, sizes["companies"] + 1):
+        zip_code, city, country = rng.choice(CITIES)
+        name = f"{rng.choice(COMPANY_WORDS)} {rng.choice(LAST_NAMES)} {rng.choice(LEGAL_FORMS)}"
+        domain = f"{_ascii(name.split()[1])}{i}.{'at' if country == 'Oesterreich' else 'de'}"
+        # Generated names repeat; like migrated data, only the first of a key is matchable
+        key = normalize_company_name(name)
+        if key in keys:
+            key = None
+        else:
+            keys.add(key)
+        yield {
+            "id": i,
+            "name": name,
+            "name_key": key,
+            "street": f"{rng.choice(STREETS)} {rng.randint(1, 180)}",
+            "zip_code": zip_code,
+            "city": city,
+            "country": country,
+            "website": f"https://www.{domain}",
+            "phone": f"+43 {rng.randint(1, 7999)} {rng.randint(10000, 999999)}",
+            "email": f"office@{domain}",
+            "employee_count": int(rng.paretovariate(1.2) * 3),
+            "potential_category": rng.choice("ABC"),
+            "industry": rng.choice(INDUSTRIES),
+        }
+
+
+def _campaigns(rng: random.Random, sizes: dict, now: datetime) -> Iterator[dict]:
+    types = [("landing_page", "google"), ("social_media", "facebook"), ("social_media", "linkedin"), ("email", "newsletter")]
+    for i in range(1, sizes["campaigns"] + 1):
+        campaign_type, source = rng.choice(types)
+        start = (now - timedelta(days=rng.randint(0, 720))).date()
+        yield {
+            "id": i,
+            "name": f"Kampagne {i:03d} {rng.choice(['Frühjahr', 'Herbst', 'Jahresabschluss', 'Webinar'])}",
+            "type": campaign_type,
+            "source": source,
+            "start_date": start,
+            "end_date": start + timedelta(days=rng.randint(14, 120)),
+            "is_active": rng.random() < 0.3,
+            "landing_page_url": f"https://example.at/lp/{i}",
+        }
+
+
+def _contacts(rng: random.Random, sizes: dict, now: datetime) -> Iterator[dict]:
+    for i in range(1, sizes["contacts"] + 1):
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        has_company = rng.random() < 0.85
+        email = f"{_ascii(first_name)}.{_ascii(last_name)}{i}@example.at" if rng.random() < 0.95 else None
+        yield {
+            "id": i,
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": email,
+            "email_normalized": normalize_email(email),
+            "phone": f"+43 {rng.randint(1, 7999)} {rng.randint(10000, 999999)}",
+            "position": rng.choice(POSITIONS),
+            "salutation": rng.choice(["Herr", "Frau"]),
+            "title": rng.choice(TITLES),
+            "is_primary": rng.random() < 0.2,
+            "is_active": rng.random() < 0.92,
+            "company_id": rng.randint(1, sizes["companies"]) if has_company else None,
+            "created_at": now - timedelta(days=rng.randint(0, 1_500)),
+        }
+
+
+def _leads(rng: random.Random, sizes: dict, now: datetime) -> Iterator[dict]:
+    utm_weights = [weight for *_, weight in UTM_MIX]
+    for i in range(1, sizes["leads"] + 1):
+        utm_source, utm_medium, _ = rng.choices(UTM_MIX, weights=utm_weights)[0]
+        campaign_id = rng.randint(1, sizes["campaigns"]) if utm_source else None
+        yield {
+            "id": i,
+            "status": _weighted(rng, LEAD_STATUS_WEIGHTS),
+            "source": "landing_page" if utm_source else "manual",
+            "utm_source": utm_source,
+            "utm_medium": utm_medium,
+            "utm_campaign": f"kampagne-{campaign_id}" if campaign_id else None,
+            "contact_id": rng.randint(1, sizes["contacts"]),
+            "campaign_id": campaign_id,
+            "created_at": now - timedelta(minutes=rng.randint(0, 525_600)),
+        }
+
+
+def _opportunities(rng: random.Random, sizes: dict, now: datetime) -> Iterator[dict]:
+    # Every opportunity up to the lead count comes from a distinct lead (lead_id is unique)
+    lead_step = max(1, sizes["leads"] // sizes["opportunities"])
+    for i in range(1, sizes["opportunities"] + 1):
+        stage = rng.choice(list(OpportunityStage))
+        closed = stage in (OpportunityStage.CLOSED_WON, OpportunityStage.CLOSED_LOST)
+        lead_id = i * lead_step
+        yield {
+            "id": i,
+            "name": f"Angebot {i} {rng.choice(['Lohnverrechnung', 'Buchhaltung', 'Website', 'Beratung'])}",
+            "stage": stage,
+            "expected_value": Decimal(rng.randint(500, 150_000)),
+            "probability": STAGE_PROBABILITY[stage],
+            "expected_close_date": (now + timedelta(days=rng.randint(-60, 180))).date(),
+            "actual_close_date": (now - timedelta(days=rng.randint(0, 365))).date() if closed else None,
+            "company_id": rng.randint(1, sizes["companies"]),
+            "contact_id": rng.randint(1, sizes["contacts"]),
+            "lead_id": lead_id if lead_id <= sizes["leads"] else None,
+        }
+
+
+def _tasks(rng: random.Random, sizes: dict, now: datetime) -> Iterator[dict]:
+    for i in range(1, sizes["tasks"] + 1):
+        status = _weighted(rng, TASK_STATUS_WEIGHTS)
+        due_date = now + timedelta(days=rng.randint(-365, 90), hours=rng.randint(8, 17))
+        yield {
+            "id": i,
+            "title": rng.choice(["Rückruf", "Angebot nachfassen", "Unterlagen schicken", "Termin vereinbaren"]),
+            "status": status,
+            "priority": rng.choice(list(TaskPriority)),
+            "due_date": due_date if rng.random() < 0.9 else None,
+            "completed_at": due_date if status == TaskStatus.COMPLETED else None,
+            "contact_id": rng.randint(1, sizes["contacts"]) if rng.random() < 0.8 else None,
+            "assigned_to": f"user{rng.randint(1, 25)}",
+            "created_by": f"user{rng.randint(1, 25)}",
+        }
+
+
+def _contact_history(rng: random.Random, sizes: dict, now: datetime) -> Iterator[dict]:
+    titles = {
+        HistoryType.NOTE: "Notiz hinzugefügt", HistoryType.CALL: "Anruf", HistoryType.EMAIL: "E-Mail gesendet",
+        HistoryType.MEETING: "Termin", HistoryType.STATUS_CHANGE: "Status geändert",
+        HistoryType.TASK_CREATED: "Aufgabe erstellt", HistoryType.DATA_CHANGE: "Daten geändert",
+        HistoryType.LEAD_CREATED: "Lead erstellt",
+    }
+    for i in range(1, sizes["contact_history"] + 1):
+        history_type = rng.choice(list(HistoryType))
+        yield {
+            "id": i,
+            "type": history_type,
+            "title": titles[history_type],
+            "content": "Gespräch über Jahresabschluss und Förderungen geführt." if history_type == HistoryType.CALL else None,
+            "created_by": f"user{rng.randint(1, 25)}",
+            "contact_id": rng.randint(1, sizes["contacts"]),
+            "created_at": now - timedelta(minutes=rng.randint(0, 1_051_200)),
+        }
+
+
+# Load order respects foreign keys
+GENERATORS = [
+    (Company, _companies),
+    (Campaign, _campaigns),
+    (Contact, _contacts),
+    (Lead, _leads),
+    (Opportunity, _opportunities),
+    (Task, _tasks),
+    (ContactHistory, _contact_history),
+]
+
+
+def generate_rows(model, scale: float = 1.0, seed: int = DEFAULT_SEED, now: Optional[datetime] = None) -> Iterator[dict]:
+    """Rows of one table; each table has its own random stream, so tables are independent."""
+    generator = dict(GENERATORS)[model]
+    rng = random.Random(f"{seed}:{model.__tablename__}")
+    return generator(rng, dataset_sizes(scale), now or datetime.now(timezone.utc))
+
+
+def _with_defaults(table: Table, rows: list[dict]) -> list[dict]:
+    """Fill scalar Python-side column defaults, which COPY does not apply."""
+    defaults = {
+        column.name: column.default.arg
+        for column in table.columns
+        if column.default is not None and column.default.is_scalar
+    }
+    return [{**defaults, **row} for row in rows]
+
+
+async def _copy_chunk(conn: AsyncConnection, table: Table, rows: list[dict]) -> None:
+    """Load rows with COPY through the asyncpg driver connection."""
+    columns = list(rows[0])
+    dialect = conn.dialect
+    processors = [table.c[name].type.bind_processor(dialect) for name in columns]
+    records = [
+        tuple(proc(row[name]) if proc else row[name] for name, proc in zip(columns, processors))
+        for row in rows
+    ]
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(table.name, records=records, columns=columns)
+
+
+async def load_dataset(
+    engine: AsyncEngine,
+    scale: float = 1.0,
+    seed: int = DEFAULT_SEED,
+    recreate: bool = False,
+) -> dict[str, int]:
+    """
+    Generate and load the dataset.
+
+    Args:
+        recreate: drop and recreate all tables first; otherwise the tables
+            must exist and be empty.
+
+    Returns:
+        Rows loaded per table.
+    """
+    now = datetime.now(timezone.utc)
+    counts = {}
+
+    async with engine.begin() as conn:
+        if recreate:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+        use_copy = conn.dialect.driver == "asyncpg"
+        for model, _ in GENERATORS:
+            table = model.__table__
+            started = time.perf_counter()
+            rows = generate_rows(model, scale, seed, now)
+            counts[table.name] = 0
+            while chunk := list(itertools.islice(rows, CHUNK_SIZE)):
+                chunk = _with_defaults(table, chunk)
+                if use_copy:
+                    await _copy_chunk(conn, table, chunk)
+                else:
+                    await conn.execute(insert(table), chunk)
+                counts[table.name] += len(chunk)
+            logger.info("Loaded %d %s in %.1f s", counts[table.name], table.name, time.perf_counter() - started)
+
+        if conn.dialect.name == "postgresql":
+            # Explicit ids leave the serial sequences behind
+            for model, _ in GENERATORS:
+                name = model.__tablename__
+                await conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), "
+                    f"COALESCE((SELECT max(id) FROM {name}), 1))"
+                ))
+
+    if engine.dialect.name == "postgresql":
+        async with engine.connect() as conn:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("ANALYZE"))
+
+    return counts
+
+
+async def _run(url: str, scale: float, seed: int, recreate: bool) -> dict[str, int]:
+    engine = create_async_engine(url, poolclass=NullPool)
+    try:
+        return await load_dataset(engine, scale, seed, recreate)
+    finally:
+        await engine.dispose()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from src.core.config import get_settings
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=get_settings().database_url, help="database URL (default: DATABASE_URL)")
+    parser.add_argument("--scale", type=float, default=1.0, help="scale factor; 1 is about 170k rows")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--recreate", action="store_true", help="drop and recreate all tables first")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    started = time.perf_counter()
+    counts = asyncio.run(_run(args.url, args.scale, args.seed, args.recreate))
+
+    total = sum(counts.values())
+    elapsed = time.perf_counter() - started
+    print(f"{total} rows in {elapsed:.1f} s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
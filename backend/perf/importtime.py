@@ -0,0 +1,101 @@
+"""Cold-import budget check for the API entry point.
+
+Runs ``python -X importtime -c "import src.main"`` in a fresh interpreter,
+reports the slowest imports and fails when the total exceeds the budget or
+when a heavy optional dependency is imported eagerly.
+
+Usage:
+    python -m perf.importtime
+    python -m perf.importtime --budget-ms 1200 --top 20
+    IMPORT_TIME_BUDGET_MS=1200 python -m perf.importtime
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+DEFAULT_MODULE = "src.main"
+DEFAULT_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 2500))
+
+# Optional dependencies that must only be imported when first used
+HEAVY_MODULES = ("pandas", "openpyxl", "magic", "aiosmtplib", "alembic")
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Parse ``-X importtime`` output into rows of module, self_ms and cumulative_ms."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        rows.append({
+            "module": parts[2].strip(),
+            "self_ms": int(parts[0]) / 1000,
+            "cumulative_ms": int(parts[1]) / 1000,
+        })
+    return rows
+
+
+def measure_import_time(module: str = DEFAULT_MODULE) -> dict:
+    """Import a module in a fresh interpreter and measure it.
+
+    Returns:
+        {"module", "total_ms", "imports", "heavy_loaded"}; imports are sorted
+        by cumulative time, heavy_loaded lists HEAVY_MODULES found in
+        sys.modules after the import.
+    """
+    code = (
+        f"import json, sys, {module}; "
+        f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = parse_importtime(proc.stderr)
+    total_ms = next((r["cumulative_ms"] for r in rows if r["module"] == module), 0.0)
+
+    return {
+        "module": module,
+        "total_ms": total_ms,
+        "imports": sorted(rows, key=lambda r: r["cumulative_ms"], reverse=True),
+        "heavy_loaded": json.loads(proc.stdout.strip().splitlines()[-1]),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to show")
+    args = parser.parse_args(argv)
+
+    result = measure_import_time(args.module)
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for row in result["imports"][:args.top]:
+        print(f"{row['cumulative_ms']:>14.1f} {row['self_ms']:>9.1f}  {row['module']}")
+    print(f"\nimport {result['module']}: {result['total_ms']:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if result["heavy_loaded"]:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(result['heavy_loaded'])}")
+        failed = True
+    if result["total_ms"] > args.budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
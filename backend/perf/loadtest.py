@@ -0,0 +1,355 @@
+"""HTTP load test with weighted scenario mixes.
+
+Virtual users pick scenarios by weight and run them back to back against
+a running API (or the app in-process). Every request is recorded under its
+route template; the report shows throughput, p50/p95/p99 latency and error
+rates per route and is written as JSON so runs can be compared.
+
+Point it at a database loaded with perf.dataset at the same --scale, so the
+ids the scenarios use exist.
+
+Landing page submissions carry a random X-Forwarded-For address each, so
+the per-IP limit on /api/public does not turn the burst into a test of the
+rate limiter. Start the server with PUBLIC_TRUSTED_PROXIES=1 for that
+header to be used (--in-process sets it). 429 responses are reported as
+rate_limited, separately from errors.
+
+Usage:
+    python -m perf.loadtest --mix call-center --users 20 --duration 60
+    python -m perf.loadtest --mix mixed --users 50 --duration 300 --output results.json
+    python -m perf.loadtest --mix landing-burst --compare previous.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from perf.dataset import LAST_NAMES, dataset_sizes
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Scenario weights per mix
+MIXES = {
+    "call-center": {"call_center": 1},
+    "marketing": {"marketing": 1},
+    "landing-burst": {"landing_burst": 1},
+    "mixed": {"call_center": 6, "marketing": 3, "landing_burst": 1},
+}
+
+LANDING_BURST_SIZE = 20
+IMPORT_ROWS = 50
+
+
+async def _request(client: httpx.AsyncClient, stats: dict, method: str, route: str, url: str, **kwargs):
+    """Send one request and record it under its route template."""
+    label = f"{method} {route}"
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except httpx.HTTPError as e:
+        stats[label]["latencies"].append(time.perf_counter() - started)
+        stats[label]["errors"] += 1
+        stats[label]["exceptions"][type(e).__name__] += 1
+        return None
+
+    stats[label]["latencies"].append(time.perf_counter() - started)
+    stats[label]["statuses"][response.status_code] += 1
+    if response.status_code == 429:
+        stats[label]["rate_limited"] += 1
+    elif response.status_code >= 400:
+        stats[label]["errors"] += 1
+    return response
+
+
+async def call_center(client: httpx.AsyncClient, stats: dict, rng: random.Random, sizes: dict) -> None:
+    """Search, open a contact, read its history, document a call, complete a task."""
+    term = rng.choice(LAST_NAMES)[: rng.randint(3, 5)]
+    response = await _request(client, stats, "GET", "/api/contacts/search", "/api/contacts/search", params={"q": term})
+
+    results = response.json() if response is not None and response.status_code == 200 else []
+    contact_id = results[0]["id"] if results else rng.randint(1, sizes["contacts"])
+
+    await _request(client, stats, "GET", "/api/contacts/{contact_id}", f"/api/contacts/{contact_id}")
+    await _request(
+        client, stats, "GET", "/api/contacts/{contact_id}/history", f"/api/contacts/{contact_id}/history"
+    )
+    await _request(
+        client, stats, "POST", "/api/contacts/{contact_id}/calls", f"/api/contacts/{contact_id}/calls",
+        json={"content": "Rückruf wegen Jahresabschluss", "duration_minutes": rng.randint(2, 20), "outcome": "reached"},
+    )
+    task_id = rng.randint(1, sizes["tasks"])
+    await _request(
+        client, stats, "POST", "/api/tasks/{task_id}/complete", f"/api/tasks/{task_id}/complete",
+        json={"notes": "Erledigt"},
+    )
+
+
+def _import_csv(rng: random.Random, rows: int = IMPORT_ROWS) -> bytes:
+    """A small lead import file with German column names."""
+    lines = ["vorname,nachname,email"]
+    for _ in range(rows):
+        suffix = rng.randint(1, 10**9)
+        lines.append(f"Lasttest,Import{suffix},lasttest{suffix}@example.at")
+    return "\n".join(lines).encode()
+
+
+async def marketing(client: httpx.AsyncClient, stats: dict, rng: random.Random, sizes: dict) -> None:
+    """Filter the lead list, check pipeline stats and occasionally import leads."""
+    params = {"status": rng.choice(["cold", "warm", "hot"])}
+    if rng.random() < 0.5:
+        params["campaign_id"] = rng.randint(1, sizes["campaigns"])
+    await _request(client, stats, "GET", "/api/leads", "/api/leads", params=params)
+    await _request(client, stats, "GET", "/api/leads", "/api/leads", params={**params, "page": 2})
+    await _request(client, stats, "GET", "/api/opportunities/stats", "/api/opportunities/stats")
+
+    if rng.random() < 0.1:
+        await _request(
+            client, stats, "POST", "/api/leads/import", "/api/leads/import",
+            files={"file": ("leads.csv", io.BytesIO(_import_csv(rng)), "text/csv")},
+        )
+
+
+async def landing_burst(client: httpx.AsyncClient, stats: dict, rng: random.Random, sizes: dict) -> None:
+    """Concurrent form submissions, as after a newsletter or ad goes out."""
+    campaign_id = rng.randint(1, sizes["campaigns"])
+
+    async def submit():
+        suffix = rng.randint(1, 10**9)
+        # Visitors come from different addresses; one address would only hit the per-IP limit
+        client_ip = f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+        await _request(
+            client, stats, "POST", "/api/public/leads", "/api/public/leads",
+            headers={"X-Forwarded-For": client_ip},
+            json={
+                "first_name": "Lena",
+                "last_name": f"Größ{suffix}",
+                "email": f"lena.groess{suffix}@example.at",
+                "campaign_id": campaign_id,
+                "utm_source": "facebook",
+                "utm_medium": "paid_social",
+            },
+        )
+
+    await asyncio.gather(*(submit() for _ in range(LANDING_BURST_SIZE)))
+
+
+SCENARIOS = {
+    "call_center": call_center,
+    "marketing": marketing,
+    "landing_burst": landing_burst,
+}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(stats: dict, elapsed: float) -> dict:
+    """Per-route and overall figures; latencies in milliseconds."""
+    routes = {}
+    for label, route_stats in sorted(stats.items()):
+        latencies = route_stats["latencies"]
+        count = len(latencies)
+        routes[label] = {
+            "requests": count,
+            "errors": route_stats["errors"],
+            "error_rate": round(route_stats["errors"] / count, 4) if count else 0.0,
+            "rate_limited": route_stats["rate_limited"],
+            "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(sum(latencies) / count * 1000, 2) if count else 0.0,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "statuses": {str(code): n for code, n in sorted(route_stats["statuses"].items())},
+            "exceptions": dict(route_stats["exceptions"]),
+        }
+
+    requests = sum(route["requests"] for route in routes.values())
+    errors = sum(route["errors"] for route in routes.values())
+    rate_limited = sum(route["rate_limited"] for route in routes.values())
+    all_latencies = [latency for route_stats in stats.values() for latency in route_stats["latencies"]]
+    return {
+        "total": {
+            "requests": requests,
+            "errors": errors,
+            "error_rate": round(errors / requests, 4) if requests else 0.0,
+            "rate_limited": rate_limited,
+            "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(all_latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(all_latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(all_latencies, 99) * 1000, 2),
+        },
+        "routes": routes,
+    }
+
+
+def _new_stats() -> dict:
+    return defaultdict(lambda: {
+        "latencies": [],
+        "errors": 0,
+        "rate_limited": 0,
+        "statuses": defaultdict(int),
+        "exceptions": defaultdict(int),
+    })
+
+
+async def run_load_test(
+    client: httpx.AsyncClient,
+    mix: dict[str, float],
+    users: int = 10,
+    duration: Optional[float] = 60.0,
+    iterations: Optional[int] = None,
+    scale: float = 1.0,
+    seed: int = 1,
+) -> dict:
+    """
+    Run virtual users until the duration is over or each did `iterations` scenarios.
+
+    Returns:
+        {"meta": ..., "total": ..., "routes": ...} with latencies in ms.
+    """
+    sizes = dataset_sizes(scale)
+    names, weights = list(mix), list(mix.values())
+    stats = _new_stats()
+    deadline = time.perf_counter() + duration if duration and not iterations else None
+    scenario_counts = defaultdict(int)
+
+    async def user(index: int) -> None:
+        rng = random.Random(f"{seed}:{index}")
+        done = 0
+        while (iterations is None or done < iterations) and (deadline is None or time.perf_counter() < deadline):
+            name = rng.choices(names, weights=weights)[0]
+            scenario_counts[name] += 1
+            await SCENARIOS[name](client, stats, rng, sizes)
+            done += 1
+
+    started_at = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(users)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "meta": {
+            "started_at": started_at.isoformat(),
+            "elapsed_s": round(elapsed, 2),
+            "mix": mix,
+            "users": users,
+            "scale": scale,
+            "seed": seed,
+            "scenarios_run": dict(scenario_counts),
+        },
+        **summarize(stats, elapsed),
+    }
+
+
+def compare_results(baseline: dict, current: dict) -> list[str]:
+    """Human-readable p95 and throughput changes per route."""
+    lines = []
+    for label, route in current["routes"].items():
+        before = baseline["routes"].get(label)
+        if not before or not before["p95_ms"]:
+            lines.append(f"{label}: new")
+            continue
+        change = (route["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+        lines.append(
+            f"{label}: p95 {before['p95_ms']:.1f} -> {route['p95_ms']:.1f} ms ({change:+.0f}%), "
+            f"errors {before['error_rate']:.2%} -> {route['error_rate']:.2%}"
+        )
+    return lines
+
+
+def print_report(result: dict) -> None:
+    total = result["total"]
+    print(f"{'route':<45} {'req':>7} {'err%':>6} {'429':>6} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for label, route in result["routes"].items():
+        print(
+            f"{label:<45} {route['requests']:>7} {route['error_rate'] * 100:>5.1f}% {route['rate_limited']:>6} "
+            f"{route['throughput_rps']:>8.1f} {route['p50_ms']:>8.1f} {route['p95_ms']:>8.1f} {route['p99_ms']:>8.1f}"
+        )
+    print(
+        f"\n{total['requests']} requests in {result['meta']['elapsed_s']} s: {total['throughput_rps']} req/s, "
+        f"p95 {total['p95_ms']} ms, error rate {total['error_rate']:.2%}, {total['rate_limited']} rate limited"
+    )
+
+
+def _parse_mix(value: str) -> dict[str, float]:
+    """A named mix or explicit weights like call_center=6,marketing=3."""
+    if value in MIXES:
+        return MIXES[value]
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+async def _run(args) -> dict:
+    limits = httpx.Limits(max_connections=args.users * LANDING_BURST_SIZE)
+    if args.in_process:
+        from src.core.config import get_settings
+        from src.main import app
+
+        # Trust the X-Forwarded-For address each landing page submission carries
+        get_settings().public_trusted_proxies = 1
+
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout)
+    else:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits)
+    async with client:
+        result = await run_load_test(
+            client, args.mix, args.users, args.duration, args.iterations, args.scale, args.seed
+        )
+    result["meta"]["target"] = "in-process" if args.in_process else args.base_url
+    return result
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--in-process", action="store_true", help="drive src.main:app through ASGI, no server needed")
+    parser.add_argument("--mix", type=_parse_mix, default=MIXES["mixed"], help=f"one of {', '.join(MIXES)} or name=weight,...")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    parser.add_argument("--iterations", type=int, help="scenarios per user instead of a duration")
+    parser.add_argument("--scale", type=float, default=1.0, help="scale of the loaded perf.dataset")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", type=Path, help="result file (default: perf/results/loadtest-<time>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(_run(args))
+    print_report(result)
+
+    output = args.output or RESULTS_DIR / f"loadtest-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"Results written to {output}")
+
+    if args.compare:
+        print()
+        for line in compare_results(json.loads(args.compare.read_text()), result):
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
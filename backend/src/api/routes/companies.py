@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from src.schemas.company import (
     CompanyCreate,
     CompanyUpdate,
@@ -19,7 +19,7 @@ async def list_companies(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     search: str = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all companies with pagination."""
     skip = (page - 1) * page_size
@@ -39,7 +39,7 @@ async def list_companies(
 @router.get("/{company_id}", response_model=CompanyResponse)
 async def get_company(
     company_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single company by ID."""
     company = await company_service.get_company(db, company_id)
@@ -76,6 +76,14 @@ async def update_company(
     db: AsyncSession = Depends(get_db),
 ):
     """Update an existing company."""
+    if company_data.name is not None:
+        existing = await company_service.get_company_by_name(db, company_data.name)
+        if existing and existing.id != company_id:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Company with name '{company_data.name}' already exists",
+            )
+    
     company = await company_service.update_company(db, company_id, company_data)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
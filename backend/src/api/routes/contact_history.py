@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from src.schemas.contact_history import (
     ContactHistoryResponse,
     ContactHistoryUpdate,
@@ -19,7 +19,7 @@ async def get_contact_history(
     contact_id: int,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get history/timeline for a contact."""
     skip = (page - 1) * page_size
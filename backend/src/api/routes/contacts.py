@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
+from src.models.contact import normalize_email
 from src.schemas.contact import (
     ContactCreate,
     ContactUpdate,
@@ -23,7 +24,7 @@ async def list_contacts(
     search: str = Query(None),
     company_id: int = Query(None),
     is_active: bool = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all contacts with pagination and filters."""
     skip = (page - 1) * page_size
@@ -66,7 +67,7 @@ async def list_contacts(
 async def search_contacts(
     q: str = Query(..., min_length=2),
     limit: int = Query(10, ge=1, le=50),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Search contacts for autocomplete. Target: <200ms response time."""
     return await contact_service.search_contacts(db, q, limit)
@@ -75,7 +76,7 @@ async def search_contacts(
 @router.get("/{contact_id}", response_model=ContactResponse)
 async def get_contact(
     contact_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single contact by ID."""
     contact = await contact_service.get_contact(db, contact_id)
@@ -116,6 +117,14 @@ async def create_contact(
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new contact."""
+    # Check for duplicate email
+    existing = await contact_service.get_contact_by_email(db, contact_data.email)
+    if existing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Contact with email '{contact_data.email}' already exists",
+        )
+    
     contact = await contact_service.create_contact(db, contact_data)
     await db.refresh(contact, ["company"])
     
@@ -148,6 +157,17 @@ async def update_contact(
     db: AsyncSession = Depends(get_db),
 ):
     """Update an existing contact."""
+    if contact_data.email is not None:
+        current = await contact_service.get_contact(db, contact_id)
+        # Resending its own address is no conflict, also for legacy duplicates
+        if current and normalize_email(contact_data.email) != normalize_email(current.email):
+            existing = await contact_service.get_contact_by_email(db, contact_data.email)
+            if existing:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Contact with email '{contact_data.email}' already exists",
+                )
+    
     contact = await contact_service.update_contact(db, contact_id, contact_data)
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import get_db, get_primary_read_db, get_read_db
 from src.schemas.email_template import (
     EmailTemplateCreate,
     EmailTemplateUpdate,
@@ -9,6 +9,10 @@ from src.schemas.email_template import (
     EmailSend,
     EmailPreview,
     EmailPreviewResponse,
+    EmailBulkSend,
+    EmailSendJobResponse,
+    EmailBatchPreview,
+    EmailBatchPreviewResponse,
 )
 from src.schemas.base import PaginatedResponse
 from src.services import email_service
@@ -23,7 +27,7 @@ async def list_templates(
     page_size: int = Query(20, ge=1, le=100),
     is_active: bool = Query(None),
     category: str = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all email templates with pagination."""
     skip = (page - 1) * page_size
@@ -50,7 +54,7 @@ async def list_templates(
 @router.get("/{template_id}", response_model=EmailTemplateResponse)
 async def get_template(
     template_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single email template by ID."""
     template = await email_service.get_template(db, template_id)
@@ -89,7 +93,7 @@ async def update_template(
 @router.post("/preview", response_model=EmailPreviewResponse)
 async def preview_email(
     preview_data: EmailPreview,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Preview an email with replaced variables."""
     result = await email_service.preview_email(
@@ -100,6 +104,18 @@ async def preview_email(
     return EmailPreviewResponse(**result)
 
 
+@router.post("/preview-batch", response_model=EmailBatchPreviewResponse)
+async def preview_batch(
+    preview_data: EmailBatchPreview,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Preview a template for a page of recipients and flag missing values."""
+    result = await email_service.preview_batch(db, preview_data)
+    if not result:
+        raise HTTPException(status_code=404, detail="Template not found")
+    return EmailBatchPreviewResponse(**result)
+
+
 @router.post("/send")
 async def send_email(
     send_data: EmailSend,
@@ -121,3 +137,35 @@ async def send_email(
         raise HTTPException(status_code=400, detail="Failed to send email")
     
     return {"status": "sent"}
+
+
+@router.post("/send-bulk", response_model=EmailSendJobResponse, status_code=202)
+async def send_bulk(
+    send_data: EmailBulkSend,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
+    """Send a template to many contacts; returns the job to poll for progress."""
+    # TODO: Get actual user from auth context
+    current_user = "current_user"
+    
+    job = await email_service.create_send_job(db, send_data, created_by=current_user)
+    if not job:
+        raise HTTPException(status_code=404, detail="Template not found")
+    
+    # The job runs in its own session after the response and must see the row
+    await db.commit()
+    background_tasks.add_task(email_service.run_send_job, job.id)
+    return EmailSendJobResponse.model_validate(job)
+
+
+@router.get("/send-jobs/{job_id}", response_model=EmailSendJobResponse)
+async def get_send_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_primary_read_db),
+):
+    """Get the progress of a bulk send job (from the primary, not a lagging replica)."""
+    job = await email_service.get_send_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Send job not found")
+    return EmailSendJobResponse.model_validate(job)
@@ -1,23 +1,71 @@
-from fastapi import APIRouter, Depends
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from src.core.database import get_db
+from src.core.config import get_settings
+from src.core.database import get_read_db
+from src.core.profiling import list_profiles, profile_file, profiling_allowed
+from src.core.slow_queries import slow_query_report
 
+settings = get_settings()
 router = APIRouter()
 
 
 @router.get("")
-async def health_check():
+async def health_check(request: Request):
     """Basic health check endpoint."""
-    return {"status": "healthy", "service": "Atikon CRM/Intranet API"}
+    return {
+        "status": "healthy",
+        "service": "Atikon CRM/Intranet API",
+        "startup": getattr(request.app.state, "startup_report", None),
+    }
 
 
 @router.get("/db")
-async def database_health_check(db: AsyncSession = Depends(get_db)):
+async def database_health_check(db: AsyncSession = Depends(get_read_db)):
     """Database connectivity health check."""
     try:
         await db.execute(text("SELECT 1"))
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
+
+
+@router.get("/slow-queries")
+async def slow_queries(limit: int = Query(20, ge=1, le=100)):
+    """Slowest statement shapes since startup (debug mode only)."""
+    if not settings.debug:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return {
+        "threshold_ms": settings.slow_query_threshold_ms,
+        "statements": slow_query_report(limit),
+    }
+
+
+def _require_profiling(x_profile: Optional[str] = Header(None)) -> None:
+    if not profiling_allowed(x_profile):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@router.get("/profiles", dependencies=[Depends(_require_profiling)])
+async def profiles(limit: int = Query(20, ge=1, le=100)):
+    """Stored request profiles, newest first (requires the X-Profile secret)."""
+    return [
+        {key: value for key, value in summary.items() if key != "top_functions"}
+        for summary in list_profiles(limit)
+    ]
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(_require_profiling)])
+async def download_profile(
+    profile_id: str,
+    format: Literal["json", "folded", "pstats"] = "json",
+):
+    """One stored profile: summary (json), flame-graph stacks (folded) or cProfile data (pstats)."""
+    path = profile_file(profile_id, format)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=path.name)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from src.models.lead import LeadStatus
 from src.schemas.lead import (
     LeadCreate,
@@ -23,7 +23,7 @@ async def list_leads(
     page_size: int = Query(20, ge=1, le=100),
     status: LeadStatus = Query(None),
     campaign_id: int = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     skip = (page - 1) * page_size
     leads, total = await lead_service.get_leads(
@@ -66,7 +66,7 @@ async def list_leads(
 @router.get("/{lead_id}", response_model=LeadResponse)
 async def get_lead(
     lead_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     lead = await lead_service.get_lead(db, lead_id)
     if not lead:
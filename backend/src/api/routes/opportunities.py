@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from src.models.opportunity import OpportunityStage
 from src.schemas.opportunity import (
     OpportunityCreate,
@@ -25,7 +25,7 @@ async def list_opportunities(
     stage: OpportunityStage = Query(None),
     company_id: int = Query(None),
     contact_id: int = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     skip = (page - 1) * page_size
     opportunities, total = await opportunity_service.get_opportunities(
@@ -65,7 +65,7 @@ async def list_opportunities(
 
 @router.get("/stats", response_model=PipelineStats)
 async def get_pipeline_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     return await opportunity_service.get_pipeline_stats(db)
 
@@ -73,7 +73,7 @@ async def get_pipeline_stats(
 @router.get("/{opportunity_id}", response_model=OpportunityResponse)
 async def get_opportunity(
     opportunity_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     opp = await opportunity_service.get_opportunity(db, opportunity_id)
     if not opp:
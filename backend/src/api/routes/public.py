@@ -1,21 +1,78 @@
 """Public endpoints for landing pages (no auth required)."""
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.admission import check_campaign
+from src.core.config import get_settings
+from src.core.database import get_db, get_primary_read_db
+from src.core.lead_intake import accept_submission
 from src.schemas.lead import LeadCreateFromForm
-from src.services import lead_service
+from src.services import lead_service, submission_service
 
 router = APIRouter()
+settings = get_settings()
+
+THANK_YOU = "Vielen Dank für Ihre Anfrage! Wir werden uns in Kürze bei Ihnen melden."
+
+
+def _replay(stored) -> JSONResponse:
+    return JSONResponse(
+        status_code=stored.status_code,
+        content=stored.response,
+        headers={"Idempotent-Replayed": "true"},
+    )
 
 
 @router.post("/leads")
 async def submit_lead_form(
     lead_data: LeadCreateFromForm,
     db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
 ):
-    """Public endpoint for landing page form submissions."""
+    """
+    Public endpoint for landing page form submissions.
+
+    With lead_intake_async the submission is only queued (202) and the lead
+    is created by the lead intake worker.
+
+    Repeats with the same Idempotency-Key header, or with the same email,
+    campaign and UTM fields within submission_dedup_seconds, get the first
+    response again without any database writes.
+    """
+    await check_campaign(lead_data.campaign_id)
+    keys = submission_service.submission_keys(
+        lead_data,
+        idempotency_key,
+        settings.idempotency_key_ttl_seconds,
+        settings.submission_dedup_seconds,
+    )
+    stored = await submission_service.find_response(db, list(keys))
+    if stored:
+        return _replay(stored)
+    
+    if settings.lead_intake_async:
+        status_code, content = 202, {"status": "accepted", "message": THANK_YOU}
+    else:
+        status_code, content = 201, {"status": "success", "message": THANK_YOU}
+    if not await submission_service.claim_keys(db, keys, status_code, content):
+        # A concurrent submission with the same key committed first
+        await db.rollback()
+        stored = await submission_service.find_response(db, list(keys))
+        if stored:
+            return _replay(stored)
+        raise HTTPException(status_code=409, detail="Anfrage wird bereits verarbeitet.")
+    
+    if settings.lead_intake_async:
+        if await accept_submission(db, lead_data) is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Zu viele Anfragen. Bitte versuchen Sie es in Kürze erneut.",
+                headers={"Retry-After": "5"},
+            )
+        return JSONResponse(status_code=status_code, content=content)
+    
     try:
         lead = await lead_service.create_lead_from_form(db, lead_data)
         
@@ -23,13 +80,7 @@ async def submit_lead_form(
         # if lead.campaign and lead.campaign.lead_magnet:
         #     await email_service.send_lead_magnet(db, lead.contact_id, lead.campaign.lead_magnet)
         
-        return JSONResponse(
-            status_code=201,
-            content={
-                "status": "success",
-                "message": "Vielen Dank für Ihre Anfrage! Wir werden uns in Kürze bei Ihnen melden.",
-            },
-        )
+        return JSONResponse(status_code=status_code, content=content)
     except Exception as e:
         raise HTTPException(
             status_code=400,
@@ -40,18 +91,35 @@ async def submit_lead_form(
 @router.get("/campaigns/{campaign_id}")
 async def get_campaign_info(
     campaign_id: int,
-    db: AsyncSession = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_primary_read_db),
 ):
-    """Get public campaign info for landing page."""
+    """
+    Get public campaign info for landing page.
+
+    Served from an in-process cache, filled from the primary on a miss;
+    responses carry an ETag and Cache-Control so browsers and CDNs can
+    cache them as well.
+    """
     from src.services import campaign_service
     
-    campaign = await campaign_service.get_campaign(db, campaign_id)
-    if not campaign or not campaign.is_active:
-        raise HTTPException(status_code=404, detail="Campaign not found")
+    # No campaign bucket here: page views would use up the one that guards
+    # the campaign's form submissions, and this is served from the cache
+    cached = await campaign_service.get_public_campaign(
+        db,
+        campaign_id,
+        settings.public_campaign_cache_seconds,
+        settings.public_campaign_negative_seconds,
+    )
+    if cached is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Campaign not found",
+            headers={"Cache-Control": f"public, max-age={int(settings.public_campaign_negative_seconds)}"},
+        )
     
-    return {
-        "id": campaign.id,
-        "name": campaign.name,
-        "description": campaign.description,
-        "lead_magnet": campaign.lead_magnet,
-    }
+    info, etag = cached
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.public_campaign_max_age}"}
+    if if_none_match and (if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=info, headers=headers)
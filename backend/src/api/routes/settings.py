@@ -1,8 +1,8 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from src.schemas.setting import (
     SettingCreate,
     SettingUpdate,
@@ -10,6 +10,9 @@ from src.schemas.setting import (
     LookupValueCreate,
     LookupValueUpdate,
     LookupValueResponse,
+    LookupValueBulkItem,
+    LookupValueBulkStatus,
+    LookupBulkResult,
 )
 from src.services import setting_service
 
@@ -21,7 +24,7 @@ router = APIRouter()
 
 @router.get("/lookups/categories", response_model=list[str])
 async def list_lookup_categories(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all available lookup categories."""
     categories = await setting_service.get_all_lookup_categories(db)
@@ -32,7 +35,7 @@ async def list_lookup_categories(
 async def list_lookup_values(
     category: str,
     include_inactive: bool = Query(False),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all lookup values for a category."""
     lookups = await setting_service.get_lookup_values(
@@ -88,15 +91,52 @@ async def delete_lookup_value(
     return {"message": "Lookup value deleted"}
 
 
-@router.post("/lookups/{category}/reorder", status_code=200)
+@router.post("/lookups/{category}/reorder", response_model=LookupBulkResult, status_code=200)
 async def reorder_lookup_values(
     category: str,
     ordered_ids: list[int],
     db: AsyncSession = Depends(get_db),
 ):
     """Reorder lookup values by providing an ordered list of IDs."""
-    await setting_service.reorder_lookup_values(db, category, ordered_ids)
-    return {"message": "Lookup values reordered"}
+    return await setting_service.reorder_lookup_values(db, category, ordered_ids)
+
+
+@router.post("/lookups/{category}/bulk", response_model=LookupBulkResult, status_code=201)
+async def bulk_create_lookup_values(
+    category: str,
+    items: list[LookupValueBulkItem],
+    db: AsyncSession = Depends(get_db),
+):
+    """Create many lookup values in a category; existing values are skipped."""
+    return await setting_service.bulk_create_lookup_values(db, category, items)
+
+
+@router.post("/lookups/{category}/bulk-status", response_model=LookupBulkResult, status_code=200)
+async def bulk_set_lookup_status(
+    category: str,
+    status_data: LookupValueBulkStatus,
+    db: AsyncSession = Depends(get_db),
+):
+    """Activate or deactivate several lookup values of a category."""
+    return await setting_service.set_lookup_values_active(
+        db, category, status_data.ids, status_data.is_active
+    )
+
+
+@router.post("/lookups/{category}/import", response_model=LookupBulkResult, status_code=200)
+async def import_lookup_values(
+    category: str,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """Import lookup values of a category from a CSV file (value, label, sort_order, is_active)."""
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No file uploaded")
+    if not file.filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="Invalid file format. Allowed: CSV")
+    
+    content = await file.read()
+    return await setting_service.import_lookup_values(db, category, content)
 
 
 # ============ Settings Endpoints ============
@@ -104,7 +144,7 @@ async def reorder_lookup_values(
 @router.get("", response_model=list[SettingResponse])
 async def list_settings(
     category: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all settings, optionally filtered by category."""
     settings = await setting_service.get_all_settings(db, category=category)
@@ -131,7 +171,7 @@ async def create_setting(
 @router.get("/{key:path}", response_model=SettingResponse)
 async def get_setting(
     key: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single setting by key."""
     setting = await setting_service.get_setting(db, key)
@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from src.models.task import TaskStatus, TaskPriority, Task
 from src.schemas.task import (
     TaskCreate,
@@ -41,7 +41,7 @@ async def list_tasks(
     assigned_to: str = Query(None),
     contact_id: int = Query(None),
     is_overdue: bool = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all tasks with pagination and filters."""
     skip = (page - 1) * page_size
@@ -87,7 +87,7 @@ async def list_tasks(
 async def list_my_tasks(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get tasks assigned to the current user."""
     # TODO: Get actual user from auth context
@@ -128,7 +128,7 @@ async def list_my_tasks(
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single task by ID."""
     task = await task_service.get_task(db, task_id)
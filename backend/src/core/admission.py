@@ -0,0 +1,190 @@
+"""Rate limiting and admission control for the public (unauthenticated) API.
+
+Public routes are limited per client IP and per campaign with token buckets,
+and the number of public requests in flight is capped so that a flood on the
+landing page form cannot take the whole database pool from internal users.
+Both checks run before the route opens a database session: the IP limit and
+the concurrency cap in PublicAdmissionMiddleware, the campaign limit at the
+top of the form submission route (the campaign id is only known after
+parsing). Campaign page views are cached and do not take campaign tokens.
+
+Buckets live in process memory by default. With public_rate_limit_backend
+"redis" they are shared by all workers through an atomic Lua script; Redis
+errors let requests through rather than taking the landing pages down.
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+from src.core.config import get_settings
+from src.core.metrics import observe_public_in_flight, record_public_rejection
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PUBLIC_PREFIX = "/api/public/"
+
+RATE_LIMITED = "Zu viele Anfragen. Bitte versuchen Sie es in Kürze erneut."
+OVERLOADED = "Der Dienst ist gerade ausgelastet. Bitte versuchen Sie es in Kürze erneut."
+
+
+class MemoryBuckets:
+    """Token buckets per key in this process, least recently used evicted."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, rate_per_minute: float, burst: int) -> float:
+        """Take a token; returns 0 if granted, else seconds until one is available."""
+        rate = rate_per_minute / 60
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        if tokens >= 1:
+            tokens, wait = tokens - 1, 0.0
+        else:
+            wait = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+# KEYS[1] bucket; ARGV rate per second, burst. Uses the Redis clock so all workers agree.
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBuckets:
+    """Token buckets shared by all workers; redis is imported on first use."""
+
+    def __init__(self, url: str):
+        import redis.asyncio
+
+        self._redis = redis.asyncio.from_url(url)
+        self._take = self._redis.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key: str, rate_per_minute: float, burst: int) -> float:
+        try:
+            wait = await self._take(keys=[f"ratelimit:{key}"], args=[rate_per_minute / 60, burst])
+        except Exception as e:
+            logger.warning("Rate limit check failed, letting the request through: %s", e)
+            return 0.0
+        return float(wait)
+
+    def clear(self) -> None:
+        pass
+
+
+_buckets: Optional[MemoryBuckets | RedisBuckets] = None
+
+
+def buckets() -> MemoryBuckets | RedisBuckets:
+    """The configured bucket store."""
+    global _buckets
+    if _buckets is None:
+        if settings.public_rate_limit_backend == "redis":
+            _buckets = RedisBuckets(settings.redis_url)
+        else:
+            _buckets = MemoryBuckets()
+    return _buckets
+
+
+def reset() -> None:
+    """Forget all in-process buckets."""
+    if _buckets is not None:
+        _buckets.clear()
+
+
+def _retry_after(wait: float) -> str:
+    return str(max(1, int(wait + 0.999)))
+
+
+async def check_campaign(campaign_id: Optional[int]) -> None:
+    """Raise 429 when a campaign's form submissions exceed its bucket."""
+    if campaign_id is None or settings.public_campaign_rate_per_minute <= 0:
+        return
+    wait = await buckets().take(
+        f"campaign:{campaign_id}",
+        settings.public_campaign_rate_per_minute,
+        settings.public_campaign_burst,
+    )
+    if wait:
+        record_public_rejection("campaign_rate")
+        raise HTTPException(status_code=429, detail=RATE_LIMITED, headers={"Retry-After": _retry_after(wait)})
+
+
+def client_ip(scope) -> str:
+    """Client address; behind public_trusted_proxies proxies taken from X-Forwarded-For."""
+    hops = settings.public_trusted_proxies
+    if hops > 0:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                addresses = [address.strip() for address in value.decode("latin-1").split(",")]
+                return addresses[max(0, len(addresses) - hops)]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class PublicAdmissionMiddleware:
+    """ASGI middleware applying the IP limit and the concurrency cap to public routes."""
+
+    def __init__(self, app):
+        self.app = app
+        self.in_flight = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(PUBLIC_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        if settings.public_ip_rate_per_minute > 0:
+            wait = await buckets().take(
+                f"ip:{client_ip(scope)}", settings.public_ip_rate_per_minute, settings.public_ip_burst
+            )
+            if wait:
+                record_public_rejection("ip_rate")
+                response = JSONResponse(
+                    {"detail": RATE_LIMITED}, status_code=429, headers={"Retry-After": _retry_after(wait)}
+                )
+                await response(scope, receive, send)
+                return
+
+        if 0 < settings.public_max_concurrency <= self.in_flight:
+            record_public_rejection("concurrency")
+            response = JSONResponse({"detail": OVERLOADED}, status_code=503, headers={"Retry-After": "1"})
+            await response(scope, receive, send)
+            return
+
+        self.in_flight += 1
+        observe_public_in_flight(self.in_flight)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+            observe_public_in_flight(self.in_flight)
@@ -1,10 +1,46 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import asyncio
+import itertools
+import logging
+import time
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from fastapi import Request, Response
 from typing import AsyncGenerator
 
 from src.core.config import get_settings
+from src.core.metrics import observe_pool_wait
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Cookie that keeps a client's reads on the primary right after it wrote
+READ_PRIMARY_COOKIE = "crm_read_primary"
+
+# Replication lag in seconds; 0 when the replica has replayed everything it received
+REPLICA_LAG_SQL = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            # The engine label is passed as pool_logging_name
+            observe_pool_wait(self.logging_name or "default", time.perf_counter() - started)
+
 
 # Create async engine
 engine = create_async_engine(
@@ -12,10 +48,52 @@ engine = create_async_engine(
     echo=settings.debug,
     future=True,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    poolclass=TimedQueuePool,
+    pool_logging_name="primary",
 )
 
+
+def _read_only_connect_args(url: str) -> dict:
+    """Make PostgreSQL reject writes on read connections without an extra round trip."""
+    if make_url(url).drivername == "postgresql+asyncpg":
+        return {"server_settings": {"default_transaction_read_only": "on"}}
+    return {}
+
+
+def _create_read_engine(url: str, label: str) -> AsyncEngine:
+    """Create an autocommit engine, so read sessions never send BEGIN/COMMIT."""
+    return create_async_engine(
+        url,
+        echo=settings.debug,
+        future=True,
+        pool_pre_ping=True,
+        pool_size=settings.database_read_pool_size,
+        max_overflow=settings.database_read_max_overflow,
+        isolation_level="AUTOCOMMIT",
+        connect_args=_read_only_connect_args(url),
+        poolclass=TimedQueuePool,
+        pool_logging_name=label,
+    )
+
+
+# Read engine on the primary; used when no replica is configured or usable
+read_engine = _create_read_engine(settings.database_url, "read")
+
+# Replica pool, picked round-robin; health and lag are cached per replica
+_replicas = [
+    {
+        "url": url,
+        "engine": _create_read_engine(url, f"replica{index}"),
+        "healthy": True,
+        "lag": 0.0,
+        "checked_at": None,
+    }
+    for index, url in enumerate(settings.database_replica_urls_list)
+]
+_replica_cycle = itertools.count()
+
 # Create async session factory
 async_session_maker = async_sessionmaker(
     engine,
@@ -26,13 +104,94 @@ async_session_maker = async_sessionmaker(
 )
 
 
+read_session_maker = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+
+def pool_engines() -> dict[str, AsyncEngine]:
+    """All engines with their metric labels."""
+    engines = {"primary": engine, "read": read_engine}
+    for index, replica in enumerate(_replicas):
+        engines[f"replica{index}"] = replica["engine"]
+    return engines
+
+
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
     pass
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def _replica_lag(replica: dict) -> float:
+    """Query a replica's replication lag in seconds."""
+    async with replica["engine"].connect() as conn:
+        if conn.dialect.name == "postgresql":
+            lag = (await conn.execute(REPLICA_LAG_SQL)).scalar()
+        else:
+            lag = (await conn.execute(text("SELECT 0"))).scalar()
+    return float(lag or 0)
+
+
+async def _check_replica(replica: dict) -> None:
+    """Refresh a replica's health and lag if the cached values are stale.
+    
+    The check gives up after database_replica_check_timeout_seconds, and the
+    replica counts as unhealthy while it runs, so concurrent requests are not
+    sent to a replica that may have gone away.
+    """
+    now = time.monotonic()
+    checked_at = replica["checked_at"]
+    if checked_at is not None and now - checked_at < settings.database_replica_check_interval_seconds:
+        return
+    
+    # Set before awaiting so concurrent requests don't all run the check
+    replica["checked_at"] = now
+    was_healthy, replica["healthy"] = replica["healthy"], False
+    try:
+        replica["lag"] = await asyncio.wait_for(
+            _replica_lag(replica), settings.database_replica_check_timeout_seconds
+        )
+        replica["healthy"] = True
+    except Exception as e:
+        if was_healthy:
+            logger.warning(
+                "Read replica %s unavailable: %s: %s", make_url(replica["url"]).host, type(e).__name__, e
+            )
+
+
+async def choose_read_engine(prefer_primary: bool = False) -> AsyncEngine:
+    """Pick the engine for a read-only session.
+    
+    Replicas are tried round-robin; unhealthy ones and those lagging more than
+    database_replica_max_lag_seconds are skipped. Falls back to the primary.
+    """
+    if prefer_primary or not _replicas:
+        return read_engine
+    
+    for _ in range(len(_replicas)):
+        replica = _replicas[next(_replica_cycle) % len(_replicas)]
+        await _check_replica(replica)
+        if replica["healthy"] and replica["lag"] <= settings.database_replica_max_lag_seconds:
+            return replica["engine"]
+    
+    return read_engine
+
+
+async def get_db(response: Response) -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get database session."""
+    if _replicas:
+        # Read-your-writes: this client's next reads go to the primary
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            "1",
+            max_age=settings.database_read_your_writes_seconds,
+            httponly=True,
+            samesite="lax",
+        )
+    
     async with async_session_maker() as session:
         try:
             yield session
@@ -44,6 +203,38 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get a read-only database session.
+    
+    Use for list, detail, search and stats endpoints. The session runs in
+    autocommit mode, so no transaction is opened or committed; on PostgreSQL
+    the connection is read-only. Sessions go to a replica when one is
+    configured, healthy and caught up, unless the client wrote recently.
+    """
+    bind = await choose_read_engine(
+        prefer_primary=READ_PRIMARY_COOKIE in request.cookies
+    )
+    async with read_session_maker(bind=bind) as session:
+        yield session
+
+
+async def get_primary_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get a read-only database session on the primary.
+    
+    For reads that must see rows written moments ago by another session,
+    such as the progress of a background job, which a replica may lag behind.
+    """
+    async with read_session_maker(bind=read_engine) as session:
+        yield session
+
+
+def dialect_insert(db: AsyncSession, model):
+    """Build an INSERT for the session's dialect that supports ON CONFLICT clauses."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
 async def init_db() -> None:
     """Initialize database tables."""
     async with engine.begin() as conn:
@@ -0,0 +1,176 @@
+"""Per-request SQL instrumentation.
+
+SQLAlchemy cursor events count statements, database time and rows for
+whatever tracking scopes are active in the current context. The ASGI
+middleware opens one scope per request, reports it as a Server-Timing
+header and a log record, and flags statement shapes repeated within the
+request (the usual N+1 signature).
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.core.config import get_settings
+from src.core.metrics import observe_statement
+from src.core.slow_queries import record_slow_statement
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Active tracking scopes; nested scopes (e.g. a test around a request) all record
+_active_stats: ContextVar[tuple[dict, ...]] = ContextVar("sql_stats", default=())
+
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|:\w+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\?(\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a SQL statement so executions differing only in parameters compare equal."""
+    shape = _PLACEHOLDER.sub("?", statement)
+    shape = _PLACEHOLDER_LIST.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def new_stats() -> dict:
+    """Create an empty statistics record."""
+    return {"statements": 0, "db_time_ms": 0.0, "rows": 0, "shapes": Counter()}
+
+
+def repeated_statements(stats: dict, threshold: int = 0) -> dict[str, int]:
+    """Statement shapes executed at least `threshold` times (default: the configured limit)."""
+    threshold = threshold or settings.sql_repeat_threshold
+    return {shape: count for shape, count in stats["shapes"].items() if count >= threshold}
+
+
+@contextmanager
+def track_queries() -> Iterator[dict]:
+    """Record SQL statements executed in the current context into a stats dict."""
+    stats = new_stats()
+    token = _active_stats.set(_active_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+def _row_count(cursor) -> int:
+    """Rows affected or fetched by a cursor execution."""
+    if cursor.rowcount is not None and cursor.rowcount >= 0:
+        return cursor.rowcount
+    # The async driver adapters prefetch SELECT results into a deque
+    rows = getattr(cursor, "_rows", None)
+    return len(rows) if rows is not None else 0
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_stats.get() or settings.metrics_enabled or settings.slow_query_threshold_ms > 0:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not conn.info.get("query_start"):
+        return
+
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    elapsed_ms = elapsed * 1000
+    if settings.metrics_enabled:
+        observe_statement(statement, elapsed)
+
+    slow = 0 < settings.slow_query_threshold_ms <= elapsed_ms
+    scopes = _active_stats.get()
+    if not scopes and not slow:
+        return
+
+    shape = statement_shape(statement)
+    if slow:
+        record_slow_statement(conn, statement, shape, parameters, executemany, elapsed_ms)
+
+    rows = _row_count(cursor)
+    for stats in scopes:
+        stats["statements"] += 1
+        stats["db_time_ms"] += elapsed_ms
+        stats["rows"] += rows
+        stats["shapes"][shape] += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def server_timing(stats: dict, total_ms: float) -> str:
+    """Format request statistics as a Server-Timing header value."""
+    return (
+        f'db;dur={stats["db_time_ms"]:.1f};desc="{stats["statements"]} statements, {stats["rows"]} rows", '
+        f"total;dur={total_ms:.1f}"
+    )
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware adding per-request SQL statistics to headers and logs."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.sql_instrumentation_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        with track_queries() as stats:
+            async def send_with_timing(message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    total_ms = (time.perf_counter() - started) * 1000
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing(stats, total_ms).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                _log_request(scope, status_code, stats, (time.perf_counter() - started) * 1000)
+
+
+def _log_request(scope, status_code: int, stats: dict, duration_ms: float) -> None:
+    """Emit a structured log record for the request and warn about repeated statements."""
+    fields = {
+        "method": scope["method"],
+        "path": scope["path"],
+        "status_code": status_code,
+        "duration_ms": round(duration_ms, 1),
+        "db_statements": stats["statements"],
+        "db_time_ms": round(stats["db_time_ms"], 1),
+        "db_rows": stats["rows"],
+    }
+    logger.info(
+        "%s %s %d: %d statements, %.1f ms db, %.1f ms total",
+        scope["method"], scope["path"], status_code,
+        stats["statements"], stats["db_time_ms"], duration_ms,
+        extra=fields,
+    )
+
+    for shape, count in repeated_statements(stats).items():
+        logger.warning(
+            "Possible N+1 in %s %s: statement executed %d times: %s",
+            scope["method"], scope["path"], count, shape[:300],
+            extra={**fields, "repeated_count": count, "statement_shape": shape},
+        )
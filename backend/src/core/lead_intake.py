@@ -0,0 +1,130 @@
+"""Buffered lead creation for public form submissions.
+
+With lead_intake_async, the public form endpoint only validates the payload,
+appends a lead_intake row and answers 202. The worker started in the
+application lifespan claims queued submissions in batches and creates their
+companies, contacts, leads and history entries with a few set-based
+statements per batch. A batch that fails is retried one submission at a
+time, so a single bad submission cannot hold up the others.
+
+Backpressure: once the queue is deeper than lead_intake_max_depth, the
+endpoint answers 503 with Retry-After instead of queueing more. The depth is
+counted at most once per lead_intake_depth_check_seconds and exported as
+the lead_intake_queue_depth gauge.
+"""
+import asyncio
+import logging
+import time
+from typing import Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import get_settings
+from src.core.database import async_session_maker
+from src.core.metrics import observe_lead_intake_depth, record_lead_intake
+from src.models.lead_intake import LeadIntake
+from src.services import lead_intake_service
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# (monotonic time counted, depth); accepted submissions are added until the next count
+_depth: list = [float("-inf"), 0]
+
+
+async def queue_depth(db: AsyncSession, refresh: bool = False) -> int:
+    """Approximate number of queued submissions, counted at most once per interval."""
+    now = time.monotonic()
+    if refresh or now - _depth[0] >= settings.lead_intake_depth_check_seconds:
+        _depth[:] = [now, await lead_intake_service.count_queued(db)]
+        observe_lead_intake_depth(_depth[1])
+    return _depth[1]
+
+
+async def accept_submission(db: AsyncSession, form_data) -> Optional[LeadIntake]:
+    """Queue a submission, or return None when the queue is full."""
+    if await queue_depth(db) >= settings.lead_intake_max_depth:
+        return None
+    entry = await lead_intake_service.enqueue_lead(db, form_data)
+    _depth[1] += 1
+    return entry
+
+
+class LeadIntakeWorker:
+    """Claims queued submissions and creates their leads in batches."""
+
+    def __init__(
+        self,
+        session_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.session_factory = session_factory or async_session_maker
+        self.batch_size = batch_size or settings.lead_intake_batch_size
+
+    async def _create_each(self, entries: Sequence[LeadIntake]) -> None:
+        """Create leads one submission per transaction, failing only the bad ones."""
+        for entry in entries:
+            async with self.session_factory() as db:
+                try:
+                    await lead_intake_service.create_leads(db, [entry])
+                    await db.commit()
+                    record_lead_intake("created")
+                    continue
+                except Exception as e:
+                    await db.rollback()
+                    error = f"{type(e).__name__}: {e}"
+                failed = await lead_intake_service.mark_failed(
+                    db, [entry], error, settings.lead_intake_max_attempts
+                )
+                await db.commit()
+                record_lead_intake("failed" if failed else "retry")
+                logger.warning("Lead intake %s failed: %s", entry.id, error)
+
+    async def run_once(self) -> int:
+        """Claim and process one batch; returns the number of submissions claimed."""
+        async with self.session_factory() as db:
+            entries = await lead_intake_service.claim_submissions(
+                db, self.batch_size, settings.lead_intake_claim_timeout_seconds
+            )
+        if entries:
+            async with self.session_factory() as db:
+                try:
+                    await lead_intake_service.create_leads(db, entries)
+                    await db.commit()
+                    record_lead_intake("created", len(entries))
+                except Exception:
+                    await db.rollback()
+                    logger.exception("Lead intake batch of %d failed, retrying one by one", len(entries))
+                    batch_failed = True
+                else:
+                    batch_failed = False
+            if batch_failed:
+                await self._create_each(entries)
+        async with self.session_factory() as db:
+            await queue_depth(db, refresh=True)
+        return len(entries)
+
+    async def run(self) -> None:
+        """Process forever; full batches are followed by the next one right away."""
+        while True:
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                logger.exception("Lead intake batch failed")
+                claimed = 0
+            if claimed < self.batch_size:
+                await asyncio.sleep(settings.lead_intake_poll_seconds)
+
+
+def start_lead_intake_worker() -> asyncio.Task:
+    """Start creating queued leads on the running loop."""
+    return asyncio.create_task(LeadIntakeWorker().run(), name="lead-intake-worker")
+
+
+async def stop_lead_intake_worker(task: asyncio.Task) -> None:
+    """Cancel the worker; claimed submissions are reclaimed after the claim timeout."""
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
@@ -0,0 +1,172 @@
+"""Event-loop lag monitoring and blocking-call detection.
+
+A background task sleeps for a fixed interval and measures how much later
+than requested it woke up. Sustained lag means something is blocking the
+loop (synchronous I/O, CPU-heavy work) and every request waits for it.
+
+Alongside the probe, a watchdog thread pings the loop. When a ping is not
+answered within LOOP_BLOCK_THRESHOLD_MS, it captures the loop thread's
+stack, which shows the coroutine doing the blocking work, and logs it once
+the loop responds again.
+
+Strict mode (LOOP_BLOCK_STRICT_MS, meant for tests) times every callback
+the loop runs and fails a request when one of its steps blocked longer
+than the limit. It patches asyncio's Handle and so needs the default
+event loop implementation.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from contextvars import ContextVar
+from typing import Optional
+
+from src.core.config import get_settings
+from src.core.metrics import observe_loop_block, observe_loop_lag
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Blocking steps of the current request, set by LoopBlockGuardMiddleware in strict mode
+_strict_guard: ContextVar[Optional[dict]] = ContextVar("loop_block_guard", default=None)
+
+_original_handle_run = None
+_step_started = 0.0
+
+
+class LoopBlockedError(RuntimeError):
+    """A request blocked the event loop longer than the strict-mode limit."""
+
+
+def _describe_task(task) -> str:
+    """Task name and the innermost coroutine position it is suspended at."""
+    coro = task.get_coro()
+    description = f"{task.get_name()} {getattr(coro, '__qualname__', coro)}"
+    while getattr(getattr(coro, "cr_await", None), "cr_frame", None) is not None:
+        coro = coro.cr_await
+    frame = getattr(coro, "cr_frame", None)
+    if frame is not None:
+        description += f" at {frame.f_code.co_name} ({frame.f_code.co_filename}:{frame.f_lineno})"
+    return description
+
+
+def _watch(loop: asyncio.AbstractEventLoop, thread_id: int, threshold: float, stop: threading.Event) -> None:
+    """Ping the loop from a thread and report stretches without an answer."""
+    while not stop.wait(threshold):
+        pong = threading.Event()
+        started = time.perf_counter()
+        try:
+            loop.call_soon_threadsafe(pong.set)
+        except RuntimeError:
+            return  # Loop closed
+        if pong.wait(threshold):
+            continue
+
+        frame = sys._current_frames().get(thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "(unavailable)\n"
+        task = asyncio.current_task(loop)
+        while not pong.wait(threshold) and not stop.is_set():
+            pass
+
+        blocked = time.perf_counter() - started
+        observe_loop_block(blocked)
+        logger.warning(
+            "Event loop blocked for %.0f ms in %s\n%s",
+            blocked * 1000,
+            _describe_task(task) if task is not None else "a plain callback",
+            stack.rstrip(),
+        )
+
+
+async def _probe(interval: float) -> None:
+    """Measure scheduling delay forever, with the watchdog running alongside."""
+    stop = threading.Event()
+    if settings.loop_block_threshold_ms > 0:
+        threading.Thread(
+            target=_watch,
+            args=(asyncio.get_running_loop(), threading.get_ident(), settings.loop_block_threshold_ms / 1000, stop),
+            name="loop-block-watchdog",
+            daemon=True,
+        ).start()
+    try:
+        while True:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            observe_loop_lag(max(time.perf_counter() - expected, 0.0))
+    finally:
+        stop.set()
+
+
+def start_loop_monitor(interval: Optional[float] = None) -> asyncio.Task:
+    """Start the lag probe and the blocking watchdog on the running loop."""
+    interval = interval or settings.loop_lag_interval_seconds
+    return asyncio.create_task(_probe(interval), name="loop-lag-monitor")
+
+
+async def stop_loop_monitor(task: asyncio.Task) -> None:
+    """Cancel the lag probe and wait for it to finish."""
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+def _install_step_timer() -> None:
+    """Time every callback the loop runs and record slow ones against the guard in their context."""
+    global _original_handle_run
+    if _original_handle_run is not None:
+        return
+    _original_handle_run = asyncio.events.Handle._run
+
+    def _timed_run(handle):
+        global _step_started
+        _step_started = started = time.perf_counter()
+        _original_handle_run(handle)
+        guard = handle._context.get(_strict_guard)
+        if guard is not None:
+            owner = getattr(handle._callback, "__self__", None)
+            owner = owner if isinstance(owner, asyncio.Task) else handle._callback
+            _check_step(guard, max(started, guard["started"]), owner)
+
+    asyncio.events.Handle._run = _timed_run
+
+
+def _check_step(guard: dict, started: float, owner) -> None:
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms > guard["limit_ms"]:
+        guard["violations"].append({
+            "ms": round(elapsed_ms, 1),
+            "step": _describe_task(owner) if isinstance(owner, asyncio.Task) else repr(owner),
+        })
+
+
+class LoopBlockGuardMiddleware:
+    """ASGI middleware failing requests that block the loop in strict mode."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        limit_ms = settings.loop_block_strict_ms
+        if scope["type"] != "http" or limit_ms <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        _install_step_timer()
+        guard = {"limit_ms": limit_ms, "started": time.perf_counter(), "violations": []}
+        token = _strict_guard.set(guard)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _strict_guard.reset(token)
+            # The step finishing the request ends after the guard is gone
+            _check_step(guard, max(_step_started, guard["started"]), asyncio.current_task())
+
+        if guard["violations"]:
+            steps = "\n".join(f"  {v['ms']} ms: {v['step']}" for v in guard["violations"])
+            raise LoopBlockedError(
+                f"{scope['method']} {scope['path']} blocked the event loop longer than {limit_ms} ms:\n{steps}"
+            )
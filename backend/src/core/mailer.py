@@ -0,0 +1,219 @@
+"""Outbox delivery over pooled SMTP connections.
+
+Requests only insert email_outbox rows in their own transaction. The worker
+started in the application lifespan claims due rows in batches and delivers
+them concurrently over a pool of persistent aiosmtplib connections, within
+a per-minute rate limit. Transient failures are retried with exponential
+backoff; permanent rejections (5xx) and messages out of attempts are
+dead-lettered with the last error.
+
+aiosmtplib is imported on the first delivery, keeping it out of
+the application import.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from email.message import EmailMessage
+from email.utils import formataddr, make_msgid
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import get_settings
+from src.core.database import async_session_maker
+from src.core.metrics import record_email_delivery
+from src.models.email_outbox import EmailOutbox, OutboxStatus
+from src.services import outbox_service
+
+if TYPE_CHECKING:
+    import aiosmtplib
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Allow at most `per_minute` acquisitions in any 60-second window."""
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self._sent: deque[float] = deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.per_minute <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._sent and self._sent[0] <= now - 60:
+                    self._sent.popleft()
+                if len(self._sent) < self.per_minute:
+                    self._sent.append(now)
+                    return
+                await asyncio.sleep(self._sent[0] + 60 - now)
+
+
+class SMTPPool:
+    """Up to `size` persistent SMTP connections, reused across messages."""
+
+    def __init__(self, size: int):
+        self._idle: list["aiosmtplib.SMTP"] = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def _connect(self) -> "aiosmtplib.SMTP":
+        import aiosmtplib
+
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.smtp_host,
+            port=settings.smtp_port,
+            timeout=settings.smtp_timeout_seconds,
+        )
+        await smtp.connect()
+        if settings.smtp_user:
+            await smtp.login(settings.smtp_user, settings.smtp_password)
+        return smtp
+
+    @asynccontextmanager
+    async def connection(self):
+        """Borrow a connection; it is discarded if the caller fails with it."""
+        async with self._slots:
+            smtp = self._idle.pop() if self._idle else None
+            if smtp is None or not smtp.is_connected:
+                smtp = await self._connect()
+            try:
+                yield smtp
+            except BaseException:
+                smtp.close()
+                raise
+            self._idle.append(smtp)
+
+    async def close(self) -> None:
+        while self._idle:
+            smtp = self._idle.pop()
+            try:
+                await smtp.quit()
+            except Exception:
+                smtp.close()
+
+
+def build_message(entry: EmailOutbox) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = formataddr((settings.smtp_from_name, settings.smtp_from_email))
+    message["To"] = formataddr((entry.to_name or "", entry.to_email))
+    message["Subject"] = entry.subject
+    message["Message-ID"] = make_msgid(idstring=f"outbox-{entry.id}")
+    message.set_content(entry.body)
+    return message
+
+
+def is_permanent(error: Exception) -> bool:
+    """5xx replies and refused recipients will not succeed on retry."""
+    import aiosmtplib
+
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(error, aiosmtplib.SMTPResponseException) and 500 <= error.code < 600
+
+
+class OutboxWorker:
+    """Claims due outbox messages and delivers them."""
+
+    def __init__(
+        self,
+        session_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+        pool_size: Optional[int] = None,
+        rate_per_minute: Optional[int] = None,
+    ):
+        self.session_factory = session_factory or async_session_maker
+        self.pool = SMTPPool(pool_size or settings.smtp_pool_size)
+        self.limiter = RateLimiter(
+            settings.smtp_rate_per_minute if rate_per_minute is None else rate_per_minute
+        )
+
+    async def _send(self, entry: EmailOutbox) -> Optional[Exception]:
+        """Deliver one message; returns the error, if any."""
+        import aiosmtplib
+
+        await self.limiter.acquire()
+        message = build_message(entry)
+        for attempt in range(2):
+            try:
+                async with self.pool.connection() as smtp:
+                    await smtp.send_message(message)
+                return None
+            except aiosmtplib.SMTPServerDisconnected as e:
+                # Idle pooled connections get closed by the server; retry once on a fresh one
+                if attempt:
+                    return e
+            except Exception as e:
+                return e
+
+    async def run_once(self) -> int:
+        """Claim and deliver one batch; returns the number of messages claimed."""
+        async with self.session_factory() as db:
+            entries = await outbox_service.claim_messages(
+                db, settings.email_outbox_batch_size, settings.email_outbox_claim_timeout_seconds
+            )
+        if not entries:
+            return 0
+
+        errors = await asyncio.gather(*(self._send(entry) for entry in entries))
+
+        async with self.session_factory() as db:
+            sent = [entry for entry, error in zip(entries, errors) if error is None]
+            await outbox_service.mark_sent(db, sent)
+            for _ in sent:
+                record_email_delivery("sent")
+            for entry, error in zip(entries, errors):
+                if error is None:
+                    continue
+                status = await outbox_service.mark_failed(
+                    db,
+                    entry,
+                    f"{type(error).__name__}: {error}",
+                    is_permanent(error),
+                    settings.smtp_max_attempts,
+                    settings.smtp_retry_base_seconds,
+                )
+                dead = status == OutboxStatus.DEAD
+                record_email_delivery("dead" if dead else "retry")
+                logger.warning(
+                    "Email %s to %s failed (%s): %s",
+                    entry.id,
+                    entry.to_email,
+                    "dead-lettered" if dead else "will retry",
+                    error,
+                )
+            await db.commit()
+        return len(entries)
+
+    async def run(self) -> None:
+        """Deliver forever; full batches are followed by the next one right away."""
+        try:
+            while True:
+                try:
+                    claimed = await self.run_once()
+                except Exception:
+                    logger.exception("Outbox delivery batch failed")
+                    claimed = 0
+                if claimed < settings.email_outbox_batch_size:
+                    await asyncio.sleep(settings.email_outbox_poll_seconds)
+        finally:
+            await self.pool.close()
+
+
+def start_outbox_worker() -> asyncio.Task:
+    """Start delivering outbox messages on the running loop."""
+    return asyncio.create_task(OutboxWorker().run(), name="email-outbox-worker")
+
+
+async def stop_outbox_worker(task: asyncio.Task) -> None:
+    """Cancel the worker; claimed messages are reclaimed after the claim timeout."""
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
@@ -0,0 +1,250 @@
+"""Prometheus metrics for the API, the connection pools, SQL and caches.
+
+Metrics live in the default prometheus_client registry. With several
+worker processes set PROMETHEUS_MULTIPROC_DIR; the /metrics endpoint then
+aggregates all workers.
+"""
+import os
+import re
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import REGISTRY
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status_code"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.5, 1, 2.5, 5, 10),
+)
+
+DB_STATEMENT_LATENCY = Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time by operation",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time a session waited for a pooled connection",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+
+EVENT_LOOP_LAG = Gauge(
+    "event_loop_lag_seconds",
+    "Most recent event-loop scheduling delay",
+    multiprocess_mode="max",
+)
+
+EVENT_LOOP_LAG_HISTOGRAM = Histogram(
+    "event_loop_lag_distribution_seconds",
+    "Event-loop scheduling delay",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+
+EVENT_LOOP_BLOCKED = Histogram(
+    "event_loop_blocked_seconds",
+    "Duration of stretches where the event loop did not respond to the watchdog",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result (hit or miss)",
+    ["cache", "result"],
+)
+
+EMAIL_DELIVERIES = Counter(
+    "email_deliveries_total",
+    "Outbox delivery attempts by result (sent, retry, dead)",
+    ["result"],
+)
+
+LEAD_INTAKE_DEPTH = Gauge(
+    "lead_intake_queue_depth",
+    "Form submissions queued or being processed, as last counted",
+)
+
+LEAD_INTAKE_PROCESSED = Counter(
+    "lead_intake_processed_total",
+    "Queued form submissions by result (created, retry, failed)",
+    ["result"],
+)
+
+PUBLIC_REJECTIONS = Counter(
+    "public_requests_rejected_total",
+    "Public API requests turned away by reason (ip_rate, campaign_rate, concurrency)",
+    ["reason"],
+)
+
+PUBLIC_IN_FLIGHT = Gauge(
+    "public_requests_in_flight",
+    "Public API requests being handled by this worker",
+)
+
+_PATH_PARAM = re.compile(r"{(\w+)(?::\w+)?}")
+
+_SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT", "ROLLBACK"}
+
+
+def observe_request(method: str, route: str, status_code: int, seconds: float) -> None:
+    """Record one HTTP request."""
+    REQUEST_LATENCY.labels(method, route, str(status_code)).observe(seconds)
+
+
+def observe_statement(statement: str, seconds: float) -> None:
+    """Record one SQL statement, labelled by its leading keyword."""
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    operation = keyword if keyword in _SQL_OPERATIONS else "OTHER"
+    DB_STATEMENT_LATENCY.labels(operation).observe(seconds)
+
+
+def observe_pool_wait(engine_label: str, seconds: float) -> None:
+    """Record how long acquiring a connection took."""
+    DB_POOL_WAIT.labels(engine_label).observe(seconds)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Record a cache lookup; hit ratio = hit / (hit + miss)."""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def observe_loop_lag(seconds: float) -> None:
+    """Record one event-loop lag sample."""
+    EVENT_LOOP_LAG.set(seconds)
+    EVENT_LOOP_LAG_HISTOGRAM.observe(seconds)
+
+
+def observe_loop_block(seconds: float) -> None:
+    """Record one stretch of blocked event loop."""
+    EVENT_LOOP_BLOCKED.observe(seconds)
+
+
+def record_email_delivery(result: str) -> None:
+    """Record one outbox delivery attempt."""
+    EMAIL_DELIVERIES.labels(result).inc()
+
+
+def observe_lead_intake_depth(depth: int) -> None:
+    """Record the counted lead intake queue depth."""
+    LEAD_INTAKE_DEPTH.set(depth)
+
+
+def record_lead_intake(result: str, count: int = 1) -> None:
+    """Record processed form submissions."""
+    if count:
+        LEAD_INTAKE_PROCESSED.labels(result).inc(count)
+
+
+def record_public_rejection(reason: str) -> None:
+    """Record one public request turned away."""
+    PUBLIC_REJECTIONS.labels(reason).inc()
+
+
+def observe_public_in_flight(count: int) -> None:
+    """Record the number of public requests in flight."""
+    PUBLIC_IN_FLIGHT.set(count)
+
+
+class PoolStatsCollector:
+    """Expose SQLAlchemy pool state at scrape time."""
+
+    def describe(self):
+        # Registration would otherwise call collect() while the engines are being created
+        return []
+
+    def collect(self):
+        from src.core.database import pool_engines
+
+        checked_out = GaugeMetricFamily(
+            "db_pool_checked_out", "Connections currently checked out", labels=["engine"]
+        )
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow", "Connections open beyond pool_size", labels=["engine"]
+        )
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size", labels=["engine"])
+
+        for label, engine in pool_engines().items():
+            pool = engine.sync_engine.pool
+            if not hasattr(pool, "checkedout"):
+                continue
+            checked_out.add_metric([label], pool.checkedout())
+            overflow.add_metric([label], max(pool.overflow(), 0))
+            size.add_metric([label], pool.size())
+
+        yield checked_out
+        yield overflow
+        yield size
+
+
+REGISTRY.register(PoolStatsCollector())
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Render all metrics in the Prometheus text format."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(PoolStatsCollector())
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def route_template(scope) -> str:
+    """The matched route's path template, e.g. /api/contacts/{contact_id}.
+
+    Routes of included routers may carry only their own part of the path;
+    the prefix is recovered from the request path. Unmatched requests share
+    one label to keep cardinality bounded.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+
+    params = scope.get("path_params", {})
+    rendered = _PATH_PARAM.sub(lambda m: str(params.get(m.group(1), m.group(0))), template)
+    path = scope["path"]
+    if rendered and path.endswith(rendered):
+        return path[: len(path) - len(rendered)] + template
+    return template if rendered else path
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            observe_request(
+                scope["method"], route_template(scope), status_code, time.perf_counter() - started
+            )
@@ -0,0 +1,212 @@
+"""On-demand profiling of single requests.
+
+A request carrying the X-Profile header with the configured secret runs
+under cProfile while a sampler thread records the event-loop thread's
+stacks. Three files are stored per profile:
+
+- <id>.pstats: cProfile output (snakeviz, pstats)
+- <id>.folded: collapsed stacks for flamegraph.pl or speedscope
+- <id>.json: summary with the time split between pydantic validation and
+  serialization, ORM hydration and waiting for the database
+
+Only available in debug mode or with PROFILING_ENABLED, and only when
+PROFILING_SECRET is set.
+"""
+import asyncio
+import cProfile
+import hmac
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from src.core.config import get_settings
+from src.core.instrumentation import track_queries
+
+settings = get_settings()
+
+PROFILE_HEADER = "x-profile"
+
+_ORM_LOADING = os.path.join("sqlalchemy", "orm", "loading.py")
+
+# cProfile hooks the interpreter globally, so one profile at a time
+_profile_lock = threading.Lock()
+
+
+def profiling_allowed(secret: Optional[str]) -> bool:
+    """Whether a request presenting `secret` may be profiled."""
+    if not (settings.debug or settings.profiling_enabled) or not settings.profiling_secret:
+        return False
+    return secret is not None and hmac.compare_digest(secret, settings.profiling_secret)
+
+
+def profile_dir() -> Path:
+    return Path(settings.profiling_dir)
+
+
+class StackSampler:
+    """Sample one thread's Python stack at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        """Collapsed-stack format: one 'frame;frame;frame count' line per stack."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+def time_split(stats: pstats.Stats, db_time_ms: float) -> dict:
+    """
+    Attribute profiled time to validation, ORM hydration and the database.
+
+    Validation is the time inside pydantic-core validators and serializers,
+    hydration the time in SQLAlchemy's row loading. Both are approximate
+    where greenlet switches interleave with the database calls.
+    """
+    validation = orm = 0.0
+    for (filename, _, function), (_, _, _, cumulative, _) in stats.stats.items():
+        if filename == "~" and ("SchemaValidator" in function or "SchemaSerializer" in function):
+            validation += cumulative
+        elif filename.endswith(_ORM_LOADING) and function == "instances":
+            orm += cumulative
+    return {
+        "validation_ms": round(validation * 1000, 1),
+        "orm_hydration_ms": round(orm * 1000, 1),
+        "db_ms": round(db_time_ms, 1),
+    }
+
+
+def _top_functions(stats: pstats.Stats, limit: int = 25) -> list[dict]:
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        {
+            "function": f"{function} ({os.path.basename(filename)}:{line})",
+            "calls": calls,
+            "own_ms": round(own * 1000, 2),
+            "cumulative_ms": round(cumulative * 1000, 2),
+        }
+        for (filename, line, function), (_, calls, own, cumulative, _) in rows
+    ]
+
+
+def _write_profile(profile_id: str, summary: dict, profiler: cProfile.Profile, folded: str) -> None:
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(directory / f"{profile_id}.pstats")
+    (directory / f"{profile_id}.folded").write_text(folded)
+    (directory / f"{profile_id}.json").write_text(json.dumps(summary, indent=2))
+
+
+async def save_profile(profile_id: str, summary: dict, profiler: cProfile.Profile, sampler: StackSampler) -> None:
+    """Write the profile files in a thread, so disk I/O does not stall the event loop."""
+    await asyncio.to_thread(_write_profile, profile_id, summary, profiler, sampler.folded())
+
+
+def list_profiles(limit: int = 50) -> list[dict]:
+    """Stored profile summaries, newest first."""
+    files = sorted(profile_dir().glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True)
+    return [json.loads(path.read_text()) for path in files[:limit]]
+
+
+def profile_file(profile_id: str, extension: str) -> Optional[Path]:
+    """Path of a stored profile file, or None for unknown or malformed ids."""
+    try:
+        uuid.UUID(profile_id)
+    except ValueError:
+        return None
+    path = profile_dir() / f"{profile_id}.{extension}"
+    return path if path.is_file() else None
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests that carry the profiling header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        secret = dict(scope["headers"]).get(PROFILE_HEADER.encode())
+        if not profiling_allowed(secret.decode() if secret else None):
+            await self.app(scope, receive, send)
+            return
+
+        if not _profile_lock.acquire(blocking=False):
+            # Another request is being profiled; serve this one normally
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = str(uuid.uuid4())
+        status_code = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident(), settings.profiling_sample_interval_ms / 1000)
+        started = time.perf_counter()
+        try:
+            with track_queries() as query_stats:
+                sampler.start()
+                profiler.enable()
+                try:
+                    await self.app(scope, receive, send_with_profile_id)
+                finally:
+                    profiler.disable()
+                    sampler.stop()
+        finally:
+            _profile_lock.release()
+
+        total_ms = (time.perf_counter() - started) * 1000
+        stats = pstats.Stats(profiler)
+        summary = {
+            "id": profile_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "status_code": status_code,
+            "at": datetime.now(timezone.utc).isoformat(),
+            "total_ms": round(total_ms, 1),
+            "db_statements": query_stats["statements"],
+            **time_split(stats, query_stats["db_time_ms"]),
+            "samples": sum(sampler.stacks.values()),
+            "top_functions": _top_functions(stats),
+        }
+        await save_profile(profile_id, summary, profiler, sampler)
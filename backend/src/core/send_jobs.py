@@ -0,0 +1,62 @@
+"""Recovery of bulk send jobs.
+
+The send-bulk endpoint starts its job as a background task right after the
+response. A job whose process is restarted before it finishes would stay
+pending or running forever, so the worker started in the application
+lifespan polls for pending jobs and for running jobs whose locked_at has
+not been refreshed for email_send_job_claim_timeout_seconds, and runs them
+from the last contact they queued. Claims are conditional updates, so a job
+is only ever run by one process.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import get_settings
+from src.core.database import async_session_maker
+from src.services import email_service
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class SendJobWorker:
+    """Picks up pending and orphaned bulk send jobs and runs them."""
+
+    def __init__(self, session_factory: Optional[async_sessionmaker[AsyncSession]] = None):
+        self.session_factory = session_factory or async_session_maker
+
+    async def run_once(self) -> int:
+        """Run the jobs claimable now, one after another; returns how many were found."""
+        async with self.session_factory() as db:
+            job_ids = await email_service.claimable_send_jobs(
+                db, settings.email_send_job_claim_timeout_seconds
+            )
+        for job_id in job_ids:
+            await email_service.run_send_job(job_id, self.session_factory)
+        return len(job_ids)
+
+    async def run(self) -> None:
+        """Poll forever."""
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Send job recovery failed")
+            await asyncio.sleep(settings.email_send_job_poll_seconds)
+
+
+def start_send_job_worker() -> asyncio.Task:
+    """Start recovering send jobs on the running loop."""
+    return asyncio.create_task(SendJobWorker().run(), name="send-job-worker")
+
+
+async def stop_send_job_worker(task: asyncio.Task) -> None:
+    """Cancel the worker; an interrupted job is resumed after the claim timeout."""
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
@@ -0,0 +1,193 @@
+"""Slow-statement log.
+
+Statements slower than slow_query_threshold_ms are kept in a ring buffer
+with their shape, parameter types, duration and the service function that
+issued them. On PostgreSQL the plan can be captured as well: EXPLAIN runs
+in the background on a separate connection, never in the request path.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import sys
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+import greenlet
+from sqlalchemy.engine import Connection
+
+from src.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+_SERVICES_DIR = f"{os.sep}services{os.sep}"
+
+# Most recent slow statements, oldest dropped first
+_slow_queries: deque[dict] = deque(maxlen=settings.slow_query_buffer_size)
+
+# Fingerprints with an EXPLAIN in flight, and references keeping the tasks alive
+_explaining: set[str] = set()
+_explain_tasks: set[asyncio.Task] = set()
+
+
+def fingerprint(shape: str) -> str:
+    """Short stable identifier for a statement shape."""
+    return hashlib.sha1(shape.encode()).hexdigest()[:12]
+
+
+def _param_types(parameters, executemany: bool):
+    """Type names of the bound parameters (values are never stored)."""
+    if executemany and parameters:
+        parameters = parameters[0]
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    return [type(value).__name__ for value in parameters or ()]
+
+
+def _service_name(code) -> Optional[str]:
+    if _SERVICES_DIR in code.co_filename:
+        module = os.path.splitext(os.path.basename(code.co_filename))[0]
+        return f"{module}.{code.co_name}"
+    return None
+
+
+def _calling_service() -> Optional[str]:
+    """The innermost service function issuing the statement, e.g. contact_service.get_contacts.
+
+    Async sessions execute inside a greenlet whose frames end at SQLAlchemy;
+    the awaiting coroutines are on the parent greenlet's suspended stack.
+    """
+    frame = sys._getframe(1)
+    current = greenlet.getcurrent()
+    while True:
+        while frame is not None:
+            if name := _service_name(frame.f_code):
+                return name
+            frame = frame.f_back
+        current = current.parent
+        if current is None:
+            return None
+        frame = current.gr_frame
+
+
+def record_slow_statement(
+    conn: Connection, statement: str, shape: str, parameters, executemany: bool, elapsed_ms: float
+) -> None:
+    """Store a slow statement and schedule plan capture when enabled."""
+    entry = {
+        "fingerprint": fingerprint(shape),
+        "statement": shape,
+        "param_types": _param_types(parameters, executemany),
+        "duration_ms": round(elapsed_ms, 1),
+        "service": _calling_service(),
+        "at": datetime.now(timezone.utc).isoformat(),
+        "plan": None,
+    }
+    _slow_queries.append(entry)
+    logger.warning(
+        "Slow statement (%.1f ms) from %s: %s",
+        elapsed_ms, entry["service"] or "unknown", shape[:300],
+        extra={key: entry[key] for key in ("fingerprint", "duration_ms", "service")},
+    )
+
+    if settings.slow_query_explain and conn.dialect.name == "postgresql":
+        _schedule_explain(conn, entry, statement, parameters, executemany)
+
+
+def _known_plan(key: str):
+    """A plan already captured for this fingerprint, if any."""
+    for entry in reversed(_slow_queries):
+        if entry["fingerprint"] == key and entry["plan"] is not None:
+            return entry["plan"]
+    return None
+
+
+def _schedule_explain(conn: Connection, entry: dict, statement: str, parameters, executemany: bool) -> None:
+    """Capture the plan on a side connection without blocking the caller."""
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    if keyword not in _EXPLAINABLE or executemany:
+        return
+
+    plan = _known_plan(entry["fingerprint"])
+    if plan is not None:
+        entry["plan"] = plan
+        return
+    if entry["fingerprint"] in _explaining:
+        return
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    _explaining.add(entry["fingerprint"])
+    task = loop.create_task(_explain(conn.engine, entry, statement, parameters))
+    _explain_tasks.add(task)
+    task.add_done_callback(_explain_tasks.discard)
+
+
+async def _explain(sync_engine, entry: dict, statement: str, parameters) -> None:
+    """Run EXPLAIN (ANALYZE off, FORMAT JSON) and attach the plan to the entry."""
+    from src.core.database import engine, pool_engines
+
+    bind = next(
+        (candidate for candidate in pool_engines().values() if candidate.sync_engine is sync_engine),
+        engine,
+    )
+    try:
+        async with bind.connect() as conn:
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE off, FORMAT JSON) {statement}", parameters
+            )
+            plan = result.scalar()
+        entry["plan"] = plan
+    except Exception as e:
+        logger.info("Could not explain slow statement %s: %s", entry["fingerprint"], e)
+    finally:
+        _explaining.discard(entry["fingerprint"])
+
+
+def slow_query_report(limit: int = 20) -> list[dict]:
+    """
+    Group the buffered slow statements by fingerprint, worst total time first.
+
+    Returns:
+        One dict per fingerprint with count, total/avg/max duration, the
+        calling services, the latest parameter types and the latest plan.
+    """
+    groups: dict[str, dict] = {}
+    for entry in _slow_queries:
+        group = groups.setdefault(entry["fingerprint"], {
+            "fingerprint": entry["fingerprint"],
+            "statement": entry["statement"],
+            "count": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0,
+            "services": set(),
+            "param_types": None,
+            "plan": None,
+            "last_seen": None,
+        })
+        group["count"] += 1
+        group["total_ms"] += entry["duration_ms"]
+        group["max_ms"] = max(group["max_ms"], entry["duration_ms"])
+        if entry["service"]:
+            group["services"].add(entry["service"])
+        group["param_types"] = entry["param_types"]
+        group["plan"] = entry["plan"] or group["plan"]
+        group["last_seen"] = entry["at"]
+
+    report = sorted(groups.values(), key=lambda group: group["total_ms"], reverse=True)[:limit]
+    for group in report:
+        group["total_ms"] = round(group["total_ms"], 1)
+        group["avg_ms"] = round(group["total_ms"] / group["count"], 1)
+        group["services"] = sorted(group["services"])
+    return report
+
+
+def clear_slow_queries() -> None:
+    """Empty the ring buffer."""
+    _slow_queries.clear()
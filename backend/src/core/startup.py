@@ -0,0 +1,150 @@
+"""Coordinated application startup for multi-worker deployments.
+
+Every worker process runs the lifespan hook. Only the first one to take the
+startup lock verifies the schema and seeds lookup values; it then stores a
+fingerprint of what it prepared. Workers that find the same fingerprint skip
+all startup work.
+"""
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.database import Base, async_session_maker, dialect_insert
+from src.models.system_marker import SystemMarker
+from src.services.seed_service import DEFAULT_LOOKUP_VALUES, seed_lookup_values
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Arbitrary 64-bit key for pg_advisory_xact_lock, shared by all workers
+STARTUP_LOCK_KEY = 7_301_482_195_004_271
+
+STARTUP_MARKER_KEY = "startup_fingerprint"
+
+
+def get_alembic_heads() -> set[str]:
+    """Read the head revisions from the migration scripts (no database access)."""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+def get_startup_fingerprint(heads: set[str]) -> str:
+    """Fingerprint the schema and seed data a worker would prepare."""
+    payload = {
+        "heads": sorted(heads),
+        "tables": sorted(Base.metadata.tables),
+        "lookups": DEFAULT_LOOKUP_VALUES,
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+async def _read_optional(db: AsyncSession, stmt) -> Optional[list]:
+    """Run a query that may hit a missing table; return None instead of failing.
+
+    The savepoint keeps the surrounding transaction (and its lock) usable on
+    PostgreSQL, where a failed statement otherwise aborts the transaction.
+    """
+    try:
+        async with db.begin_nested():
+            result = await db.execute(stmt)
+            return list(result.scalars().all())
+    except Exception:
+        return None
+
+
+async def _prepare_schema(db: AsyncSession, heads: set[str]) -> str:
+    """Compare the database revision with the Alembic heads.
+
+    Databases that were never stamped by Alembic (local development) still
+    get tables via create_all; versioned databases are only checked.
+    """
+    revisions = await _read_optional(db, text("SELECT version_num FROM alembic_version"))
+
+    if revisions is None:
+        conn = await db.connection()
+        await conn.run_sync(Base.metadata.create_all)
+        return "created"
+
+    if set(revisions) == heads:
+        return "current"
+
+    logger.warning(
+        "Database schema at %s, migrations expect %s; run 'alembic upgrade heads'",
+        sorted(revisions),
+        sorted(heads),
+    )
+    return "outdated"
+
+
+async def _write_marker(db: AsyncSession, fingerprint: str) -> None:
+    """Store the startup fingerprint, outside the user-facing settings table."""
+    stmt = dialect_insert(db, SystemMarker).values(key=STARTUP_MARKER_KEY, value=fingerprint)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={"value": stmt.excluded.value},
+    )
+    await db.execute(stmt)
+
+
+async def coordinate_startup(
+    session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+) -> dict:
+    """
+    Prepare the database once per deployment instead of once per worker.
+
+    On PostgreSQL the work runs under a transaction-scoped advisory lock, so
+    concurrent workers queue up behind the first one and then find its
+    fingerprint already stored.
+
+    Returns:
+        A report with the outcome and the time spent, e.g.
+        {"skipped": True, "schema": "unchanged", "seeded": 0, "duration_ms": 3.1}.
+    """
+    started = time.perf_counter()
+    heads = get_alembic_heads()
+    fingerprint = get_startup_fingerprint(heads)
+    report = {"skipped": True, "schema": "unchanged", "seeded": 0}
+
+    async with session_factory() as session:
+        try:
+            if session.get_bind().dialect.name == "postgresql":
+                await session.execute(
+                    text("SELECT pg_advisory_xact_lock(:key)"), {"key": STARTUP_LOCK_KEY}
+                )
+
+            marker = await _read_optional(
+                session, select(SystemMarker.value).where(SystemMarker.key == STARTUP_MARKER_KEY)
+            )
+            if not marker or marker[0] != fingerprint:
+                report["skipped"] = False
+                report["schema"] = await _prepare_schema(session, heads)
+                if report["schema"] != "outdated":
+                    created = await seed_lookup_values(session)
+                    report["seeded"] = sum(created.values())
+                    await _write_marker(session, fingerprint)
+
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+    report["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(
+        "Startup %s in %.1f ms (schema=%s, seeded=%d lookup values)",
+        "skipped" if report["skipped"] else "completed",
+        report["duration_ms"],
+        report["schema"],
+        report["seeded"],
+    )
+    return report
@@ -0,0 +1,133 @@
+"""Compiled email templates.
+
+Templates use {{contact.first_name}}-style placeholders. Each template is
+parsed once into literal chunks and variable slots; rendering fills the
+slots and does a single join instead of scanning the whole text once per
+known variable. Compiled templates are cached per template id and
+updated_at, so every worker recompiles after an edit.
+"""
+import re
+from typing import Callable, Optional
+
+from src.core.metrics import record_cache
+
+PLACEHOLDER = re.compile(r"{{\s*([^{}]*?)\s*}}")
+
+# Known placeholders and how to read them from a contact and its company.
+# Getters only use column attributes, so a single projected row carrying
+# the columns of both (see VARIABLE_COLUMNS) works as contact and company.
+VARIABLES: dict[str, Callable] = {
+    "contact.first_name": lambda contact, company: contact.first_name or "",
+    "contact.last_name": lambda contact, company: contact.last_name or "",
+    "contact.full_name": lambda contact, company: (
+        f"{contact.title} {contact.first_name} {contact.last_name}"
+        if contact.title
+        else f"{contact.first_name} {contact.last_name}"
+    ),
+    "contact.email": lambda contact, company: contact.email or "",
+    "contact.phone": lambda contact, company: contact.phone or "",
+    "contact.position": lambda contact, company: contact.position or "",
+    "contact.salutation": lambda contact, company: contact.salutation or "",
+    "contact.title": lambda contact, company: contact.title or "",
+    "company.name": lambda contact, company: (company.name or "") if company else "",
+    "company.city": lambda contact, company: (company.city or "") if company else "",
+    "company.website": lambda contact, company: (company.website or "") if company else "",
+}
+
+# Columns each placeholder reads, as (model, attribute)
+VARIABLE_COLUMNS: dict[str, tuple[tuple[str, str], ...]] = {
+    "contact.first_name": (("contact", "first_name"),),
+    "contact.last_name": (("contact", "last_name"),),
+    "contact.full_name": (("contact", "title"), ("contact", "first_name"), ("contact", "last_name")),
+    "contact.email": (("contact", "email"),),
+    "contact.phone": (("contact", "phone"),),
+    "contact.position": (("contact", "position"),),
+    "contact.salutation": (("contact", "salutation"),),
+    "contact.title": (("contact", "title"),),
+    "company.name": (("company", "name"),),
+    "company.city": (("company", "city"),),
+    "company.website": (("company", "website"),),
+}
+
+# Template id -> (updated_at, compiled subject, compiled body)
+_compiled: dict[int, tuple] = {}
+
+
+def template_variables(text: str) -> list[str]:
+    """Placeholder names used in `text`, in order of first use."""
+    return list(dict.fromkeys(PLACEHOLDER.findall(text)))
+
+
+def unknown_variables(text: str) -> list[str]:
+    """Placeholders in `text` that are not in VARIABLES."""
+    return [name for name in template_variables(text) if name not in VARIABLES]
+
+
+class CompiledTemplate:
+    """A template split into literal chunks and variable slots."""
+
+    __slots__ = ("source", "variables", "_parts", "_slots", "_getters")
+
+    def __init__(self, source: str):
+        self.source = source
+        self._parts: list[str] = []
+        # (part index, index into _getters); each variable is read once per render
+        self._slots: list[tuple[int, int]] = []
+        positions: dict[str, int] = {}
+        position = 0
+        for match in PLACEHOLDER.finditer(source):
+            name = match.group(1)
+            if name not in VARIABLES:
+                # Unknown placeholders predating save-time validation stay as written
+                continue
+            self._parts.append(source[position:match.start()])
+            self._slots.append((len(self._parts), positions.setdefault(name, len(positions))))
+            self._parts.append("")
+            position = match.end()
+        self._parts.append(source[position:])
+        self.variables = list(positions)
+        self._getters = [VARIABLES[name] for name in self.variables]
+
+    def _join(self, values: list[str]) -> str:
+        parts = self._parts.copy()
+        for index, value in self._slots:
+            parts[index] = values[value]
+        return "".join(parts)
+
+    def render(self, contact, company=None) -> str:
+        if not self._slots:
+            return self.source
+        return self._join([getter(contact, company) for getter in self._getters])
+
+    def render_checked(self, contact, company=None) -> tuple[str, list[str]]:
+        """Render and list the variables that came out empty."""
+        if not self._slots:
+            return self.source, []
+        values = [getter(contact, company) for getter in self._getters]
+        missing = [name for name, value in zip(self.variables, values) if not value]
+        return self._join(values), missing
+
+
+def compiled_template(template) -> tuple[CompiledTemplate, CompiledTemplate]:
+    """Compiled subject and body of an EmailTemplate, cached until it changes."""
+    cached = _compiled.get(template.id)
+    # updated_at has one-second resolution on some backends; the sources settle ties
+    hit = (
+        cached is not None
+        and cached[0] == template.updated_at
+        and cached[1].source == template.subject
+        and cached[2].source == template.body
+    )
+    record_cache("email_template", hit)
+    if not hit:
+        cached = (template.updated_at, CompiledTemplate(template.subject), CompiledTemplate(template.body))
+        _compiled[template.id] = cached
+    return cached[1], cached[2]
+
+
+def invalidate_template(template_id: Optional[int] = None) -> None:
+    """Drop one compiled template, or all of them."""
+    if template_id is None:
+        _compiled.clear()
+    else:
+        _compiled.pop(template_id, None)
@@ -0,0 +1,312 @@
+"""Lightweight request tracing following the OpenTelemetry data model.
+
+Each sampled request gets a trace: a server span for the request, child
+spans for every service function and every SQL statement. Trace and span
+ids, W3C traceparent propagation, span kinds, attributes and status follow
+OpenTelemetry conventions, so the exported spans can be converted or
+replayed into an OTel collector later. Finished traces are written to a
+JSONL file (one span per line) or kept in memory.
+"""
+import functools
+import importlib
+import inspect
+import json
+import logging
+import pkgutil
+import random
+import re
+import secrets
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.core.config import get_settings
+from src.core.instrumentation import _row_count, statement_shape
+from src.core.metrics import route_template
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "x-request-id"
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+# Spans of the current trace, and the innermost open span
+_current_trace: ContextVar[Optional[dict]] = ContextVar("trace", default=None)
+_current_span: ContextVar[Optional[dict]] = ContextVar("span", default=None)
+
+# Id of the request being handled, sampled or not
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_memory_spans: deque[dict] = deque(maxlen=10_000)
+_export_lock = threading.Lock()
+
+
+def current_request_id() -> Optional[str]:
+    """Id of the request in the current context, whether or not it is traced."""
+    request_id = _request_id.get()
+    if request_id is None:
+        trace = _current_trace.get()
+        request_id = trace["request_id"] if trace else None
+    return request_id
+
+
+class RequestIdLogFilter(logging.Filter):
+    """Add the current request id to log records as `request_id` ("-" outside requests)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = current_request_id() or "-"
+        return True
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[tuple[str, str, bool]]:
+    """Trace id, parent span id and sampled flag from a W3C traceparent header."""
+    match = _TRACEPARENT.match(value or "")
+    if not match or match.group(1) == "0" * 32:
+        return None
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+
+def _begin_span(name: str, kind: str = "INTERNAL", attributes: Optional[dict] = None) -> Optional[dict]:
+    """Open a span under the current one; None when no trace is active."""
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    parent = _current_span.get()
+    return {
+        "trace_id": trace["trace_id"],
+        "span_id": secrets.token_hex(8),
+        "parent_span_id": parent["span_id"] if parent else trace["parent_span_id"],
+        "name": name,
+        "kind": kind,
+        "start_time_unix_nano": time.time_ns(),
+        "end_time_unix_nano": None,
+        "attributes": dict(attributes or {}),
+        "status": {"code": "UNSET"},
+    }
+
+
+def _end_span(span: dict, error: Optional[BaseException] = None) -> None:
+    span["end_time_unix_nano"] = time.time_ns()
+    if error is not None:
+        span["status"] = {"code": "ERROR", "message": f"{type(error).__name__}: {error}"}
+    trace = _current_trace.get()
+    if trace is not None and trace["trace_id"] == span["trace_id"]:
+        trace["spans"].append(span)
+
+
+@contextmanager
+def start_span(name: str, kind: str = "INTERNAL", attributes: Optional[dict] = None) -> Iterator[Optional[dict]]:
+    """Trace a block as a child of the current span; a no-op outside sampled traces."""
+    span = _begin_span(name, kind, attributes)
+    if span is None:
+        yield None
+        return
+
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        _end_span(span, e)
+        raise
+    else:
+        _end_span(span)
+    finally:
+        _current_span.reset(token)
+
+
+@contextmanager
+def start_trace(
+    name: str,
+    request_id: Optional[str] = None,
+    traceparent: Optional[str] = None,
+    kind: str = "SERVER",
+) -> Iterator[Optional[dict]]:
+    """
+    Start a trace with a root span and export it when the block ends.
+
+    An incoming traceparent continues the caller's trace and follows its
+    sampling decision; otherwise tracing_sample_rate decides.
+    """
+    parent = parse_traceparent(traceparent)
+    sampled = parent[2] if parent else random.random() < settings.tracing_sample_rate
+    if not sampled:
+        yield None
+        return
+
+    trace = {
+        "trace_id": parent[0] if parent else secrets.token_hex(16),
+        "parent_span_id": parent[1] if parent else None,
+        "request_id": request_id or _request_id.get() or uuid.uuid4().hex,
+        "spans": [],
+    }
+    token = _current_trace.set(trace)
+    try:
+        with start_span(name, kind, {"http.request_id": trace["request_id"]}) as root:
+            yield root
+    finally:
+        _current_trace.reset(token)
+        export_spans(trace["spans"])
+
+
+def export_spans(spans: list[dict]) -> None:
+    """Hand finished spans to the configured exporter."""
+    resource = {"service.name": settings.app_name, "service.version": settings.app_version}
+    records = [{**span, "resource": resource} for span in spans]
+    if settings.tracing_exporter == "memory":
+        _memory_spans.extend(records)
+        return
+
+    path = Path(settings.tracing_file)
+    lines = "".join(json.dumps(record, default=str) + "\n" for record in records)
+    try:
+        with _export_lock, path.open("a", encoding="utf-8") as f:
+            f.write(lines)
+    except OSError as e:
+        logger.warning("Could not write spans to %s: %s", path, e)
+
+
+def collected_spans(trace_id: Optional[str] = None) -> list[dict]:
+    """Spans held by the in-memory exporter, optionally for one trace."""
+    return [span for span in _memory_spans if trace_id is None or span["trace_id"] == trace_id]
+
+
+def clear_collected_spans() -> None:
+    _memory_spans.clear()
+
+
+def traced(fn, name: Optional[str] = None):
+    """Wrap a coroutine function so each call is a span when a trace is active."""
+    if getattr(fn, "__traced__", False):
+        return fn
+    span_name = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if _current_trace.get() is None:
+            return await fn(*args, **kwargs)
+        with start_span(span_name, attributes={"code.namespace": fn.__module__, "code.function": fn.__name__}):
+            return await fn(*args, **kwargs)
+
+    wrapper.__traced__ = True
+    return wrapper
+
+
+def instrument_services(package: str = "src.services") -> int:
+    """
+    Trace the public coroutine functions of every service module.
+
+    The module attributes are replaced, so routes and other services
+    calling through the module pick up the traced version.
+
+    Returns:
+        Number of functions wrapped.
+    """
+    wrapped = 0
+    for info in pkgutil.iter_modules(importlib.import_module(package).__path__):
+        module = importlib.import_module(f"{package}.{info.name}")
+        for attr, fn in list(vars(module).items()):
+            if (
+                not attr.startswith("_")
+                and inspect.iscoroutinefunction(fn)
+                and fn.__module__ == module.__name__
+                and not getattr(fn, "__traced__", False)
+            ):
+                setattr(module, attr, traced(fn))
+                wrapped += 1
+    return wrapped
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_trace.get() is None:
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    attributes = {"db.system": conn.dialect.name, "db.operation": operation}
+    if settings.tracing_record_statements:
+        attributes["db.statement"] = statement_shape(statement)
+    conn.info.setdefault("trace_spans", []).append(_begin_span(operation, "CLIENT", attributes))
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if not spans:
+        return
+    span = spans.pop()
+    if span is None:
+        return
+    if settings.tracing_record_rows:
+        span["attributes"]["db.rows"] = _row_count(cursor)
+    _end_span(span)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    conn = context.connection
+    spans = conn.info.get("trace_spans") if conn is not None else None
+    if spans:
+        span = spans.pop()
+        if span is not None:
+            _end_span(span, context.original_exception)
+
+
+class TracingMiddleware:
+    """ASGI middleware propagating request ids and opening a server span per sampled request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.tracing_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        # Resolved before sampling: every request gets and returns an id for its logs
+        request_id = headers.get(REQUEST_ID_HEADER.encode(), b"").decode()[:128] or uuid.uuid4().hex
+        traceparent = headers.get(b"traceparent", b"").decode() or None
+        status_code = 500
+        request_id_token = _request_id.set(request_id)
+
+        try:
+            with start_trace(f"{scope['method']} {scope['path']}", request_id, traceparent) as root:
+                trace = _current_trace.get()
+
+                async def send_with_ids(message):
+                    nonlocal status_code
+                    if message["type"] == "http.response.start":
+                        status_code = message["status"]
+                        response_headers = list(message.get("headers", []))
+                        response_headers.append((REQUEST_ID_HEADER.encode(), request_id.encode()))
+                        if root is not None:
+                            response_headers.append(
+                                (b"traceparent", f"00-{trace['trace_id']}-{root['span_id']}-01".encode())
+                            )
+                        message = {**message, "headers": response_headers}
+                    await send(message)
+
+                try:
+                    await self.app(scope, receive, send_with_ids)
+                finally:
+                    if root is not None:
+                        template = route_template(scope)
+                        root["name"] = f"{scope['method']} {template}"
+                        root["attributes"].update({
+                            "http.request.method": scope["method"],
+                            "http.route": template,
+                            "url.path": scope["path"],
+                            "http.response.status_code": status_code,
+                        })
+                        if status_code >= 500:
+                            root["status"] = {"code": "ERROR"}
+        finally:
+            _request_id.reset(request_id_token)
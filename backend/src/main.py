@@ -1,11 +1,19 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.core.admission import PublicAdmissionMiddleware
 from src.core.config import get_settings
-from src.core.database import init_db, async_session_maker
+from src.core.startup import coordinate_startup
+from src.core.instrumentation import QueryStatsMiddleware
+from src.core.lead_intake import start_lead_intake_worker, stop_lead_intake_worker
+from src.core.mailer import start_outbox_worker, stop_outbox_worker
+from src.core.send_jobs import start_send_job_worker, stop_send_job_worker
+from src.core.loop_monitor import LoopBlockGuardMiddleware, start_loop_monitor, stop_loop_monitor
+from src.core.metrics import MetricsMiddleware, render_metrics
+from src.core.profiling import ProfilingMiddleware
+from src.core.tracing import TracingMiddleware, instrument_services
 from src.api.routes import api_router
-from src.services.seed_service import seed_lookup_values
 
 settings = get_settings()
 
@@ -13,23 +21,23 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
-    # Startup
-    await init_db()
-    
-    # Seed default lookup values
-    async with async_session_maker() as session:
-        try:
-            created = await seed_lookup_values(session)
-            await session.commit()
-            total_created = sum(created.values())
-            if total_created > 0:
-                print(f"Seeded {total_created} lookup values across {len(created)} categories")
-        except Exception as e:
-            print(f"Error seeding lookup values: {e}")
-            await session.rollback()
+    # Startup: schema check and lookup seeding, once per deployment
+    app.state.startup_report = await coordinate_startup()
+    loop_monitor = start_loop_monitor() if settings.metrics_enabled else None
+    outbox_worker = start_outbox_worker() if settings.email_outbox_enabled else None
+    lead_intake_worker = start_lead_intake_worker() if settings.lead_intake_async else None
+    send_job_worker = start_send_job_worker() if settings.email_send_job_worker_enabled else None
     
     yield
     # Shutdown
+    if send_job_worker:
+        await stop_send_job_worker(send_job_worker)
+    if lead_intake_worker:
+        await stop_lead_intake_worker(lead_intake_worker)
+    if outbox_worker:
+        await stop_outbox_worker(outbox_worker)
+    if loop_monitor:
+        await stop_loop_monitor(loop_monitor)
 
 
 app = FastAPI(
@@ -50,6 +58,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request SQL statistics (Server-Timing header, logs, N+1 warnings)
+app.add_middleware(QueryStatsMiddleware)
+
+# Request latency histograms per route template
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+# cProfile and flame-graph stacks for requests carrying the X-Profile secret
+app.add_middleware(ProfilingMiddleware)
+
+# Strict mode: fail requests that block the event loop (tests)
+app.add_middleware(LoopBlockGuardMiddleware)
+
+# Rate limits and concurrency cap for /api/public, before any database work
+app.add_middleware(PublicAdmissionMiddleware)
+
+# Request, service and SQL spans with request id propagation (outermost)
+if settings.tracing_enabled:
+    instrument_services()
+app.add_middleware(TracingMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api")
 
@@ -62,3 +91,11 @@ async def root():
         "version": settings.app_version,
         "docs": "/docs" if settings.debug else "disabled",
     }
+
+
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus scrape endpoint."""
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
@@ -7,6 +7,11 @@ from src.models.lead import Lead, LeadStatus
 from src.models.task import Task, TaskStatus, TaskPriority
 from src.models.contact_history import ContactHistory, HistoryType
 from src.models.email_template import EmailTemplate
+from src.models.email_send_job import EmailSendJob, EmailJobStatus
+from src.models.email_outbox import EmailOutbox, OutboxStatus
+from src.models.lead_intake import LeadIntake, IntakeStatus
+from src.models.submission_key import SubmissionKey
+from src.models.system_marker import SystemMarker
 from src.models.setting import Setting
 from src.models.lookup_value import LookupValue
 from src.models.opportunity import Opportunity, OpportunityStage, STAGE_DEFAULT_PROBABILITY
@@ -24,6 +29,14 @@ __all__ = [
     "ContactHistory",
     "HistoryType",
     "EmailTemplate",
+    "EmailSendJob",
+    "EmailJobStatus",
+    "EmailOutbox",
+    "OutboxStatus",
+    "LeadIntake",
+    "IntakeStatus",
+    "SubmissionKey",
+    "SystemMarker",
     "Setting",
     "LookupValue",
     "Opportunity",
@@ -1,6 +1,7 @@
+import re
 from typing import TYPE_CHECKING, Optional
-from sqlalchemy import String, Integer, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Integer, Text, Index, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from src.core.database import Base
 from src.models.base import TimestampMixin
@@ -10,11 +11,42 @@ if TYPE_CHECKING:
     from src.models.opportunity import Opportunity
 
 
+# Legal forms dropped from the end of a name when matching companies
+_LEGAL_FORM = re.compile(
+    r"[\s,]+(gmbh\s*&\s*co\.?\s*kg|ges\.?\s*m\.?\s*b\.?\s*h\.?|gmbh|ag|kg|og|e\.\s*u\.?)$"
+)
+
+
+def normalize_company_name(name: Optional[str]) -> Optional[str]:
+    """
+    Matching key for a company name, None if blank.
+    
+    Case-folded with whitespace collapsed and trailing legal forms removed,
+    so "Muster GmbH", "Muster Gmbh " and "muster KG" share one key.
+    """
+    if name is None:
+        return None
+    key = " ".join(name.casefold().split())
+    while (stripped := _LEGAL_FORM.sub("", key)) != key:
+        key = stripped
+    return key.strip(" ,") or None
+
+
 class Company(Base, TimestampMixin):
     __tablename__ = "companies"
+    __table_args__ = (
+        Index(
+            "uq_companies_name_key",
+            "name_key",
+            unique=True,
+            postgresql_where=text("name_key IS NOT NULL"),
+            sqlite_where=text("name_key IS NOT NULL"),
+        ),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    name_key: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     street: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     zip_code: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     city: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
@@ -36,5 +68,10 @@ class Company(Base, TimestampMixin):
         "Opportunity", back_populates="company"
     )
     
+    @validates("name")
+    def _set_name_key(self, key: str, name: Optional[str]) -> Optional[str]:
+        self.name_key = normalize_company_name(name)
+        return name
+    
     def __repr__(self) -> str:
         return f"<Company(id={self.id}, name='{self.name}')>"
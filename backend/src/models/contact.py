@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, Optional
-from sqlalchemy import String, Text, ForeignKey, Boolean
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Text, ForeignKey, Boolean, Index, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from src.core.database import Base
 from src.models.base import TimestampMixin
@@ -13,13 +13,31 @@ if TYPE_CHECKING:
     from src.models.opportunity import Opportunity
 
 
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Matching key for an email address: trimmed and lower-cased, None if blank."""
+    if email is None:
+        return None
+    return email.strip().lower() or None
+
+
 class Contact(Base, TimestampMixin):
     __tablename__ = "contacts"
+    __table_args__ = (
+        # One contact per address; contacts without email are not constrained
+        Index(
+            "uq_contacts_email_normalized",
+            "email_normalized",
+            unique=True,
+            postgresql_where=text("email_normalized IS NOT NULL"),
+            sqlite_where=text("email_normalized IS NOT NULL"),
+        ),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     first_name: Mapped[str] = mapped_column(String(100), nullable=False)
     last_name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
+    email_normalized: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     phone: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     mobile: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     position: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
@@ -50,6 +68,15 @@ class Contact(Base, TimestampMixin):
         "Opportunity", back_populates="contact"
     )
     
+    @validates("email")
+    def _set_email_normalized(self, key: str, email: Optional[str]) -> Optional[str]:
+        # Leave it alone when the address is the same, so legacy duplicates
+        # (normalized value NULL, see migration 006) stay editable
+        normalized = normalize_email(email)
+        if normalized != normalize_email(self.email):
+            self.email_normalized = normalized
+        return email
+    
     @property
     def full_name(self) -> str:
         parts = []
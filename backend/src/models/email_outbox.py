@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Text, ForeignKey, Enum, Integer, DateTime, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+import enum
+
+from src.core.database import Base
+from src.models.base import TimestampMixin
+
+
+class OutboxStatus(str, enum.Enum):
+    """Outbox message delivery status."""
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    DEAD = "dead"  # Permanently failed or out of attempts
+
+
+class EmailOutbox(Base, TimestampMixin):
+    """Email waiting for SMTP delivery, written in the request transaction."""
+    
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+    
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    status: Mapped[OutboxStatus] = mapped_column(
+        Enum(OutboxStatus, values_callable=lambda x: [e.value for e in x]),
+        default=OutboxStatus.PENDING,
+        nullable=False,
+    )
+    to_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    to_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    subject: Mapped[str] = mapped_column(String(500), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    
+    # Foreign Keys
+    contact_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("contacts.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    template_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("email_templates.id", ondelete="SET NULL"), nullable=True
+    )
+    send_job_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("email_send_jobs.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    
+    def __repr__(self) -> str:
+        return f"<EmailOutbox(id={self.id}, status='{self.status.value}')>"
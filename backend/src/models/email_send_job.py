@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Text, ForeignKey, Enum, Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+import enum
+
+from src.core.database import Base
+from src.models.base import TimestampMixin
+
+
+class EmailJobStatus(str, enum.Enum):
+    """Bulk send job status."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class EmailSendJob(Base, TimestampMixin):
+    """Bulk mail-merge send of one template to many contacts."""
+    
+    __tablename__ = "email_send_jobs"
+    
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    status: Mapped[EmailJobStatus] = mapped_column(
+        Enum(EmailJobStatus, values_callable=lambda x: [e.value for e in x]),
+        default=EmailJobStatus.PENDING,
+        nullable=False,
+        index=True,
+    )
+    recipients: Mapped[str] = mapped_column(Text, nullable=False)  # JSON: {"contact_ids": [...]} or {"filter": {...}}
+    subject_override: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    sent: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    skipped: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # Contacts without email address
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    last_contact_id: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # Resume point after a restart
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)  # Refreshed per batch while running
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    
+    # Foreign Keys
+    template_id: Mapped[int] = mapped_column(
+        ForeignKey("email_templates.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    
+    def __repr__(self) -> str:
+        return f"<EmailSendJob(id={self.id}, status='{self.status.value}')>"
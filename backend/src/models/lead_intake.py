@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import ForeignKey, Enum, Integer, DateTime, Index, JSON, Text
+from sqlalchemy.orm import Mapped, mapped_column
+import enum
+
+from src.core.database import Base
+from src.models.base import TimestampMixin
+
+
+class IntakeStatus(str, enum.Enum):
+    """Queued form submission processing status."""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"  # Out of attempts
+
+
+class LeadIntake(Base, TimestampMixin):
+    """Validated landing page submission waiting to become a lead."""
+
+    __tablename__ = "lead_intake"
+    __table_args__ = (
+        Index("ix_lead_intake_status_id", "status", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    status: Mapped[IntakeStatus] = mapped_column(
+        Enum(IntakeStatus, values_callable=lambda x: [e.value for e in x]),
+        default=IntakeStatus.PENDING,
+        nullable=False,
+    )
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)  # LeadCreateFromForm
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Foreign Keys
+    lead_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("leads.id", ondelete="SET NULL"), nullable=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<LeadIntake(id={self.id}, status='{self.status.value}')>"
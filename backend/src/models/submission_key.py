@@ -0,0 +1,22 @@
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+from src.models.base import TimestampMixin
+
+
+class SubmissionKey(Base, TimestampMixin):
+    """Response of a public form submission, replayed for repeats until it expires."""
+
+    __tablename__ = "submission_keys"
+
+    # sha256 of an Idempotency-Key header or of the submission's identifying fields
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)  # idempotency, content
+    status_code: Mapped[int] = mapped_column(Integer, nullable=False)
+    response: Mapped[dict] = mapped_column(JSON, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<SubmissionKey(key='{self.key[:12]}', kind='{self.kind}')>"
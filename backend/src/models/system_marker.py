@@ -0,0 +1,17 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+from src.models.base import TimestampMixin
+
+
+class SystemMarker(Base, TimestampMixin):
+    """Internal state of the application itself, kept out of the user-facing settings."""
+
+    __tablename__ = "system_markers"
+
+    key: Mapped[str] = mapped_column(String(100), primary_key=True)
+    value: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<SystemMarker(key='{self.key}')>"
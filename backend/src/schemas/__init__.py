@@ -55,6 +55,9 @@ from src.schemas.setting import (
     LookupValueCreate,
     LookupValueUpdate,
     LookupValueResponse,
+    LookupValueBulkItem,
+    LookupValueBulkStatus,
+    LookupBulkResult,
     LOOKUP_CATEGORIES,
 )
 from src.schemas.opportunity import (
@@ -113,6 +116,9 @@ __all__ = [
     "LookupValueCreate",
     "LookupValueUpdate",
     "LookupValueResponse",
+    "LookupValueBulkItem",
+    "LookupValueBulkStatus",
+    "LookupBulkResult",
     "LOOKUP_CATEGORIES",
     "OpportunityCreate",
     "OpportunityCreateFromLead",
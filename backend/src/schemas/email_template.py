@@ -1,9 +1,21 @@
+from datetime import datetime
 from typing import Optional
-from pydantic import Field
+from pydantic import Field, field_validator, model_validator
 
+from src.core.templating import unknown_variables
+from src.models.email_send_job import EmailJobStatus
 from src.schemas.base import BaseSchema, TimestampSchema
 
 
+def _check_placeholders(v: Optional[str]) -> Optional[str]:
+    """Raise for placeholders with no known variable."""
+    if v is not None:
+        unknown = unknown_variables(v)
+        if unknown:
+            raise ValueError(f"Unbekannte Platzhalter: {', '.join('{{' + name + '}}' for name in unknown)}")
+    return v
+
+
 class EmailTemplateBase(BaseSchema):
     """Base email template schema."""
     
@@ -19,6 +31,12 @@ class EmailTemplateCreate(EmailTemplateBase):
     """Schema for creating an email template."""
     
     variables: Optional[list[str]] = None
+    
+    @field_validator('subject', 'body')
+    @classmethod
+    def placeholders_known(cls, v: str) -> str:
+        """Reject placeholders that rendering would not replace."""
+        return _check_placeholders(v)
 
 
 class EmailTemplateUpdate(BaseSchema):
@@ -31,6 +49,12 @@ class EmailTemplateUpdate(BaseSchema):
     category: Optional[str] = Field(None, max_length=50)
     is_active: Optional[bool] = None
     variables: Optional[list[str]] = None
+    
+    @field_validator('subject', 'body')
+    @classmethod
+    def placeholders_known(cls, v: Optional[str]) -> Optional[str]:
+        """Reject placeholders that rendering would not replace."""
+        return _check_placeholders(v)
 
 
 class EmailTemplateResponse(EmailTemplateBase, TimestampSchema):
@@ -63,3 +87,76 @@ class EmailPreviewResponse(BaseSchema):
     body: str
     to_email: str
     to_name: str
+
+
+class ContactFilter(BaseSchema):
+    """Contact selection for bulk sends, same filters as the contact list."""
+    
+    search: Optional[str] = None
+    company_id: Optional[int] = None
+    is_active: Optional[bool] = True
+
+
+class RecipientSelection(BaseSchema):
+    """Recipients by contact ids or by a contact filter, exactly one of them."""
+    
+    template_id: int
+    contact_ids: Optional[list[int]] = Field(None, min_length=1, max_length=100_000)
+    filter: Optional[ContactFilter] = None
+    
+    @model_validator(mode='after')
+    def one_recipient_selection(self) -> "RecipientSelection":
+        """Require either contact ids or a filter, not both."""
+        if (self.contact_ids is None) == (self.filter is None):
+            raise ValueError('Entweder contact_ids oder filter angeben')
+        return self
+
+
+class EmailBulkSend(RecipientSelection):
+    """Schema for sending a template to many contacts."""
+    
+    subject_override: Optional[str] = Field(None, max_length=500)
+
+
+class EmailBatchPreview(RecipientSelection):
+    """Schema for previewing a template for one page of recipients."""
+    
+    page: int = Field(1, ge=1)
+    page_size: int = Field(50, ge=1, le=200)
+
+
+class EmailBatchPreviewItem(BaseSchema):
+    """Rendered email for one recipient."""
+    
+    contact_id: int
+    to_email: str
+    to_name: str
+    subject: str
+    body: str
+    missing: list[str]  # Placeholders rendered empty, plus contact.email without address
+
+
+class EmailBatchPreviewResponse(BaseSchema):
+    """Schema for batch preview response."""
+    
+    items: list[EmailBatchPreviewItem]
+    total: int
+    page: int
+    page_size: int
+    with_missing: int  # Recipients on this page with at least one missing value
+
+
+class EmailSendJobResponse(TimestampSchema):
+    """Schema for bulk send job status."""
+    
+    id: int
+    template_id: int
+    status: EmailJobStatus
+    total: int
+    processed: int
+    sent: int
+    skipped: int
+    error: Optional[str] = None
+    created_by: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
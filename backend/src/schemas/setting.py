@@ -65,6 +65,33 @@ class LookupValueResponse(LookupValueBase, TimestampSchema):
     id: int
 
 
+class LookupValueBulkItem(BaseSchema):
+    """Schema for a single entry in a bulk create request (category comes from the path)."""
+    
+    value: str = Field(..., min_length=1, max_length=100)
+    label: str = Field(..., min_length=1, max_length=255)
+    sort_order: int = Field(default=0, ge=0)
+    is_active: bool = True
+
+
+class LookupValueBulkStatus(BaseSchema):
+    """Schema for activating or deactivating several lookup values at once."""
+    
+    ids: list[int] = Field(..., min_length=1)
+    is_active: bool
+
+
+class LookupBulkResult(BaseSchema):
+    """Schema for the outcome of a bulk lookup operation."""
+    
+    category: str
+    affected: int = 0
+    unknown_ids: list[int] = []
+    foreign_ids: list[int] = []  # IDs that exist but belong to another category
+    skipped_values: list[str] = []  # Values that already exist (bulk create)
+    errors: list[str] = []
+
+
 # ============ Lookup Categories ============
 
 # List of valid lookup categories for reference
@@ -1,10 +1,20 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
 from typing import Optional, Sequence
-from sqlalchemy import select, func
+from sqlalchemy import event, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.metrics import record_cache
 from src.models.campaign import Campaign
 from src.schemas.campaign import CampaignCreate, CampaignUpdate
 
+# Campaign id -> (monotonic expiry, public info and its ETag, or None if
+# missing or inactive). Bounded, since enumeration fills it with misses.
+_public_info: OrderedDict[int, tuple[float, Optional[tuple[dict, str]]]] = OrderedDict()
+PUBLIC_INFO_MAX_ENTRIES = 10_000
+
 
 async def get_campaigns(
     db: AsyncSession,
@@ -37,11 +47,71 @@ async def get_campaign(db: AsyncSession, campaign_id: int) -> Optional[Campaign]
     return result.scalar_one_or_none()
 
 
+async def get_public_campaign(
+    db: AsyncSession, campaign_id: int, ttl_seconds: float, negative_ttl_seconds: float
+) -> Optional[tuple[dict, str]]:
+    """
+    Landing page info of an active campaign and its ETag, cached in process.
+
+    Missing and inactive campaigns are cached as None for the shorter
+    negative TTL. Edits through this worker invalidate the entry once they
+    are committed; other workers pick them up when it expires. Read `db`
+    from the primary, so a miss cannot re-cache a row a replica has not
+    caught up on.
+    """
+    now = time.monotonic()
+    cached = _public_info.get(campaign_id)
+    hit = cached is not None and cached[0] > now
+    record_cache("public_campaign", hit)
+    if hit:
+        _public_info.move_to_end(campaign_id)
+        return cached[1]
+    
+    result = await db.execute(
+        select(Campaign.id, Campaign.name, Campaign.description, Campaign.lead_magnet, Campaign.is_active)
+        .where(Campaign.id == campaign_id)
+    )
+    row = result.one_or_none()
+    entry = None
+    if row is not None and row.is_active:
+        info = {
+            "id": row.id,
+            "name": row.name,
+            "description": row.description,
+            "lead_magnet": row.lead_magnet,
+        }
+        digest = hashlib.sha256(json.dumps(info, sort_keys=True).encode()).hexdigest()
+        entry = (info, f'"{digest[:32]}"')
+    
+    _public_info[campaign_id] = (now + (ttl_seconds if entry else negative_ttl_seconds), entry)
+    _public_info.move_to_end(campaign_id)
+    if len(_public_info) > PUBLIC_INFO_MAX_ENTRIES:
+        _public_info.popitem(last=False)
+    return entry
+
+
+def invalidate_public_campaign(campaign_id: Optional[int] = None) -> None:
+    """Drop one cached public campaign, or all of them."""
+    if campaign_id is None:
+        _public_info.clear()
+    else:
+        _public_info.pop(campaign_id, None)
+
+
+def _invalidate_after_commit(db: AsyncSession, campaign_id: int) -> None:
+    """Drop the cached public info when db commits; earlier, a concurrent miss could cache the old row again."""
+    event.listen(
+        db.sync_session, "after_commit", lambda session: invalidate_public_campaign(campaign_id), once=True
+    )
+
+
 async def create_campaign(db: AsyncSession, campaign_data: CampaignCreate) -> Campaign:
     """Create a new campaign."""
     campaign = Campaign(**campaign_data.model_dump())
     db.add(campaign)
     await db.flush()
+    # Its id may have been looked up (and cached as missing) before
+    _invalidate_after_commit(db, campaign.id)
     await db.refresh(campaign)
     return campaign
 
@@ -59,5 +129,6 @@ async def update_campaign(
         setattr(campaign, field, value)
     
     await db.flush()
+    _invalidate_after_commit(db, campaign_id)
     await db.refresh(campaign)
     return campaign
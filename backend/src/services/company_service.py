@@ -1,10 +1,14 @@
-from typing import Optional, Sequence
+from typing import Iterable, Optional, Sequence
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.company import Company
+from src.core.database import dialect_insert
+from src.models.company import Company, normalize_company_name
 from src.schemas.company import CompanyCreate, CompanyUpdate
 
+# Rows per multi-row upsert; keeps asyncpg well below its 32767 bind parameter limit
+BULK_CHUNK_SIZE = 1000
+
 
 async def get_companies(
     db: AsyncSession,
@@ -39,11 +43,48 @@ async def get_company(db: AsyncSession, company_id: int) -> Optional[Company]:
 
 
 async def get_company_by_name(db: AsyncSession, name: str) -> Optional[Company]:
-    """Get a company by exact name."""
-    result = await db.execute(select(Company).where(Company.name == name))
+    """Get a company by name, ignoring case, whitespace and legal form."""
+    key = normalize_company_name(name)
+    if key is None:
+        return None
+    result = await db.execute(select(Company).where(Company.name_key == key))
     return result.scalar_one_or_none()
 
 
+async def upsert_companies_by_name(db: AsyncSession, names: Iterable[str]) -> dict[str, int]:
+    """
+    Get or create companies by name.
+    
+    Names are matched by their normalized key; a missing company is created
+    with the first name given for its key, existing ones are returned
+    unchanged. Each chunk of BULK_CHUNK_SIZE keys is one
+    INSERT ... ON CONFLICT ... RETURNING, so concurrent imports of the same
+    company end up with one row.
+    
+    Returns:
+        Company id per normalized name.
+    """
+    rows: dict[str, dict] = {}
+    for name in names:
+        key = normalize_company_name(name)
+        if key is not None and key not in rows:
+            rows[key] = {"name": name.strip(), "name_key": key}
+    
+    ids: dict[str, int] = {}
+    values = list(rows.values())
+    for start in range(0, len(values), BULK_CHUNK_SIZE):
+        stmt = dialect_insert(db, Company).values(values[start:start + BULK_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Company.name_key],
+            index_where=Company.name_key.isnot(None),
+            # No-op update, so the existing row is locked and returned unchanged
+            set_={"name_key": stmt.excluded.name_key},
+        ).returning(Company.name_key, Company.id)
+        result = await db.execute(stmt)
+        ids.update(result.all())
+    return ids
+
+
 async def create_company(db: AsyncSession, company_data: CompanyCreate) -> Company:
     """Create a new company."""
     company = Company(**company_data.model_dump())
@@ -1,12 +1,16 @@
 from typing import Optional, Sequence
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, literal_column, Boolean
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from src.models.contact import Contact
+from src.core.database import dialect_insert
+from src.models.contact import Contact, normalize_email
 from src.models.company import Company
 from src.schemas.contact import ContactCreate, ContactUpdate, ContactSearchResult
 
+# Rows per multi-row upsert; keeps asyncpg well below its 32767 bind parameter limit
+BULK_CHUNK_SIZE = 1000
+
 
 async def get_contacts(
     db: AsyncSession,
@@ -107,6 +111,15 @@ async def get_contact(db: AsyncSession, contact_id: int) -> Optional[Contact]:
     return result.scalar_one_or_none()
 
 
+async def get_contact_by_email(db: AsyncSession, email: Optional[str]) -> Optional[Contact]:
+    """Get the contact matched by this email, ignoring case and surrounding whitespace."""
+    key = normalize_email(email)
+    if key is None:
+        return None
+    result = await db.execute(select(Contact).where(Contact.email_normalized == key))
+    return result.scalar_one_or_none()
+
+
 async def create_contact(db: AsyncSession, contact_data: ContactCreate) -> Contact:
     """Create a new contact."""
     contact = Contact(**contact_data.model_dump())
@@ -144,6 +157,17 @@ async def delete_contact(db: AsyncSession, contact_id: int) -> bool:
     return True
 
 
+def _upsert_by_email(db: AsyncSession, rows: list[dict]):
+    """INSERT ... ON CONFLICT on the normalized email that also returns existing contacts."""
+    stmt = dialect_insert(db, Contact).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[Contact.email_normalized],
+        index_where=Contact.email_normalized.isnot(None),
+        # No-op update, so the existing row is locked and returned unchanged
+        set_={"email_normalized": stmt.excluded.email_normalized},
+    )
+
+
 async def get_or_create_contact_by_email(
     db: AsyncSession,
     email: str,
@@ -152,23 +176,75 @@ async def get_or_create_contact_by_email(
     company_id: Optional[int] = None,
     **kwargs,
 ) -> tuple[Contact, bool]:
-    """Get existing contact by email or create new one."""
-    result = await db.execute(
-        select(Contact).where(Contact.email == email)
-    )
-    existing = result.scalar_one_or_none()
-    
-    if existing:
-        return existing, False
-    
-    contact = Contact(
-        email=email,
-        first_name=first_name,
-        last_name=last_name,
-        company_id=company_id,
-        **kwargs,
+    """
+    Get the contact with this email (ignoring case) or create it.
+    
+    A single INSERT ... ON CONFLICT ... RETURNING against the unique
+    normalized email, so concurrent submissions of one address get the
+    same contact. An existing contact is returned unchanged.
+    """
+    key = normalize_email(email)
+    if key is None:
+        contact = Contact(
+            email=email, first_name=first_name, last_name=last_name, company_id=company_id, **kwargs
+        )
+        db.add(contact)
+        await db.flush()
+        await db.refresh(contact)
+        return contact, True
+    
+    stmt = _upsert_by_email(
+        db,
+        [
+            {
+                "email": email,
+                "email_normalized": key,
+                "first_name": first_name,
+                "last_name": last_name,
+                "company_id": company_id,
+                **kwargs,
+            }
+        ],
     )
-    db.add(contact)
-    await db.flush()
-    await db.refresh(contact)
-    return contact, True
+    options = {"populate_existing": True}
+    if db.get_bind().dialect.name == "postgresql":
+        # xmax is 0 for a row this statement inserted
+        stmt = stmt.returning(Contact, literal_column("(xmax = 0)", Boolean))
+        contact, created = (await db.execute(stmt, execution_options=options)).one()
+        return contact, created
+    
+    # SQLite has no xmax; with its single writer the lookup cannot race
+    existing = await db.scalar(select(Contact.id).where(Contact.email_normalized == key))
+    contact = (await db.execute(stmt.returning(Contact), execution_options=options)).scalar_one()
+    return contact, existing is None
+
+
+async def upsert_contacts_by_email(db: AsyncSession, contacts: list[dict]) -> dict[str, int]:
+    """
+    Get or create many contacts by email.
+    
+    `contacts` are Contact column values including "email"; rows without an
+    address are ignored and an address repeated in `contacts` is created
+    from its first row. Existing contacts are returned unchanged. Each chunk
+    of BULK_CHUNK_SIZE addresses is one INSERT ... ON CONFLICT ... RETURNING.
+    
+    Returns:
+        Contact id per normalized email.
+    """
+    rows: dict[str, dict] = {}
+    for contact in contacts:
+        key = normalize_email(contact.get("email"))
+        if key is not None and key not in rows:
+            rows[key] = {**contact, "email_normalized": key}
+    if not rows:
+        return {}
+    
+    # Multi-row VALUES need the same columns in every row
+    columns = set().union(*rows.values())
+    values = [{column: row.get(column) for column in columns} for row in rows.values()]
+    ids: dict[str, int] = {}
+    for start in range(0, len(values), BULK_CHUNK_SIZE):
+        stmt = _upsert_by_email(db, values[start:start + BULK_CHUNK_SIZE])
+        result = await db.execute(stmt.returning(Contact.email_normalized, Contact.id))
+        ids.update(result.all())
+    return ids
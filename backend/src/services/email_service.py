@@ -1,14 +1,31 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Sequence
-from sqlalchemy import select, func
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select, func, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 import json
-import re
+import logging
 
-from src.models.email_template import EmailTemplate
-from src.models.contact import Contact
+from src.core.config import get_settings
+from src.core.database import async_session_maker
+from src.core.templating import VARIABLE_COLUMNS, VARIABLES, compiled_template, invalidate_template
 from src.models.company import Company
-from src.schemas.email_template import EmailTemplateCreate, EmailTemplateUpdate
-from src.services import history_service
+from src.models.contact import Contact
+from src.models.email_send_job import EmailJobStatus, EmailSendJob
+from src.models.email_template import EmailTemplate
+from src.schemas.email_template import (
+    EmailBatchPreview,
+    EmailBulkSend,
+    EmailTemplateCreate,
+    EmailTemplateUpdate,
+    RecipientSelection,
+)
+from src.services import outbox_service
+
+logger = logging.getLogger(__name__)
+
+# Ids per IN list; keeps asyncpg well below its 32767 bind parameter limit
+RECIPIENT_ID_CHUNK_SIZE = 1000
 
 
 async def get_templates(
@@ -83,31 +100,10 @@ async def update_template(
     
     await db.flush()
     await db.refresh(template)
+    invalidate_template(template.id)
     return template
 
 
-def _replace_variables(text: str, contact: Contact, company: Optional[Company]) -> str:
-    """Replace template variables with actual values."""
-    replacements = {
-        "{{contact.first_name}}": contact.first_name,
-        "{{contact.last_name}}": contact.last_name,
-        "{{contact.full_name}}": contact.full_name,
-        "{{contact.email}}": contact.email or "",
-        "{{contact.phone}}": contact.phone or "",
-        "{{contact.position}}": contact.position or "",
-        "{{contact.salutation}}": contact.salutation or "",
-        "{{contact.title}}": contact.title or "",
-        "{{company.name}}": company.name if company else "",
-        "{{company.city}}": company.city if company else "",
-        "{{company.website}}": company.website if company else "",
-    }
-    
-    for var, value in replacements.items():
-        text = text.replace(var, value)
-    
-    return text
-
-
 async def preview_email(
     db: AsyncSession, template_id: int, contact_id: int
 ) -> Optional[dict]:
@@ -122,11 +118,11 @@ async def preview_email(
     if not contact:
         return None
     
-    company = contact.company
+    subject, body = compiled_template(template)
     
     return {
-        "subject": _replace_variables(template.subject, contact, company),
-        "body": _replace_variables(template.body, contact, company),
+        "subject": subject.render(contact, contact.company),
+        "body": body.render(contact, contact.company),
         "to_email": contact.email or "",
         "to_name": contact.full_name,
     }
@@ -141,7 +137,6 @@ async def send_email(
 ) -> bool:
     """Send an email using a template."""
     from src.services import contact_service
-    from src.core.config import get_settings
     
     # Get template and contact
     template = await get_template(db, template_id)
@@ -152,25 +147,309 @@ async def send_email(
     if not contact or not contact.email:
         return False
     
-    company = contact.company
-    
     # Replace variables
-    subject = subject_override or _replace_variables(template.subject, contact, company)
-    body = _replace_variables(template.body, contact, company)
-    
-    # TODO: Actually send email via SMTP
-    # settings = get_settings()
-    # async with aiosmtplib.SMTP(hostname=settings.smtp_host, port=settings.smtp_port) as smtp:
-    #     await smtp.login(settings.smtp_user, settings.smtp_password)
-    #     message = MIMEText(body)
-    #     message["Subject"] = subject
-    #     message["From"] = f"{settings.smtp_from_name} <{settings.smtp_from_email}>"
-    #     message["To"] = contact.email
-    #     await smtp.send_message(message)
-    
-    # Log to history
-    await history_service.add_email_sent(
-        db, contact_id, subject, template.name, created_by
+    compiled_subject, compiled_body = compiled_template(template)
+    subject = subject_override or compiled_subject.render(contact, contact.company)
+    body = compiled_body.render(contact, contact.company)
+    
+    # Delivered by the outbox worker once this transaction commits; it also
+    # writes the history entry when SMTP accepts the message
+    await outbox_service.enqueue_email(
+        db,
+        to_email=contact.email,
+        to_name=contact.full_name,
+        subject=subject,
+        body=body,
+        contact_id=contact.id,
+        template_id=template.id,
+        created_by=created_by,
     )
     
     return True
+
+
+def _recipients(selection: RecipientSelection) -> dict:
+    """Storable form of a recipient selection: sorted unique contact ids or the filter."""
+    if selection.contact_ids is not None:
+        return {"contact_ids": sorted(set(selection.contact_ids))}
+    return {"filter": selection.filter.model_dump()}
+
+
+def _recipient_filters(selection: dict) -> list:
+    """WHERE clauses for a stored contact filter."""
+    filters = []
+    if selection.get("search"):
+        search = selection["search"]
+        filters.append(or_(
+            Contact.first_name.ilike(f"%{search}%"),
+            Contact.last_name.ilike(f"%{search}%"),
+            Contact.email.ilike(f"%{search}%"),
+        ))
+    if selection.get("company_id") is not None:
+        filters.append(Contact.company_id == selection["company_id"])
+    if selection.get("is_active") is not None:
+        filters.append(Contact.is_active == selection["is_active"])
+    return filters
+
+
+def _id_chunks(ids: list[int], size: int = RECIPIENT_ID_CHUNK_SIZE):
+    """Consecutive slices of an id list, each small enough for one IN list."""
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+async def _count_recipients(db: AsyncSession, recipients: dict) -> int:
+    """Number of existing contacts in a stored recipient selection."""
+    if "contact_ids" not in recipients:
+        query = select(func.count(Contact.id)).where(*_recipient_filters(recipients["filter"]))
+        return await db.scalar(query) or 0
+    
+    total = 0
+    for chunk in _id_chunks(recipients["contact_ids"]):
+        total += await db.scalar(select(func.count(Contact.id)).where(Contact.id.in_(chunk))) or 0
+    return total
+
+
+async def _recipient_batches(db: AsyncSession, query, recipients: dict, batch_size: int, after_id: int = 0):
+    """Yield the rows of `query` for a stored recipient selection in id order, one query per batch.
+    
+    Only contacts with an id above `after_id` are selected. Filters page by
+    id; id selections bind one slice of the sorted id list per batch
+    instead of the whole list.
+    """
+    query = query.order_by(Contact.id)
+    if "contact_ids" in recipients:
+        contact_ids = recipients["contact_ids"]
+        remaining = contact_ids[bisect_right(contact_ids, after_id):]
+        for chunk in _id_chunks(remaining, min(batch_size, RECIPIENT_ID_CHUNK_SIZE)):
+            rows = (await db.execute(query.where(Contact.id.in_(chunk)))).all()
+            if rows:
+                yield rows
+        return
+    
+    query = query.where(*_recipient_filters(recipients["filter"])).limit(batch_size)
+    last_id = after_id
+    while True:
+        rows = (await db.execute(query.where(Contact.id > last_id))).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        yield rows
+
+
+def _recipient_query(variables: set[str]):
+    """Select the contact id, email and only the columns the placeholders read.
+    
+    Columns are labelled by attribute name, so each row works as both
+    contact and company for CompiledTemplate.render.
+    """
+    columns = {"id": Contact.id, "email": Contact.email}
+    join_company = False
+    for name in variables:
+        for model, attribute in VARIABLE_COLUMNS[name]:
+            if model == "company":
+                join_company = True
+                columns[attribute] = getattr(Company, attribute)
+            else:
+                columns[attribute] = getattr(Contact, attribute)
+    
+    query = select(*(column.label(label) for label, column in columns.items()))
+    if join_company:
+        query = query.outerjoin(Company, Contact.company_id == Company.id)
+    return query
+
+
+async def create_send_job(
+    db: AsyncSession,
+    send_data: EmailBulkSend,
+    created_by: Optional[str] = None,
+) -> Optional[EmailSendJob]:
+    """Create a pending bulk send job; None if the template does not exist."""
+    template = await get_template(db, send_data.template_id)
+    if not template:
+        return None
+    
+    recipients = _recipients(send_data)
+    
+    job = EmailSendJob(
+        template_id=template.id,
+        recipients=json.dumps(recipients),
+        subject_override=send_data.subject_override,
+        total=await _count_recipients(db, recipients),
+        created_by=created_by,
+    )
+    db.add(job)
+    await db.flush()
+    await db.refresh(job)
+    return job
+
+
+async def preview_batch(db: AsyncSession, preview_data: EmailBatchPreview) -> Optional[dict]:
+    """
+    Render a template for one page of recipients with a single projection query.
+    
+    Each item lists the placeholders that rendered empty (and contact.email
+    when there is no address), so gaps show up before a mailing.
+    """
+    template = await get_template(db, preview_data.template_id)
+    if not template:
+        return None
+    
+    subject, body = compiled_template(template)
+    recipients = _recipients(preview_data)
+    query = _recipient_query({"contact.full_name", *subject.variables, *body.variables}).order_by(Contact.id)
+    offset = (preview_data.page - 1) * preview_data.page_size
+    if "contact_ids" in recipients:
+        # Page through the id list, so only one page of ids is bound; unknown ids shorten a page
+        page_ids = recipients["contact_ids"][offset:offset + preview_data.page_size]
+        query = query.where(Contact.id.in_(page_ids))
+    else:
+        query = (
+            query.where(*_recipient_filters(recipients["filter"]))
+            .offset(offset)
+            .limit(preview_data.page_size)
+        )
+    
+    result = await db.execute(query)
+    rows = result.all()
+    
+    full_name = VARIABLES["contact.full_name"]
+    items = []
+    for row in rows:
+        rendered_subject, missing_subject = subject.render_checked(row, row)
+        rendered_body, missing_body = body.render_checked(row, row)
+        missing = list(dict.fromkeys(missing_subject + missing_body))
+        if not row.email:
+            missing.append("contact.email")
+        items.append({
+            "contact_id": row.id,
+            "to_email": row.email or "",
+            "to_name": full_name(row, row),
+            "subject": rendered_subject,
+            "body": rendered_body,
+            "missing": missing,
+        })
+    
+    return {
+        "items": items,
+        "total": await _count_recipients(db, recipients),
+        "page": preview_data.page,
+        "page_size": preview_data.page_size,
+        "with_missing": sum(1 for item in items if item["missing"]),
+    }
+
+
+async def get_send_job(db: AsyncSession, job_id: int) -> Optional[EmailSendJob]:
+    """Get a bulk send job by ID."""
+    return await db.get(EmailSendJob, job_id)
+
+
+def _claimable_job(claim_timeout_seconds: float):
+    """Jobs not started yet, or running without progress for the claim timeout."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=claim_timeout_seconds)
+    return or_(
+        EmailSendJob.status == EmailJobStatus.PENDING,
+        and_(
+            EmailSendJob.status == EmailJobStatus.RUNNING,
+            # Jobs orphaned before locked_at existed have none
+            or_(EmailSendJob.locked_at.is_(None), EmailSendJob.locked_at < cutoff),
+        ),
+    )
+
+
+async def claimable_send_jobs(db: AsyncSession, claim_timeout_seconds: float, limit: int = 10) -> list[int]:
+    """Ids of pending jobs and of running jobs left behind by a crashed process."""
+    result = await db.execute(
+        select(EmailSendJob.id)
+        .where(_claimable_job(claim_timeout_seconds))
+        .order_by(EmailSendJob.id)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def claim_send_job(db: AsyncSession, job_id: int, claim_timeout_seconds: float) -> bool:
+    """Mark a claimable job as running in this process and commit; False if it is not claimable."""
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        update(EmailSendJob)
+        .where(EmailSendJob.id == job_id, _claimable_job(claim_timeout_seconds))
+        .values(
+            status=EmailJobStatus.RUNNING,
+            locked_at=now,
+            started_at=func.coalesce(EmailSendJob.started_at, now),
+        )
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def run_send_job(
+    job_id: int,
+    session_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+    batch_size: Optional[int] = None,
+) -> None:
+    """
+    Render, queue and log a bulk send, one transaction per batch of recipients.
+    
+    Recipients are paged by id with only the columns the template reads;
+    each batch's outbox messages go in with one bulk INSERT; their EMAIL
+    history entries are written by the outbox worker on delivery. Progress,
+    the last contact queued and locked_at are committed with each batch, so
+    the job status shows how far it got and a job orphaned by a restart is
+    resumed from there by the send job worker.
+    """
+    session_factory = session_factory or async_session_maker
+    settings = get_settings()
+    batch_size = batch_size or settings.email_bulk_batch_size
+    
+    async with session_factory() as db:
+        if not await claim_send_job(db, job_id, settings.email_send_job_claim_timeout_seconds):
+            return
+        job = await db.get(EmailSendJob, job_id, populate_existing=True)
+        template = await get_template(db, job.template_id)
+        
+        try:
+            subject, body = compiled_template(template)
+            # full_name is always needed for the recipient address
+            variables = {"contact.full_name", *body.variables}
+            if not job.subject_override:
+                variables.update(subject.variables)
+            batches = _recipient_batches(
+                db, _recipient_query(variables), json.loads(job.recipients), batch_size, job.last_contact_id
+            )
+            
+            async for rows in batches:
+                messages = []
+                for row in rows:
+                    if not row.email:
+                        continue
+                    rendered_subject = job.subject_override or subject.render(row, row)
+                    messages.append({
+                        "to_email": row.email,
+                        "to_name": VARIABLES["contact.full_name"](row, row),
+                        "subject": rendered_subject[:500],
+                        "body": body.render(row, row),
+                        "contact_id": row.id,
+                        "template_id": template.id,
+                        "send_job_id": job.id,
+                        "created_by": job.created_by,
+                    })
+                await outbox_service.enqueue_emails(db, messages)
+                
+                job.processed += len(rows)
+                job.sent += len(messages)
+                job.skipped += len(rows) - len(messages)
+                job.last_contact_id = rows[-1].id
+                job.locked_at = datetime.now(timezone.utc)
+                await db.commit()
+            
+            job.status = EmailJobStatus.COMPLETED
+        except Exception as e:
+            logger.exception("Bulk send job %s failed", job_id)
+            await db.rollback()
+            job.status = EmailJobStatus.FAILED
+            job.error = f"{type(e).__name__}: {e}"
+        
+        job.finished_at = datetime.now(timezone.utc)
+        await db.commit()
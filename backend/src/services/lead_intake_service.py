@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+from sqlalchemy import select, update, insert, func, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.company import normalize_company_name
+from src.models.contact import normalize_email
+from src.models.contact_history import ContactHistory, HistoryType
+from src.models.lead import Lead, LeadStatus
+from src.models.lead_intake import LeadIntake, IntakeStatus
+from src.schemas.lead import LeadCreateFromForm
+from src.services import company_service, contact_service
+
+
+async def enqueue_lead(db: AsyncSession, form_data: LeadCreateFromForm) -> LeadIntake:
+    """Queue a validated form submission as part of the current transaction."""
+    entry = LeadIntake(payload=form_data.model_dump(mode="json"))
+    db.add(entry)
+    await db.flush()
+    return entry
+
+
+async def count_queued(db: AsyncSession) -> int:
+    """Submissions not yet turned into leads."""
+    result = await db.execute(
+        select(func.count(LeadIntake.id)).where(
+            LeadIntake.status.in_([IntakeStatus.PENDING, IntakeStatus.PROCESSING])
+        )
+    )
+    return result.scalar() or 0
+
+
+async def claim_submissions(
+    db: AsyncSession, limit: int, claim_timeout_seconds: float
+) -> Sequence[LeadIntake]:
+    """
+    Claim the oldest queued submissions and commit the claim.
+
+    Submissions left in PROCESSING by a crashed worker are reclaimed after
+    the claim timeout; FOR UPDATE SKIP LOCKED (PostgreSQL) keeps concurrent
+    workers apart.
+    """
+    now = datetime.now(timezone.utc)
+    due = or_(
+        LeadIntake.status == IntakeStatus.PENDING,
+        and_(
+            LeadIntake.status == IntakeStatus.PROCESSING,
+            LeadIntake.locked_at < now - timedelta(seconds=claim_timeout_seconds),
+        ),
+    )
+    result = await db.execute(
+        select(LeadIntake)
+        .where(due)
+        .order_by(LeadIntake.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    entries = result.scalars().all()
+    if entries:
+        await db.execute(
+            update(LeadIntake)
+            .where(LeadIntake.id.in_([entry.id for entry in entries]))
+            .values(status=IntakeStatus.PROCESSING, locked_at=now)
+        )
+    await db.commit()
+    return entries
+
+
+async def _contact_ids(
+    db: AsyncSession, forms: list[LeadCreateFromForm], company_ids: dict[str, int]
+) -> dict[str, int]:
+    """
+    Contact id per normalized email, created in bulk where missing.
+
+    As with a single submission, an existing contact is used as it is and
+    a new one takes its details from the first submission with its email.
+    """
+    return await contact_service.upsert_contacts_by_email(
+        db,
+        [
+            {
+                "email": form.email,
+                "first_name": form.first_name,
+                "last_name": form.last_name,
+                "phone": form.phone,
+                "company_id": company_ids.get(normalize_company_name(form.company_name)),
+            }
+            for form in forms
+        ],
+    )
+
+
+async def create_leads(db: AsyncSession, entries: Sequence[LeadIntake]) -> list[int]:
+    """
+    Turn claimed submissions into leads and mark them done.
+
+    Companies and contacts are resolved for the whole batch with one
+    upsert each, and leads and history entries are inserted in bulk, so a batch
+    costs a fixed number of statements however many submissions it holds.
+    render_nulls keeps rows with and without optional fields in one INSERT.
+
+    Returns:
+        The new lead ids, in the order of `entries`.
+    """
+    if not entries:
+        return []
+    forms = [LeadCreateFromForm.model_validate(entry.payload) for entry in entries]
+    company_ids = await company_service.upsert_companies_by_name(
+        db, (form.company_name for form in forms if form.company_name)
+    )
+    contact_ids = await _contact_ids(db, forms, company_ids)
+
+    result = await db.execute(
+        insert(Lead)
+        .returning(Lead.id, sort_by_parameter_order=True)
+        .execution_options(render_nulls=True),
+        [
+            {
+                "contact_id": contact_ids[normalize_email(form.email)],
+                "campaign_id": form.campaign_id,
+                "source": "landing_page",
+                "utm_source": form.utm_source,
+                "utm_medium": form.utm_medium,
+                "utm_campaign": form.utm_campaign,
+                "status": LeadStatus.COLD,
+            }
+            for form in forms
+        ],
+    )
+    lead_ids = list(result.scalars().all())
+    await db.execute(
+        insert(ContactHistory),
+        [
+            {
+                "contact_id": contact_ids[normalize_email(form.email)],
+                "type": HistoryType.LEAD_CREATED,
+                "title": "Lead from landing page",
+                "content": "New lead captured via form submission",
+            }
+            for form in forms
+        ],
+    )
+    now = datetime.now(timezone.utc)
+    await db.execute(
+        update(LeadIntake),
+        [
+            {
+                "id": entry.id,
+                "status": IntakeStatus.DONE,
+                "lead_id": lead_id,
+                "processed_at": now,
+                "locked_at": None,
+            }
+            for entry, lead_id in zip(entries, lead_ids)
+        ],
+    )
+    return lead_ids
+
+
+async def mark_failed(
+    db: AsyncSession, entries: Sequence[LeadIntake], error: str, max_attempts: int
+) -> int:
+    """
+    Put submissions back in the queue, or fail those out of attempts.
+
+    Returns:
+        How many were marked failed.
+    """
+    failed = 0
+    for entry in entries:
+        attempts = entry.attempts + 1
+        status = IntakeStatus.FAILED if attempts >= max_attempts else IntakeStatus.PENDING
+        failed += status == IntakeStatus.FAILED
+        await db.execute(
+            update(LeadIntake)
+            .where(LeadIntake.id == entry.id)
+            .values(status=status, attempts=attempts, last_error=error[:2000], locked_at=None)
+        )
+    return failed
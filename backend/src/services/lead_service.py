@@ -2,12 +2,11 @@ from typing import Optional, Sequence
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-import pandas as pd
 from io import BytesIO
 
 from src.models.lead import Lead, LeadStatus
-from src.models.contact import Contact
-from src.models.company import Company
+from src.models.contact import Contact, normalize_email
+from src.models.company import Company, normalize_company_name
 from src.models.campaign import Campaign
 from src.models.contact_history import ContactHistory, HistoryType
 from src.schemas.lead import LeadCreate, LeadUpdate, LeadCreateFromForm, LeadImportResult
@@ -85,13 +84,8 @@ async def create_lead_from_form(
 ) -> Lead:
     company_id = None
     if form_data.company_name:
-        company = await company_service.get_company_by_name(db, form_data.company_name)
-        if not company:
-            from src.schemas.company import CompanyCreate
-            company = await company_service.create_company(
-                db, CompanyCreate(name=form_data.company_name)
-            )
-        company_id = company.id
+        company_ids = await company_service.upsert_companies_by_name(db, [form_data.company_name])
+        company_id = company_ids.get(normalize_company_name(form_data.company_name))
     
     contact, _ = await contact_service.get_or_create_contact_by_email(
         db,
@@ -152,9 +146,42 @@ async def update_lead(
     return lead
 
 
+# Longest value per imported field, so a bad cell fails its row, not the batch upsert
+IMPORT_FIELD_LENGTHS = {
+    "first_name": Contact.__table__.c.first_name.type.length,
+    "last_name": Contact.__table__.c.last_name.type.length,
+    "email": Contact.__table__.c.email.type.length,
+    "phone": Contact.__table__.c.phone.type.length,
+    "company": Company.__table__.c.name.type.length,
+}
+
+
+async def _upsert_import_rows(db: AsyncSession, rows: list[tuple]) -> tuple[dict, dict]:
+    """Companies and contacts of parsed import rows, with one batch upsert each."""
+    company_ids = await company_service.upsert_companies_by_name(
+        db, (company_name for *_, company_name in rows if company_name)
+    )
+    contact_ids = await contact_service.upsert_contacts_by_email(
+        db,
+        [
+            {
+                "email": email, "first_name": first_name, "last_name": last_name,
+                "phone": phone, "company_id": company_ids.get(normalize_company_name(company_name)),
+            }
+            for _, first_name, last_name, email, phone, company_name in rows
+            if email
+        ],
+    )
+    return company_ids, contact_ids
+
+
 async def import_leads_from_file(
     db: AsyncSession, file_content: bytes, filename: str, campaign_id: Optional[int] = None
 ) -> LeadImportResult:
+    # pandas (and openpyxl behind read_excel) cost ~300ms to import, so only
+    # load them when a file is actually imported
+    import pandas as pd
+    
     errors: list[str] = []
     imported = 0
     
@@ -185,44 +212,67 @@ async def import_leads_from_file(
                 errors=["Required columns: first_name, last_name (or vorname, nachname)"],
             )
         
+        parsed = []
         for idx, row in df.iterrows():
-            try:
-                first_name = str(row.get("first_name", "")).strip()
-                last_name = str(row.get("last_name", "")).strip()
-                email = str(row.get("email", row.get("e-mail", ""))).strip() or None
-                phone = str(row.get("phone", "")).strip() or None
-                company_name = str(row.get("company", "")).strip() or None
-                
-                if not first_name or not last_name:
-                    errors.append(f"Row {idx + 2}: Missing first_name or last_name")
+            first_name = str(row.get("first_name", "")).strip()
+            last_name = str(row.get("last_name", "")).strip()
+            email = str(row.get("email", row.get("e-mail", ""))).strip() or None
+            phone = str(row.get("phone", "")).strip() or None
+            company_name = str(row.get("company", "")).strip() or None
+            
+            if not first_name or not last_name:
+                errors.append(f"Row {idx + 2}: Missing first_name or last_name")
+                continue
+            values = {
+                "first_name": first_name, "last_name": last_name,
+                "email": email, "phone": phone, "company": company_name,
+            }
+            too_long = [
+                field for field, value in values.items()
+                if value and len(value) > IMPORT_FIELD_LENGTHS[field]
+            ]
+            if too_long:
+                errors.append(
+                    f"Row {idx + 2}: {', '.join(too_long)} longer than allowed "
+                    f"({', '.join(str(IMPORT_FIELD_LENGTHS[field]) for field in too_long)} characters)"
+                )
+                continue
+            parsed.append((idx, first_name, last_name, email, phone, company_name))
+        
+        # All companies and addresses of the file in one batch upsert each;
+        # if the batch fails, retry row by row so the bad rows are reported
+        try:
+            async with db.begin_nested():
+                company_ids, contact_ids = await _upsert_import_rows(db, parsed)
+        except Exception:
+            company_ids, contact_ids, resolved = {}, {}, []
+            for row in parsed:
+                try:
+                    async with db.begin_nested():
+                        row_company_ids, row_contact_ids = await _upsert_import_rows(db, [row])
+                except Exception as e:
+                    errors.append(f"Row {row[0] + 2}: {str(e)}")
                     continue
-                
-                comp_id = None
-                if company_name:
-                    company = await company_service.get_company_by_name(db, company_name)
-                    if not company:
-                        from src.schemas.company import CompanyCreate
-                        company = await company_service.create_company(
-                            db, CompanyCreate(name=company_name)
-                        )
-                    comp_id = company.id
-                
-                if email:
-                    contact, _ = await contact_service.get_or_create_contact_by_email(
-                        db, email=email, first_name=first_name, last_name=last_name,
-                        phone=phone, company_id=comp_id,
-                    )
-                else:
+                company_ids.update(row_company_ids)
+                contact_ids.update(row_contact_ids)
+                resolved.append(row)
+            parsed = resolved
+        
+        for idx, first_name, last_name, email, phone, company_name in parsed:
+            try:
+                contact_id = contact_ids.get(normalize_email(email))
+                if contact_id is None:
                     from src.schemas.contact import ContactCreate
                     contact = await contact_service.create_contact(
                         db, ContactCreate(
                             first_name=first_name, last_name=last_name,
-                            phone=phone, company_id=comp_id,
+                            phone=phone, company_id=company_ids.get(normalize_company_name(company_name)),
                         ),
                     )
+                    contact_id = contact.id
                 
                 lead = Lead(
-                    contact_id=contact.id, campaign_id=campaign_id,
+                    contact_id=contact_id, campaign_id=campaign_id,
                     source="import", status=LeadStatus.COLD,
                 )
                 db.add(lead)
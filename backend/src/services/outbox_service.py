@@ -0,0 +1,180 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
+from sqlalchemy import select, update, insert, func, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.contact_history import ContactHistory, HistoryType
+from src.models.email_outbox import EmailOutbox, OutboxStatus
+from src.models.email_template import EmailTemplate
+
+
+async def enqueue_email(
+    db: AsyncSession,
+    to_email: str,
+    subject: str,
+    body: str,
+    to_name: Optional[str] = None,
+    contact_id: Optional[int] = None,
+    template_id: Optional[int] = None,
+    created_by: Optional[str] = None,
+) -> EmailOutbox:
+    """Queue an email for delivery as part of the current transaction."""
+    message = EmailOutbox(
+        to_email=to_email,
+        to_name=to_name,
+        subject=subject,
+        body=body,
+        contact_id=contact_id,
+        template_id=template_id,
+        created_by=created_by,
+    )
+    db.add(message)
+    await db.flush()
+    return message
+
+
+async def enqueue_emails(db: AsyncSession, messages: list[dict]) -> None:
+    """Queue many emails with one bulk INSERT."""
+    if messages:
+        await db.execute(insert(EmailOutbox), messages)
+
+
+async def claim_messages(
+    db: AsyncSession, limit: int, claim_timeout_seconds: float
+) -> Sequence[EmailOutbox]:
+    """
+    Claim due messages for delivery and commit the claim.
+
+    Pending messages are due once next_attempt_at has passed; messages left
+    in SENDING by a crashed worker are reclaimed after the claim timeout.
+    FOR UPDATE SKIP LOCKED (PostgreSQL) keeps concurrent workers from
+    claiming the same rows.
+    """
+    now = datetime.now(timezone.utc)
+    due = or_(
+        and_(EmailOutbox.status == OutboxStatus.PENDING, EmailOutbox.next_attempt_at <= now),
+        and_(
+            EmailOutbox.status == OutboxStatus.SENDING,
+            EmailOutbox.locked_at < now - timedelta(seconds=claim_timeout_seconds),
+        ),
+    )
+    result = await db.execute(
+        select(EmailOutbox)
+        .where(due)
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    messages = result.scalars().all()
+    if messages:
+        await db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_([message.id for message in messages]))
+            .values(status=OutboxStatus.SENDING, locked_at=now)
+        )
+    await db.commit()
+    return messages
+
+
+async def mark_sent(db: AsyncSession, messages: Sequence[EmailOutbox]) -> None:
+    """
+    Record successful deliveries and log them in the contact history.
+
+    The EMAIL history entry is written here, once SMTP accepted the message,
+    so messages that end up dead-lettered never show up as sent.
+    """
+    if not messages:
+        return
+    await db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_([message.id for message in messages]))
+        .values(
+            status=OutboxStatus.SENT,
+            sent_at=datetime.now(timezone.utc),
+            attempts=EmailOutbox.attempts + 1,
+            locked_at=None,
+        )
+    )
+
+    logged = [message for message in messages if message.contact_id is not None]
+    template_ids = {message.template_id for message in logged if message.template_id is not None}
+    template_names = {}
+    if template_ids:
+        result = await db.execute(
+            select(EmailTemplate.id, EmailTemplate.name).where(EmailTemplate.id.in_(template_ids))
+        )
+        template_names = dict(result.all())
+    if logged:
+        await db.execute(
+            insert(ContactHistory),
+            [
+                {
+                    "contact_id": message.contact_id,
+                    "type": HistoryType.EMAIL,
+                    "title": f"E-Mail gesendet: {message.subject}"[:255],
+                    "content": (
+                        f"Vorlage: {template_names[message.template_id]}"
+                        if message.template_id in template_names
+                        else None
+                    ),
+                    "created_by": message.created_by,
+                }
+                for message in logged
+            ],
+        )
+
+
+async def mark_failed(
+    db: AsyncSession,
+    message: EmailOutbox,
+    error: str,
+    permanent: bool,
+    max_attempts: int,
+    retry_base_seconds: float,
+) -> OutboxStatus:
+    """
+    Schedule a retry with exponential backoff, or dead-letter the message.
+
+    Returns:
+        The new status, PENDING or DEAD.
+    """
+    attempts = message.attempts + 1
+    status = OutboxStatus.DEAD if permanent or attempts >= max_attempts else OutboxStatus.PENDING
+    await db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == message.id)
+        .values(
+            status=status,
+            attempts=attempts,
+            last_error=error[:2000],
+            locked_at=None,
+            next_attempt_at=datetime.now(timezone.utc)
+            + timedelta(seconds=retry_base_seconds * 2 ** (attempts - 1)),
+        )
+    )
+    return status
+
+
+async def get_outbox_stats(db: AsyncSession) -> dict:
+    """Message counts per status."""
+    result = await db.execute(
+        select(EmailOutbox.status, func.count(EmailOutbox.id)).group_by(EmailOutbox.status)
+    )
+    counts = {status.value: 0 for status in OutboxStatus}
+    counts.update({status.value: count for status, count in result.all()})
+    return counts
+
+
+async def requeue_dead(db: AsyncSession, message_ids: Optional[list[int]] = None) -> int:
+    """Move dead-lettered messages back to the queue; returns how many."""
+    query = update(EmailOutbox).where(EmailOutbox.status == OutboxStatus.DEAD)
+    if message_ids is not None:
+        query = query.where(EmailOutbox.id.in_(message_ids))
+    result = await db.execute(
+        query.values(
+            status=OutboxStatus.PENDING,
+            attempts=0,
+            next_attempt_at=datetime.now(timezone.utc),
+        )
+    )
+    return result.rowcount
@@ -1,7 +1,8 @@
 """Seed service for populating default lookup values."""
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 
+from src.core.database import dialect_insert
 from src.models.lookup_value import LookupValue
 
 
@@ -79,39 +80,36 @@ async def seed_lookup_values(db: AsyncSession) -> dict[str, int]:
     Seed default lookup values for all categories.
     
     This function is idempotent - it will only create values that don't exist.
+    All values are written with a single INSERT ... ON CONFLICT DO NOTHING, so
+    seeding costs one round trip regardless of how many defaults exist.
     
     Returns:
         A dictionary mapping category names to the number of values created.
     """
-    created_counts = {}
+    rows = [
+        {
+            "category": category,
+            "value": value_data["value"],
+            "label": value_data["label"],
+            "sort_order": value_data["sort_order"],
+            "is_active": True,
+        }
+        for category, values in DEFAULT_LOOKUP_VALUES.items()
+        for value_data in values
+    ]
     
-    for category, values in DEFAULT_LOOKUP_VALUES.items():
-        created_count = 0
-        
-        for value_data in values:
-            # Check if this lookup value already exists
-            existing = await db.execute(
-                select(LookupValue).where(
-                    LookupValue.category == category,
-                    LookupValue.value == value_data["value"],
-                )
-            )
-            
-            if existing.scalar_one_or_none() is None:
-                # Create new lookup value
-                lookup = LookupValue(
-                    category=category,
-                    value=value_data["value"],
-                    label=value_data["label"],
-                    sort_order=value_data["sort_order"],
-                    is_active=True,
-                )
-                db.add(lookup)
-                created_count += 1
-        
-        created_counts[category] = created_count
+    stmt = (
+        dialect_insert(db, LookupValue)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["category", "value"])
+        .returning(LookupValue.category)
+    )
+    result = await db.execute(stmt)
+    
+    created_counts = {category: 0 for category in DEFAULT_LOOKUP_VALUES}
+    for category in result.scalars().all():
+        created_counts[category] += 1
     
-    await db.flush()
     return created_counts
 
 
@@ -122,13 +120,11 @@ async def get_seed_statistics(db: AsyncSession) -> dict[str, int]:
     Returns:
         A dictionary mapping category names to the number of values in each category.
     """
-    stats = {}
-    
-    for category in DEFAULT_LOOKUP_VALUES.keys():
-        result = await db.execute(
-            select(LookupValue).where(LookupValue.category == category)
-        )
-        values = result.scalars().all()
-        stats[category] = len(values)
+    result = await db.execute(
+        select(LookupValue.category, func.count(LookupValue.id))
+        .where(LookupValue.category.in_(DEFAULT_LOOKUP_VALUES.keys()))
+        .group_by(LookupValue.category)
+    )
+    counts = dict(result.all())
     
-    return stats
+    return {category: counts.get(category, 0) for category in DEFAULT_LOOKUP_VALUES}
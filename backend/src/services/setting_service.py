@@ -1,7 +1,11 @@
-from typing import Optional, Sequence
-from sqlalchemy import select
+import csv
+from io import StringIO
+from typing import Iterator, Optional, Sequence
+from pydantic import ValidationError
+from sqlalchemy import select, update, case, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.database import dialect_insert
 from src.models.setting import Setting
 from src.models.lookup_value import LookupValue
 from src.schemas.setting import (
@@ -9,9 +13,26 @@ from src.schemas.setting import (
     SettingUpdate,
     LookupValueCreate,
     LookupValueUpdate,
+    LookupValueBulkItem,
+    LookupBulkResult,
 )
 
 
+# Rows per multi-row INSERT; keeps asyncpg well below its 32767 bind parameter limit
+BULK_CHUNK_SIZE = 1000
+
+# Support both German and English column names in lookup CSV imports
+LOOKUP_CSV_COLUMNS = {
+    "wert": "value",
+    "bezeichnung": "label",
+    "reihenfolge": "sort_order",
+    "aktiv": "is_active",
+}
+
+TRUE_VALUES = {"1", "true", "yes", "ja", "x"}
+FALSE_VALUES = {"0", "false", "no", "nein"}
+
+
 # ============ Setting Service Functions ============
 
 async def get_all_settings(
@@ -206,16 +227,204 @@ async def delete_lookup_value(
     return True
 
 
+def _chunks(rows: list[dict], size: int = BULK_CHUNK_SIZE) -> Iterator[list[dict]]:
+    """Split rows into INSERT-sized chunks."""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+async def _classify_unmatched_ids(
+    db: AsyncSession,
+    requested_ids: list[int],
+    matched_ids: set[int],
+) -> tuple[list[int], list[int]]:
+    """Split IDs a bulk update did not touch into unknown and cross-category IDs."""
+    unmatched = [i for i in dict.fromkeys(requested_ids) if i not in matched_ids]
+    if not unmatched:
+        return [], []
+    
+    result = await db.execute(select(LookupValue.id).where(LookupValue.id.in_(unmatched)))
+    existing = set(result.scalars().all())
+    unknown_ids = [i for i in unmatched if i not in existing]
+    foreign_ids = [i for i in unmatched if i in existing]
+    return unknown_ids, foreign_ids
+
+
 async def reorder_lookup_values(
     db: AsyncSession,
     category: str,
     ordered_ids: list[int],
-) -> bool:
-    """Reorder lookup values by setting sort_order based on list position."""
-    for index, lookup_id in enumerate(ordered_ids):
-        lookup = await get_lookup_value(db, lookup_id)
-        if lookup and lookup.category == category:
-            lookup.sort_order = index
+) -> LookupBulkResult:
+    """Reorder lookup values by setting sort_order based on list position.
     
-    await db.flush()
-    return True
+    Runs as a single UPDATE with a CASE over the IDs. IDs that don't exist or
+    belong to another category are reported instead of updated.
+    """
+    positions = {lookup_id: index for index, lookup_id in enumerate(ordered_ids)}
+    if not positions:
+        return LookupBulkResult(category=category)
+    
+    result = await db.execute(
+        update(LookupValue)
+        .where(LookupValue.category == category, LookupValue.id.in_(positions))
+        .values(sort_order=case(positions, value=LookupValue.id))
+        .returning(LookupValue.id)
+        .execution_options(synchronize_session="fetch")
+    )
+    matched = set(result.scalars().all())
+    unknown_ids, foreign_ids = await _classify_unmatched_ids(db, ordered_ids, matched)
+    
+    return LookupBulkResult(
+        category=category,
+        affected=len(matched),
+        unknown_ids=unknown_ids,
+        foreign_ids=foreign_ids,
+    )
+
+
+async def set_lookup_values_active(
+    db: AsyncSession,
+    category: str,
+    lookup_ids: list[int],
+    is_active: bool,
+) -> LookupBulkResult:
+    """Activate or deactivate several lookup values of a category in one UPDATE."""
+    if not lookup_ids:
+        return LookupBulkResult(category=category)
+    
+    result = await db.execute(
+        update(LookupValue)
+        .where(LookupValue.category == category, LookupValue.id.in_(lookup_ids))
+        .values(is_active=is_active)
+        .returning(LookupValue.id)
+        .execution_options(synchronize_session="fetch")
+    )
+    matched = set(result.scalars().all())
+    unknown_ids, foreign_ids = await _classify_unmatched_ids(db, lookup_ids, matched)
+    
+    return LookupBulkResult(
+        category=category,
+        affected=len(matched),
+        unknown_ids=unknown_ids,
+        foreign_ids=foreign_ids,
+    )
+
+
+async def bulk_create_lookup_values(
+    db: AsyncSession,
+    category: str,
+    items: list[LookupValueBulkItem],
+) -> LookupBulkResult:
+    """Create many lookup values with a multi-row INSERT.
+    
+    Values that already exist in the category (or repeat within the request)
+    are skipped via ON CONFLICT DO NOTHING and reported back.
+    """
+    rows: dict[str, dict] = {}
+    skipped_values: list[str] = []
+    for item in items:
+        if item.value in rows:
+            skipped_values.append(item.value)
+            continue
+        rows[item.value] = {"category": category, **item.model_dump()}
+    
+    created: set[str] = set()
+    for chunk in _chunks(list(rows.values())):
+        stmt = (
+            dialect_insert(db, LookupValue)
+            .values(chunk)
+            .on_conflict_do_nothing(index_elements=["category", "value"])
+            .returning(LookupValue.value)
+        )
+        result = await db.execute(stmt)
+        created.update(result.scalars().all())
+    
+    skipped_values.extend(value for value in rows if value not in created)
+    return LookupBulkResult(
+        category=category,
+        affected=len(created),
+        skipped_values=skipped_values,
+    )
+
+
+def _parse_bool(raw: Optional[str]) -> bool:
+    """Parse a CSV boolean cell; empty cells count as active."""
+    text = (raw or "").strip().lower()
+    if not text or text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid boolean value '{raw}'")
+
+
+def _parse_lookup_csv(
+    file_content: bytes,
+) -> tuple[list[LookupValueBulkItem], list[str]]:
+    """Parse a lookup CSV into validated items and row errors."""
+    text = file_content.decode("utf-8-sig")
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=",;")
+    except csv.Error:
+        dialect = csv.excel
+    
+    reader = csv.DictReader(StringIO(text), dialect=dialect)
+    if reader.fieldnames is None:
+        return [], ["File is empty"]
+    
+    reader.fieldnames = [
+        LOOKUP_CSV_COLUMNS.get(name.strip().lower(), name.strip().lower())
+        for name in reader.fieldnames
+    ]
+    if "value" not in reader.fieldnames or "label" not in reader.fieldnames:
+        return [], ["Required columns: value, label (or wert, bezeichnung)"]
+    
+    items: list[LookupValueBulkItem] = []
+    errors: list[str] = []
+    for index, row in enumerate(reader):
+        try:
+            sort_order = (row.get("sort_order") or "").strip()
+            items.append(LookupValueBulkItem(
+                value=(row.get("value") or "").strip(),
+                label=(row.get("label") or "").strip(),
+                sort_order=int(sort_order) if sort_order else index,
+                is_active=_parse_bool(row.get("is_active")),
+            ))
+        except (ValueError, ValidationError) as e:
+            errors.append(f"Row {index + 2}: {str(e).splitlines()[0]}")
+    
+    return items, errors
+
+
+async def import_lookup_values(
+    db: AsyncSession,
+    category: str,
+    file_content: bytes,
+) -> LookupBulkResult:
+    """Import a category from CSV, inserting new values and updating existing ones.
+    
+    Rows are written with a multi-row INSERT ... ON CONFLICT DO UPDATE; when a
+    value appears twice in the file the last row wins.
+    """
+    try:
+        items, errors = _parse_lookup_csv(file_content)
+    except UnicodeDecodeError:
+        return LookupBulkResult(category=category, errors=["File must be UTF-8 encoded"])
+    
+    rows = {item.value: {"category": category, **item.model_dump()} for item in items}
+    
+    affected = 0
+    for chunk in _chunks(list(rows.values())):
+        stmt = dialect_insert(db, LookupValue).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["category", "value"],
+            set_={
+                "label": stmt.excluded.label,
+                "sort_order": stmt.excluded.sort_order,
+                "is_active": stmt.excluded.is_active,
+                "updated_at": func.now(),
+            },
+        ).returning(LookupValue.id)
+        result = await db.execute(stmt)
+        affected += len(result.scalars().all())
+    
+    return LookupBulkResult(category=category, affected=affected, errors=errors[:10])
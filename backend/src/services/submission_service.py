@@ -0,0 +1,106 @@
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import dialect_insert
+from src.models.submission_key import SubmissionKey
+from src.schemas.lead import LeadCreateFromForm
+
+# Expired keys are deleted at most this often per process
+PURGE_INTERVAL_SECONDS = 60.0
+
+_last_purge: list[float] = [float("-inf")]
+
+
+def _digest(kind: str, value: str) -> str:
+    return hashlib.sha256(f"{kind}\0{value}".encode()).hexdigest()
+
+
+def submission_keys(
+    form_data: LeadCreateFromForm,
+    idempotency_key: Optional[str],
+    idempotency_ttl_seconds: int,
+    dedup_seconds: int,
+) -> dict[str, tuple[str, int]]:
+    """
+    Keys identifying a submission, as key -> (kind, TTL in seconds).
+
+    The content key covers email (case-insensitive), campaign and UTM
+    fields, so a double click or a resubmitted form matches even without
+    an Idempotency-Key header.
+    """
+    content = json.dumps(
+        [
+            form_data.email.strip().lower(),
+            form_data.campaign_id,
+            form_data.utm_source,
+            form_data.utm_medium,
+            form_data.utm_campaign,
+        ]
+    )
+    keys = {_digest("content", content): ("content", dedup_seconds)}
+    if idempotency_key:
+        keys[_digest("idempotency", idempotency_key)] = ("idempotency", idempotency_ttl_seconds)
+    return keys
+
+
+async def find_response(db: AsyncSession, keys: list[str]) -> Optional[SubmissionKey]:
+    """The unexpired stored response for any of the keys, Idempotency-Key first."""
+    result = await db.execute(
+        select(SubmissionKey)
+        .where(
+            SubmissionKey.key.in_(keys),
+            SubmissionKey.expires_at > datetime.now(timezone.utc),
+        )
+        .order_by(SubmissionKey.kind.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def claim_keys(
+    db: AsyncSession,
+    keys: dict[str, tuple[str, int]],
+    status_code: int,
+    response: dict,
+) -> bool:
+    """
+    Store the response for all keys in the current transaction.
+
+    Expired keys are taken over. Returns False if any key is held by
+    another submission; on PostgreSQL a concurrent submission with the
+    same key waits on the unique index until the first one commits.
+    """
+    now = datetime.now(timezone.utc)
+    if time.monotonic() - _last_purge[0] >= PURGE_INTERVAL_SECONDS:
+        _last_purge[0] = time.monotonic()
+        await db.execute(delete(SubmissionKey).where(SubmissionKey.expires_at <= now))
+
+    stmt = dialect_insert(db, SubmissionKey).values(
+        [
+            {
+                "key": key,
+                "kind": kind,
+                "status_code": status_code,
+                "response": response,
+                "expires_at": now + timedelta(seconds=ttl),
+            }
+            for key, (kind, ttl) in keys.items()
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={
+            "kind": stmt.excluded.kind,
+            "status_code": stmt.excluded.status_code,
+            "response": stmt.excluded.response,
+            "expires_at": stmt.excluded.expires_at,
+        },
+        where=SubmissionKey.expires_at <= now,
+    ).returning(SubmissionKey.key)
+    result = await db.execute(stmt)
+    return len(result.scalars().all()) == len(keys)
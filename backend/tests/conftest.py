@@ -1,16 +1,22 @@
 """Test configuration and fixtures."""
 import asyncio
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
 from typing import AsyncGenerator, Generator
 
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from src.core import admission, database
+from src.core.config import get_settings
 from src.core.database import Base, get_db
+from src.core.instrumentation import track_queries
 from src.main import app
+from src.services import campaign_service
 from src.models.company import Company
 from src.models.contact import Contact
 from src.models.lead import Lead, LeadStatus
@@ -20,7 +26,11 @@ from src.models.contact_history import ContactHistory, HistoryType
 from src.models import Setting, LookupValue  # noqa: F401 - needed for metadata
 
 
-TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+# Named shared-cache memory database, so the read engine can open its own connection to it
+TEST_DATABASE_URL = "sqlite+aiosqlite:///file:crm_test?mode=memory&cache=shared&uri=true"
+
+# Strict mode: any request blocking the event loop this long fails its test
+get_settings().loop_block_strict_ms = 500.0
 
 test_engine = create_async_engine(
     TEST_DATABASE_URL,
@@ -29,6 +39,25 @@ test_engine = create_async_engine(
     connect_args={"check_same_thread": False},
 )
 
+# Read sessions get a separate autocommit connection like database.read_engine; it
+# sees the test's uncommitted rows and rejects writes, as read-only PostgreSQL does
+test_read_engine = create_async_engine(
+    TEST_DATABASE_URL,
+    echo=False,
+    poolclass=StaticPool,
+    isolation_level="AUTOCOMMIT",
+    connect_args={"check_same_thread": False},
+)
+
+
+@event.listens_for(test_read_engine.sync_engine, "connect")
+def _read_only_connection(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA read_uncommitted = 1")
+    cursor.execute("PRAGMA query_only = 1")
+    cursor.close()
+
+
 TestSessionLocal = async_sessionmaker(
     test_engine,
     class_=AsyncSession,
@@ -46,6 +75,13 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def fresh_public_state():
+    """Start every test with full public rate limit buckets and no cached campaigns."""
+    admission.reset()
+    campaign_service.invalidate_public_campaign()
+
+
 @pytest_asyncio.fixture(scope="function")
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """Create a fresh database session for each test."""
@@ -61,13 +97,16 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
 
 
 @pytest_asyncio.fixture(scope="function")
-async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
+async def client(db_session: AsyncSession, monkeypatch) -> AsyncGenerator[AsyncClient, None]:
     """Create an async HTTP client for testing API endpoints."""
 
     async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    # get_read_db and get_primary_read_db run unchanged, on the read-only test engine
+    monkeypatch.setattr(database, "read_engine", test_read_engine)
+    monkeypatch.setattr(database, "_replicas", [])
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
@@ -76,6 +115,27 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def assert_max_queries():
+    """Assert an upper bound on the SQL statements run inside a block.
+
+    Usage:
+        with assert_max_queries(3):
+            await client.get("/api/leads")
+    """
+
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        with track_queries() as stats:
+            yield stats
+        assert stats["statements"] <= limit, (
+            f"Expected at most {limit} SQL statements, got {stats['statements']}:\n"
+            + "\n".join(f"{count}x {shape}" for shape, count in stats["shapes"].most_common())
+        )
+
+    return _assert_max_queries
+
+
 @pytest_asyncio.fixture
 async def sample_company(db_session: AsyncSession) -> Company:
     """Create a sample company for testing."""
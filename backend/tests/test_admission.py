@@ -0,0 +1,123 @@
+"""Tests for public API rate limiting and admission control."""
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.admission import MemoryBuckets, PublicAdmissionMiddleware
+from src.core.config import get_settings
+from src.core.metrics import PUBLIC_REJECTIONS
+
+FORM = {"first_name": "Max", "last_name": "Mustermann", "campaign_id": 7}
+
+
+def _rejections(reason: str) -> float:
+    return PUBLIC_REJECTIONS.labels(reason)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills():
+    buckets = MemoryBuckets()
+
+    assert [await buckets.take("ip:1", 60, 2) for _ in range(2)] == [0, 0]
+    wait = await buckets.take("ip:1", 60, 2)
+    assert 0 < wait <= 1
+    assert await buckets.take("ip:2", 60, 2) == 0
+
+    await asyncio.sleep(wait)
+    assert await buckets.take("ip:1", 60, 2) == 0
+
+
+@pytest.mark.asyncio
+async def test_ip_limit_answers_429(client: AsyncClient, db_session: AsyncSession, monkeypatch):
+    monkeypatch.setattr(get_settings(), "public_ip_burst", 2)
+    before = _rejections("ip_rate")
+
+    responses = [
+        await client.post("/api/public/leads", json={**FORM, "email": f"kunde{i}@example.at"})
+        for i in range(3)
+    ]
+
+    assert [response.status_code for response in responses] == [201, 201, 429]
+    assert int(responses[2].headers["Retry-After"]) >= 1
+    assert _rejections("ip_rate") == before + 1
+    # Internal routes are not limited
+    assert (await client.get("/api/leads")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_forwarded_for_behind_trusted_proxy(client: AsyncClient, db_session: AsyncSession, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "public_ip_burst", 1)
+    monkeypatch.setattr(settings, "public_trusted_proxies", 1)
+
+    statuses = [
+        (
+            await client.post(
+                "/api/public/leads",
+                json={**FORM, "email": f"kunde{i}@example.at"},
+                headers={"X-Forwarded-For": f"1.2.3.4, 10.0.0.{i}"},
+            )
+        ).status_code
+        for i in range(2)
+    ]
+
+    assert statuses == [201, 201]
+
+
+@pytest.mark.asyncio
+async def test_campaign_limit(client: AsyncClient, db_session: AsyncSession, monkeypatch):
+    monkeypatch.setattr(get_settings(), "public_campaign_rate_per_minute", 60)
+    monkeypatch.setattr(get_settings(), "public_campaign_burst", 1)
+
+    first = await client.post("/api/public/leads", json={**FORM, "email": "a@example.at"})
+    limited = await client.post("/api/public/leads", json={**FORM, "email": "b@example.at"})
+    other = await client.post("/api/public/leads", json={**FORM, "email": "c@example.at", "campaign_id": None})
+
+    assert (first.status_code, limited.status_code, other.status_code) == (201, 429, 201)
+    assert "Retry-After" in limited.headers
+
+
+@pytest.mark.asyncio
+async def test_campaign_views_leave_submission_tokens(
+    client: AsyncClient, db_session: AsyncSession, sample_campaign, monkeypatch
+):
+    monkeypatch.setattr(get_settings(), "public_campaign_rate_per_minute", 60)
+    monkeypatch.setattr(get_settings(), "public_campaign_burst", 1)
+    monkeypatch.setattr(get_settings(), "public_ip_rate_per_minute", 0)
+
+    views = [(await client.get(f"/api/public/campaigns/{sample_campaign.id}")).status_code for _ in range(3)]
+    submitted = await client.post(
+        "/api/public/leads", json={**FORM, "email": "a@example.at", "campaign_id": sample_campaign.id}
+    )
+
+    assert views == [200, 200, 200]
+    assert submitted.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_sheds_with_503(monkeypatch):
+    monkeypatch.setattr(get_settings(), "public_max_concurrency", 1)
+    release = asyncio.Event()
+
+    async def slow_app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    transport = ASGITransport(app=PublicAdmissionMiddleware(slow_app))
+    before = _rejections("concurrency")
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = asyncio.create_task(ac.get("/api/public/campaigns/1"))
+        await asyncio.sleep(0.01)
+        shed = await ac.get("/api/public/campaigns/1")
+        internal = asyncio.create_task(ac.get("/api/leads"))
+        release.set()
+
+        assert (await first).status_code == 204
+        assert (await internal).status_code == 204
+
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "1"
+    assert _rejections("concurrency") == before + 1
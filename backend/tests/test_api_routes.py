@@ -221,6 +221,55 @@ class TestContactsAPI:
         assert data["position"] == "CEO"
         assert data["notes"] == "Befördert"
 
+    @pytest.mark.asyncio
+    async def test_create_contact_duplicate_email(self, client: AsyncClient, sample_contact: Contact):
+        """Test creating a contact with an email already in use, in another letter case."""
+        response = await client.post(
+            "/api/contacts",
+            json={
+                "first_name": "Zweiter",
+                "last_name": "Kontakt",
+                "email": sample_contact.email.upper(),
+            },
+        )
+        assert response.status_code == 400
+        assert "already exists" in response.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_update_contact_duplicate_email(
+        self, client: AsyncClient, sample_contact: Contact, multiple_contacts: list[Contact]
+    ):
+        """Test changing a contact's email to one used by another contact."""
+        response = await client.put(
+            f"/api/contacts/{multiple_contacts[0].id}",
+            json={"email": sample_contact.email.title()},
+        )
+        assert response.status_code == 400
+
+        # Keeping its own email is not a conflict
+        response = await client.put(
+            f"/api/contacts/{sample_contact.id}",
+            json={"email": sample_contact.email.upper()},
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_update_legacy_duplicate_contact(
+        self, client: AsyncClient, db_session, sample_contact: Contact
+    ):
+        """Test a duplicate left unmatched by migration 006 can still be edited with its email."""
+        duplicate = Contact(first_name="Max", last_name="Doppelt", email=sample_contact.email.upper())
+        duplicate.email_normalized = None
+        db_session.add(duplicate)
+        await db_session.flush()
+
+        response = await client.put(
+            f"/api/contacts/{duplicate.id}",
+            json={"email": sample_contact.email, "position": "CFO"},
+        )
+        assert response.status_code == 200
+        assert response.json()["position"] == "CFO"
+
     @pytest.mark.asyncio
     async def test_delete_contact(self, client: AsyncClient, sample_contact: Contact):
         """Test soft deleting a contact."""
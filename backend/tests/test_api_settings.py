@@ -210,7 +210,45 @@ class TestLookupValuesAPI:
             json=[id2, id1]  # Reverse order
         )
         assert response.status_code == 200
+        assert response.json()["affected"] == 2
 
         # Clean up
         await client.delete(f"/api/settings/lookups/{id1}?hard_delete=true")
         await client.delete(f"/api/settings/lookups/{id2}?hard_delete=true")
+
+    @pytest.mark.asyncio
+    async def test_bulk_lookup_endpoints(self, client):
+        """POST bulk create, bulk-status and import on /api/settings/lookups/{category}."""
+        category = f"bulk_test_{unique_id()}"
+
+        response = await client.post(
+            f"/api/settings/lookups/{category}/bulk",
+            json=[
+                {"value": "a", "label": "A", "sort_order": 0},
+                {"value": "b", "label": "B", "sort_order": 1},
+            ],
+        )
+        assert response.status_code == 201
+        assert response.json()["affected"] == 2
+
+        lookups = (await client.get(f"/api/settings/lookups/{category}")).json()
+        ids = [lv["id"] for lv in lookups]
+
+        response = await client.post(
+            f"/api/settings/lookups/{category}/bulk-status",
+            json={"ids": ids + [99999], "is_active": False},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["affected"] == 2
+        assert data["unknown_ids"] == [99999]
+
+        response = await client.post(
+            f"/api/settings/lookups/{category}/import",
+            files={"file": ("values.csv", b"value,label\na,A neu\nc,C\n", "text/csv")},
+        )
+        assert response.status_code == 200
+        assert response.json()["affected"] == 2
+
+        lookups = (await client.get(f"/api/settings/lookups/{category}")).json()
+        assert {lv["value"]: lv["label"] for lv in lookups} == {"a": "A neu", "c": "C"}
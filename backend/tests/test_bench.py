@@ -0,0 +1,47 @@
+"""Tests for the micro-benchmark runner."""
+import pytest
+
+from perf.bench import compare_benchmarks, run_benchmarks, summarize_timings
+from perf.benchmarks import BENCHMARKS
+
+
+def test_parametrized_benchmarks_registered():
+    """Test each import size is its own benchmark."""
+    names = {bench["name"] for bench in BENCHMARKS}
+
+    assert {"import_leads_from_file[1k]", "import_leads_from_file[10k]", "import_leads_from_file[100k]"} <= names
+    assert {"search_contacts", "get_tasks_overdue", "get_pipeline_stats", "seed_lookup_values"} <= names
+
+
+def test_summarize_timings():
+    """Test statistics are reported in milliseconds."""
+    stats = summarize_timings([0.001, 0.002, 0.003])
+
+    assert stats["rounds"] == 3
+    assert stats["min_ms"] == 1.0
+    assert stats["median_ms"] == 2.0
+
+
+def test_compare_flags_regressions_over_threshold():
+    """Test only slowdowns beyond the threshold are regressions."""
+    baseline = {"benchmarks": {"a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}}}
+    current = {"benchmarks": {"a": {"median_ms": 10.5}, "b": {"median_ms": 13.0}, "new": {"median_ms": 1.0}}}
+
+    rows = {row["name"]: row for row in compare_benchmarks(baseline, current, threshold=0.1)}
+
+    assert rows["a"]["regression"] is False
+    assert rows["b"]["regression"] is True
+    assert rows["b"]["change"] == 0.3
+    assert "new" not in rows
+
+
+@pytest.mark.asyncio
+async def test_run_benchmarks_sqlite(tmp_path):
+    """Test a filtered run against SQLite produces statistics."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'bench.db'}"
+
+    result = await run_benchmarks(url, keyword="search_contacts", scale=0.01)
+
+    assert result["meta"]["backend"] == "sqlite"
+    assert list(result["benchmarks"]) == ["search_contacts"]
+    assert result["benchmarks"]["search_contacts"]["rounds"] == 20
@@ -0,0 +1,106 @@
+"""
+Tests for Company Service.
+"""
+import pytest
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.company import Company, normalize_company_name
+from src.schemas.lead import LeadCreateFromForm
+from src.services import company_service, lead_service
+
+
+class TestNormalizeCompanyName:
+    """Tests for the company name matching key."""
+
+    @pytest.mark.parametrize("name", [
+        "Muster GmbH", "Muster Gmbh", "Muster GmbH ", "  muster   gmbh", "Muster KG",
+        "Muster OG", "Muster e.U.", "Muster GmbH & Co. KG", "Muster Ges.m.b.H.", "Muster, GmbH",
+    ])
+    def test_legal_forms_and_spacing_ignored(self, name: str):
+        assert normalize_company_name(name) == "muster"
+
+    def test_other_names_kept(self):
+        assert normalize_company_name("Muster Bau") == "muster bau"
+        assert normalize_company_name("Kogler Holz AG") == "kogler holz"
+        assert normalize_company_name("GmbH") == "gmbh"
+        assert normalize_company_name("   ") is None
+
+    def test_key_follows_name(self):
+        company = Company(name="Alpen Consult GmbH")
+        company.name = "Alpen Consult KG "
+
+        assert company.name_key == "alpen consult"
+
+
+class TestGetCompanyByName:
+    """Tests for get_company_by_name function."""
+
+    @pytest.mark.asyncio
+    async def test_matches_normalized(self, db_session: AsyncSession, sample_company: Company):
+        company = await company_service.get_company_by_name(db_session, " test gmbh")
+
+        assert company.id == sample_company.id
+
+    @pytest.mark.asyncio
+    async def test_not_found(self, db_session: AsyncSession, sample_company: Company):
+        assert await company_service.get_company_by_name(db_session, "Test Bau GmbH") is None
+
+
+class TestUpsertCompaniesByName:
+    """Tests for upsert_companies_by_name function."""
+
+    @pytest.mark.asyncio
+    async def test_batch_upsert(self, db_session: AsyncSession, sample_company: Company, assert_max_queries):
+        names = ["Test GmbH", "Muster GmbH", "Muster Gmbh", "Muster GmbH ", "Neu OG", ""]
+
+        with assert_max_queries(1):
+            ids = await company_service.upsert_companies_by_name(db_session, names)
+
+        assert ids.keys() == {"test", "muster", "neu"}
+        assert ids["test"] == sample_company.id
+        muster = await company_service.get_company(db_session, ids["muster"])
+        assert muster.name == "Muster GmbH"
+        assert (await db_session.execute(select(func.count(Company.id)))).scalar() == 3
+
+        assert await company_service.upsert_companies_by_name(db_session, ["muster kg"]) == {"muster": ids["muster"]}
+
+    @pytest.mark.asyncio
+    async def test_form_and_import_share_companies(self, db_session: AsyncSession):
+        await lead_service.create_lead_from_form(
+            db_session,
+            LeadCreateFromForm(first_name="Max", last_name="Muster", email="max@muster.at", company_name="Muster GmbH"),
+        )
+        csv_content = (
+            b"vorname,nachname,email,firma\n"
+            b"Anna,Huber,anna@muster.at,Muster Gmbh\n"
+            b"Eva,Gruber,eva@muster.at,Muster GmbH \n"
+        )
+
+        result = await lead_service.import_leads_from_file(db_session, csv_content, "leads.csv")
+
+        assert result.imported == 2
+        assert (await db_session.execute(select(func.count(Company.id)))).scalar() == 1
+
+
+class TestCompanyRoutes:
+    """Tests for duplicate names in the company routes."""
+
+    @pytest.mark.asyncio
+    async def test_create_rejects_normalized_duplicate(self, client, sample_company: Company):
+        response = await client.post("/api/companies", json={"name": "TEST Gmbh "})
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_update_rejects_normalized_duplicate(self, client, db_session: AsyncSession, sample_company: Company):
+        other = Company(name="Andere KG")
+        db_session.add(other)
+        await db_session.flush()
+
+        response = await client.put(f"/api/companies/{other.id}", json={"name": "Test KG"})
+        renamed = await client.put(f"/api/companies/{sample_company.id}", json={"name": "Test GmbH & Co. KG"})
+
+        assert response.status_code == 400
+        assert renamed.status_code == 200
@@ -357,3 +357,73 @@ class TestGetOrCreateContactByEmail:
         
         assert is_new is True
         assert contact.company_id == sample_company.id
+
+    @pytest.mark.asyncio
+    async def test_matches_case_insensitively(
+        self, db_session: AsyncSession, sample_contact: Contact, assert_max_queries
+    ):
+        """Test addresses differing in case and whitespace match one contact."""
+        with assert_max_queries(2):
+            contact, is_new = await contact_service.get_or_create_contact_by_email(
+                db_session,
+                email="  Max.Mustermann@TEST.at ",
+                first_name="Neuer",
+                last_name="Name",
+            )
+        
+        assert is_new is False
+        assert contact.id == sample_contact.id
+        assert contact.email == sample_contact.email
+
+    @pytest.mark.asyncio
+    async def test_unmatched_duplicates_are_ignored(
+        self, db_session: AsyncSession, sample_contact: Contact
+    ):
+        """Test a legacy duplicate without normalized email does not break the lookup."""
+        duplicate = Contact(first_name="Max", last_name="Doppelt", email=sample_contact.email)
+        duplicate.email_normalized = None
+        db_session.add(duplicate)
+        await db_session.flush()
+        
+        contact, is_new = await contact_service.get_or_create_contact_by_email(
+            db_session, email=sample_contact.email, first_name="Max", last_name="Mustermann"
+        )
+        
+        assert (contact.id, is_new) == (sample_contact.id, False)
+
+
+class TestUpsertContactsByEmail:
+    """Tests for upsert_contacts_by_email function."""
+
+    @pytest.mark.asyncio
+    async def test_batch_upsert(
+        self, db_session: AsyncSession, sample_contact: Contact, assert_max_queries
+    ):
+        """Test existing, new and repeated addresses resolve in chunked statements."""
+        rows = [
+            {"email": f"kunde{i}@example.at", "first_name": "Kunde", "last_name": str(i)}
+            for i in range(2500)
+        ]
+        rows += [
+            {"email": "KUNDE7@example.at", "first_name": "Doppelt", "last_name": "7"},
+            {"email": sample_contact.email.upper(), "first_name": "Neuer", "last_name": "Name", "phone": "1"},
+            {"email": None, "first_name": "Ohne", "last_name": "Adresse"},
+        ]
+        
+        with assert_max_queries(3):
+            ids = await contact_service.upsert_contacts_by_email(db_session, rows)
+        
+        assert len(ids) == 2501
+        assert ids["max.mustermann@test.at"] == sample_contact.id
+        contacts, total = await contact_service.get_contacts(db_session, limit=1)
+        assert total == 2501
+        kunde7 = await contact_service.get_contact(db_session, ids["kunde7@example.at"])
+        assert kunde7.first_name == "Kunde"
+        
+        again = await contact_service.upsert_contacts_by_email(db_session, rows[:10])
+        assert again == {key: ids[key] for key in again}
+
+    @pytest.mark.asyncio
+    async def test_empty(self, db_session: AsyncSession):
+        """Test nothing is executed without addresses."""
+        assert await contact_service.upsert_contacts_by_email(db_session, [{"email": " "}]) == {}
@@ -0,0 +1,146 @@
+"""Tests for database engines and session dependencies."""
+import asyncio
+import itertools
+import time
+
+import pytest
+from fastapi.routing import APIRoute
+from sqlalchemy import update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core import database
+from src.core.database import get_db, _read_only_connect_args
+from src.main import app
+from src.models.contact import Contact
+from tests.conftest import test_read_engine
+
+
+def _dependency_calls(route: APIRoute) -> set:
+    """Collect all dependency callables of a route, including nested ones."""
+    calls = set()
+    stack = [route.dependant]
+    while stack:
+        dependant = stack.pop()
+        calls.add(dependant.call)
+        stack.extend(dependant.dependencies)
+    return calls
+
+
+def test_read_only_connect_args():
+    """PostgreSQL read connections default to read-only transactions."""
+    assert _read_only_connect_args("postgresql+asyncpg://u:p@db/intra") == {
+        "server_settings": {"default_transaction_read_only": "on"}
+    }
+    assert _read_only_connect_args("sqlite+aiosqlite:///:memory:") == {}
+
+
+def test_read_engine_has_its_own_pool_size(monkeypatch):
+    """Read pools are sized apart from the write pool, keeping the primary's connection budget."""
+    monkeypatch.setattr(database.settings, "database_read_pool_size", 3)
+    monkeypatch.setattr(database.settings, "database_read_max_overflow", 4)
+
+    pool = database._create_read_engine("postgresql+asyncpg://u:p@db/intra", "read").pool
+
+    assert (pool.size(), pool._max_overflow) == (3, 4)
+
+
+def _api_routes(routes) -> list[APIRoute]:
+    """All APIRoutes, including those of included routers.
+
+    Newer FastAPI versions keep included routers as wrappers in app.routes
+    instead of copying their routes in.
+    """
+    found = []
+    for route in routes:
+        if isinstance(route, APIRoute):
+            found.append(route)
+        elif hasattr(route, "original_router"):
+            found.extend(_api_routes(route.original_router.routes))
+        elif hasattr(route, "routes"):
+            found.extend(_api_routes(route.routes))
+    return found
+
+
+def test_get_routes_use_read_sessions():
+    """No GET endpoint depends on the read-write session."""
+    get_routes = [route for route in _api_routes(app.routes) if "GET" in route.methods]
+    assert any(route.path.endswith("/send-jobs/{job_id}") for route in get_routes)
+    for route in get_routes:
+        calls = _dependency_calls(route)
+        assert get_db not in calls, f"{route.path} uses get_db"
+
+
+@pytest.mark.asyncio
+async def test_read_sessions_reject_writes_in_tests(client, sample_contact):
+    """Read dependencies run on a read-only engine in tests, so a read route that writes fails."""
+    async for session in database.get_primary_read_db():
+        assert session.get_bind() is test_read_engine.sync_engine
+        assert await session.get(Contact, sample_contact.id) is not None
+        with pytest.raises(OperationalError, match="readonly"):
+            await session.execute(update(Contact).values(position="Geschäftsführer"))
+
+
+class TestReadRouting:
+    """Tests for replica selection in choose_read_engine."""
+
+    @pytest.fixture
+    def replicas(self, monkeypatch):
+        """Two SQLite 'replicas', the second one unreachable."""
+        good = create_async_engine("sqlite+aiosqlite:///:memory:")
+        bad = create_async_engine("sqlite+aiosqlite:////nonexistent/dir/replica.db")
+        replicas = [
+            {"url": "sqlite://good", "engine": good, "healthy": True, "lag": 0.0, "checked_at": None},
+            {"url": "sqlite://bad", "engine": bad, "healthy": True, "lag": 0.0, "checked_at": None},
+        ]
+        monkeypatch.setattr(database, "_replicas", replicas)
+        monkeypatch.setattr(database, "_replica_cycle", itertools.count())
+        return replicas
+
+    @pytest.mark.asyncio
+    async def test_without_replicas_reads_from_primary(self, monkeypatch):
+        """No replicas configured: reads use the primary read engine."""
+        monkeypatch.setattr(database, "_replicas", [])
+        assert await database.choose_read_engine() is database.read_engine
+
+    @pytest.mark.asyncio
+    async def test_round_robin_skips_unhealthy_replica(self, replicas):
+        """An unreachable replica is marked unhealthy and skipped."""
+        chosen = [await database.choose_read_engine() for _ in range(3)]
+
+        assert all(engine is replicas[0]["engine"] for engine in chosen)
+        assert replicas[1]["healthy"] is False
+
+    @pytest.mark.asyncio
+    async def test_lagging_replica_falls_back_to_primary(self, replicas, monkeypatch):
+        """Replicas behind the lag limit are not used."""
+        monkeypatch.setattr(database.settings, "database_replica_max_lag_seconds", 1.0)
+        for replica in replicas:
+            replica.update(lag=30.0, checked_at=time.monotonic())
+
+        assert await database.choose_read_engine() is database.read_engine
+
+    @pytest.mark.asyncio
+    async def test_prefer_primary_after_write(self, replicas):
+        """Read-your-writes requests bypass the replicas."""
+        assert await database.choose_read_engine(prefer_primary=True) is database.read_engine
+
+    @pytest.mark.asyncio
+    async def test_hanging_replica_check_times_out(self, replicas, monkeypatch):
+        """A replica that does not answer is unhealthy during and after its check."""
+        monkeypatch.setattr(database.settings, "database_replica_check_timeout_seconds", 0.05)
+        monkeypatch.setattr(database, "_replicas", replicas[:1])
+
+        async def hang(replica):
+            await asyncio.sleep(60)
+
+        monkeypatch.setattr(database, "_replica_lag", hang)
+        started = time.monotonic()
+        check = asyncio.create_task(database.choose_read_engine())
+        await asyncio.sleep(0)
+
+        # Concurrent requests don't wait for the check or use the replica
+        assert await database.choose_read_engine() is database.read_engine
+        assert await check is database.read_engine
+        assert time.monotonic() - started < 1
+        assert replicas[0]["healthy"] is False
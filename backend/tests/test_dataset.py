@@ -0,0 +1,60 @@
+"""Tests for the synthetic dataset generator."""
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from perf.dataset import dataset_sizes, generate_rows, load_dataset
+from src.models.contact import Contact
+from src.models.lead import Lead
+from src.models.opportunity import Opportunity
+
+
+def test_dataset_sizes_scale():
+    """Test row counts grow with the scale factor."""
+    sizes = dataset_sizes(2)
+
+    assert sizes["contacts"] == 2 * dataset_sizes(1)["contacts"]
+    assert all(count >= 1 for count in dataset_sizes(0.0001).values())
+
+
+def test_generate_rows_deterministic():
+    """Test the same seed produces the same rows."""
+    first = list(generate_rows(Contact, scale=0.01, seed=7))
+    second = list(generate_rows(Contact, scale=0.01, seed=7))
+    other = list(generate_rows(Contact, scale=0.01, seed=8))
+
+    strip = lambda rows: [{k: v for k, v in row.items() if k != "created_at"} for row in rows]
+    assert strip(first) == strip(second)
+    assert strip(first) != strip(other)
+
+
+def test_generated_contacts_realistic():
+    """Test contacts carry umlauts and titles, with ASCII email addresses."""
+    contacts = list(generate_rows(Contact, scale=0.05))
+
+    assert any(any(ch in c["last_name"] for ch in "äöüß") for c in contacts)
+    assert any(c["title"] for c in contacts)
+    assert all(c["email"].isascii() for c in contacts if c["email"])
+
+
+@pytest.mark.asyncio
+async def test_load_dataset_sqlite(tmp_path):
+    """Test loading through the bulk-insert fallback keeps references valid."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'dataset.db'}")
+    try:
+        counts = await load_dataset(engine, scale=0.01, recreate=True)
+
+        async with engine.connect() as conn:
+            contacts = (await conn.execute(select(func.count(Contact.id)))).scalar()
+            orphan_leads = (await conn.execute(
+                select(func.count(Lead.id)).where(Lead.contact_id.not_in(select(Contact.id)))
+            )).scalar()
+            duplicate_lead_refs = (await conn.execute(
+                select(func.count(Opportunity.lead_id) - func.count(func.distinct(Opportunity.lead_id)))
+            )).scalar()
+    finally:
+        await engine.dispose()
+
+    assert counts["contacts"] == contacts == dataset_sizes(0.01)["contacts"]
+    assert orphan_leads == 0
+    assert duplicate_lead_refs == 0
@@ -0,0 +1,317 @@
+"""Tests for compiled email templates and the email service."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.send_jobs import SendJobWorker
+from src.core.templating import CompiledTemplate, compiled_template, invalidate_template, unknown_variables
+from src.models.contact import Contact
+from src.models.contact_history import ContactHistory, HistoryType
+from src.models.email_outbox import EmailOutbox
+from src.models.email_send_job import EmailJobStatus
+from src.schemas.email_template import ContactFilter, EmailBulkSend, EmailTemplateCreate, EmailTemplateUpdate
+from src.services import email_service, outbox_service
+from tests.conftest import TestSessionLocal, test_engine
+
+BODY = "{{contact.salutation}} {{contact.title}} {{contact.last_name}}, willkommen bei {{company.name}}!"
+
+
+class TestCompiledTemplate:
+    """Tests for parsing and rendering templates."""
+
+    @pytest.mark.asyncio
+    async def test_render(self, sample_contact: Contact, sample_company):
+        template = CompiledTemplate(BODY)
+
+        assert template.render(sample_contact, sample_company) == "Herr Mag. Mustermann, willkommen bei Test GmbH!"
+        assert template.variables == ["contact.salutation", "contact.title", "contact.last_name", "company.name"]
+
+    @pytest.mark.asyncio
+    async def test_render_without_company(self, sample_contact_no_company: Contact):
+        template = CompiledTemplate("{{contact.full_name}} ({{company.name}}{{company.city}})")
+
+        assert template.render(sample_contact_no_company) == "Erika Musterfrau ()"
+
+    def test_repeated_variables_and_whitespace(self):
+        contact = Contact(first_name="Käthe", last_name="Größ")
+        template = CompiledTemplate("{{ contact.first_name }} / {{contact.first_name}}")
+
+        assert template.render(contact) == "Käthe / Käthe"
+        assert template.variables == ["contact.first_name"]
+
+    def test_unknown_placeholders_left_as_written(self):
+        contact = Contact(first_name="Käthe", last_name="Größ")
+        template = CompiledTemplate("Hallo {{contact.nickname}} {{contact.first_name}}")
+
+        assert template.render(contact) == "Hallo {{contact.nickname}} Käthe"
+        assert unknown_variables(template.source) == ["contact.nickname"]
+
+    def test_plain_text(self):
+        assert CompiledTemplate("Keine Platzhalter").render(Contact()) == "Keine Platzhalter"
+
+
+class TestTemplateValidation:
+    """Tests for save-time placeholder validation."""
+
+    def test_unknown_placeholder_rejected(self):
+        with pytest.raises(ValueError, match="Unbekannte Platzhalter"):
+            EmailTemplateCreate(name="Test", subject="Hallo {{vorname}}", body="Text")
+
+    def test_update_validates_placeholders(self):
+        with pytest.raises(ValueError, match="contact.nickname"):
+            EmailTemplateUpdate(body="Hallo {{contact.nickname}}")
+        assert EmailTemplateUpdate(body="Hallo {{contact.first_name}}").body
+
+    @pytest.mark.asyncio
+    async def test_create_endpoint_rejects_unknown_placeholder(self, client: AsyncClient):
+        response = await client.post(
+            "/api/email-templates",
+            json={"name": "Willkommen", "subject": "Hallo", "body": "Liebe(r) {{contact.vorname}}"},
+        )
+
+        assert response.status_code == 422
+
+
+class TestTemplateCache:
+    """Tests for caching compiled templates."""
+
+    @pytest.mark.asyncio
+    async def test_cached_until_updated(self, db_session: AsyncSession, sample_contact: Contact):
+        template = await email_service.create_template(
+            db_session, EmailTemplateCreate(name="Willkommen", subject="Hallo", body="Liebe(r) {{contact.first_name}}")
+        )
+        invalidate_template()
+
+        first = compiled_template(template)
+        assert compiled_template(template) is not first
+        assert compiled_template(template)[1] is first[1]
+
+        await email_service.update_template(
+            db_session, template.id, EmailTemplateUpdate(body="Servus {{contact.first_name}}")
+        )
+        subject, body = compiled_template(template)
+        assert body is not first[1]
+        assert body.render(sample_contact) == "Servus Max"
+
+    @pytest.mark.asyncio
+    async def test_preview_uses_current_template(self, client: AsyncClient, db_session: AsyncSession, sample_contact):
+        template = await email_service.create_template(
+            db_session, EmailTemplateCreate(name="Angebot", subject="Angebot für {{company.name}}", body=BODY)
+        )
+
+        response = await client.post(
+            "/api/email-templates/preview", json={"template_id": template.id, "contact_id": sample_contact.id}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["subject"] == "Angebot für Test GmbH"
+        assert response.json()["body"].startswith("Herr Mag. Mustermann")
+
+
+@pytest.fixture
+def job_sessions(monkeypatch):
+    """Run bulk send jobs against the test database."""
+    monkeypatch.setattr(email_service, "async_session_maker", TestSessionLocal)
+
+
+class TestBulkSend:
+    """Tests for bulk mail-merge send jobs."""
+
+    @pytest.mark.asyncio
+    async def test_send_to_contact_ids(
+        self, client: AsyncClient, db_session: AsyncSession, multiple_contacts, sample_contact_no_company, job_sessions
+    ):
+        template = await email_service.create_template(
+            db_session, EmailTemplateCreate(name="Newsletter", subject="News für {{company.name}}", body=BODY)
+        )
+        sample_contact_no_company.email = None
+        ids = [contact.id for contact in multiple_contacts] + [sample_contact_no_company.id]
+
+        response = await client.post(
+            "/api/email-templates/send-bulk", json={"template_id": template.id, "contact_ids": ids}
+        )
+
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+        assert response.json()["total"] == len(ids)
+
+        status = (await client.get(f"/api/email-templates/send-jobs/{job_id}")).json()
+        assert status["status"] == "completed"
+        assert status["processed"] == len(ids)
+        assert status["sent"] == len(multiple_contacts)
+        assert status["skipped"] == 1
+
+        history = select(ContactHistory.title).where(ContactHistory.type == HistoryType.EMAIL)
+        # Logged on delivery, not when queued
+        assert (await db_session.execute(history)).scalars().all() == []
+        await outbox_service.mark_sent(db_session, await outbox_service.claim_messages(db_session, 100, 300))
+
+        titles = (await db_session.execute(history)).scalars().all()
+        assert len(titles) == len(multiple_contacts)
+        assert sorted(titles) == ["E-Mail gesendet: News für "] * 3 + ["E-Mail gesendet: News für Test GmbH"] * 2
+
+    @pytest.mark.asyncio
+    async def test_send_by_filter_in_batches(
+        self, db_session: AsyncSession, multiple_contacts, sample_company, job_sessions
+    ):
+        template = await email_service.create_template(
+            db_session, EmailTemplateCreate(name="Info", subject="Hallo {{contact.full_name}}", body="Text")
+        )
+        job = await email_service.create_send_job(
+            db_session,
+            EmailBulkSend(template_id=template.id, filter=ContactFilter(company_id=sample_company.id)),
+        )
+        await db_session.commit()
+
+        await email_service.run_send_job(job.id, batch_size=1)
+
+        await db_session.refresh(job)
+        assert job.status == EmailJobStatus.COMPLETED
+        assert job.total == job.processed == job.sent == 2
+
+    @pytest.mark.asyncio
+    async def test_large_id_selection_binds_chunks(
+        self, db_session: AsyncSession, multiple_contacts, job_sessions
+    ):
+        template = await email_service.create_template(
+            db_session, EmailTemplateCreate(name="Info", subject="Hallo {{contact.full_name}}", body="Text")
+        )
+        # More ids than asyncpg can bind in one statement; most of them match no contact
+        ids = [contact.id for contact in multiple_contacts] + list(range(10_000, 50_000))
+        parameters = []
+
+        def record_parameters(conn, cursor, statement, params, context, executemany):
+            parameters.append(len(params))
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record_parameters)
+        try:
+            job = await email_service.create_send_job(
+                db_session, EmailBulkSend(template_id=template.id, contact_ids=ids)
+            )
+            await db_session.commit()
+            await email_service.run_send_job(job.id)
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record_parameters)
+
+        await db_session.refresh(job)
+        assert job.status == EmailJobStatus.COMPLETED
+        assert job.total == job.processed == job.sent == len(multiple_contacts)
+        assert max(parameters) <= email_service.RECIPIENT_ID_CHUNK_SIZE + 1
+
+    @pytest.mark.asyncio
+    async def test_worker_resumes_orphaned_job(
+        self, db_session: AsyncSession, multiple_contacts, sample_company, job_sessions
+    ):
+        template = await email_service.create_template(
+            db_session, EmailTemplateCreate(name="Info", subject="Hallo {{contact.full_name}}", body="Text")
+        )
+        ids = sorted(contact.id for contact in multiple_contacts)
+        orphaned = await email_service.create_send_job(
+            db_session, EmailBulkSend(template_id=template.id, contact_ids=ids)
+        )
+        # Interrupted by a restart after its first batch
+        orphaned.status = EmailJobStatus.RUNNING
+        orphaned.processed = orphaned.sent = 1
+        orphaned.last_contact_id = ids[0]
+        orphaned.locked_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        running = await email_service.create_send_job(
+            db_session, EmailBulkSend(template_id=template.id, filter=ContactFilter(company_id=sample_company.id))
+        )
+        running.status = EmailJobStatus.RUNNING
+        running.locked_at = datetime.now(timezone.utc)
+        await db_session.commit()
+
+        assert await SendJobWorker(session_factory=TestSessionLocal).run_once() == 1
+
+        await db_session.refresh(orphaned)
+        await db_session.refresh(running)
+        assert orphaned.status == EmailJobStatus.COMPLETED
+        assert orphaned.processed == orphaned.sent == len(ids)
+        assert running.status == EmailJobStatus.RUNNING and running.processed == 0
+        queued = await db_session.execute(
+            select(EmailOutbox.contact_id).where(EmailOutbox.send_job_id == orphaned.id)
+        )
+        assert sorted(queued.scalars().all()) == ids[1:]
+
+    @pytest.mark.asyncio
+    async def test_requires_exactly_one_selection(self, client: AsyncClient):
+        response = await client.post("/api/email-templates/send-bulk", json={"template_id": 1})
+        assert response.status_code == 422
+
+        response = await client.post(
+            "/api/email-templates/send-bulk",
+            json={"template_id": 1, "contact_ids": [1], "filter": {"company_id": 1}},
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_unknown_template(self, client: AsyncClient):
+        response = await client.post(
+            "/api/email-templates/send-bulk", json={"template_id": 999, "contact_ids": [1]}
+        )
+        assert response.status_code == 404
+
+
+class TestBatchPreview:
+    """Tests for previewing a template for many recipients."""
+
+    @pytest.mark.asyncio
+    async def test_preview_page_flags_missing_values(
+        self, client: AsyncClient, db_session: AsyncSession, multiple_contacts, assert_max_queries
+    ):
+        template = await email_service.create_template(
+            db_session, EmailTemplateCreate(name="Einladung", subject="Einladung {{company.name}}", body=BODY)
+        )
+        multiple_contacts[0].salutation = "Frau"
+        multiple_contacts[1].email = None
+        await db_session.flush()
+        ids = [contact.id for contact in multiple_contacts]
+
+        with assert_max_queries(3):
+            response = await client.post(
+                "/api/email-templates/preview-batch",
+                json={"template_id": template.id, "contact_ids": ids, "page_size": 4},
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 5
+        assert [item["contact_id"] for item in data["items"]] == ids[:4]
+        assert data["with_missing"] == 4
+
+        anna, peter, maria = data["items"][:3]
+        assert anna["subject"] == "Einladung Test GmbH"
+        assert anna["body"] == "Frau  Schmidt, willkommen bei Test GmbH!"
+        assert anna["missing"] == ["contact.title"]
+        assert "contact.email" in peter["missing"]
+        assert peter["to_email"] == ""
+        assert maria["missing"] == ["company.name", "contact.salutation", "contact.title"]
+        assert maria["to_name"] == "Maria Huber"
+
+    @pytest.mark.asyncio
+    async def test_preview_by_filter_second_page(
+        self, client: AsyncClient, db_session: AsyncSession, multiple_contacts
+    ):
+        template = await email_service.create_template(
+            db_session, EmailTemplateCreate(name="Kurz", subject="Hallo {{contact.full_name}}", body="Text")
+        )
+
+        response = await client.post(
+            "/api/email-templates/preview-batch",
+            json={"template_id": template.id, "filter": {"is_active": True}, "page": 2, "page_size": 3},
+        )
+
+        data = response.json()
+        assert data["total"] == 4
+        assert [item["subject"] for item in data["items"]] == ["Hallo Dr. Lisa Berger"]
+        assert data["with_missing"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_template(self, client: AsyncClient):
+        response = await client.post(
+            "/api/email-templates/preview-batch", json={"template_id": 999, "contact_ids": [1]}
+        )
+        assert response.status_code == 404
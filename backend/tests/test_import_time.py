@@ -0,0 +1,25 @@
+"""Import-time budget for the API entry point."""
+from perf.importtime import DEFAULT_BUDGET_MS, measure_import_time, parse_importtime
+
+
+def test_parse_importtime():
+    """Test parse_importtime reads self and cumulative times in milliseconds."""
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json.decoder\n"
+        "import time:      1500 |       2500 | src.main\n"
+    )
+    rows = parse_importtime(stderr)
+
+    assert rows == [
+        {"module": "json.decoder", "self_ms": 0.12, "cumulative_ms": 0.12},
+        {"module": "src.main", "self_ms": 1.5, "cumulative_ms": 2.5},
+    ]
+
+
+def test_cold_import_of_main_within_budget():
+    """Importing src.main stays within budget and does not pull in heavy optional modules."""
+    result = measure_import_time("src.main")
+
+    assert result["heavy_loaded"] == []
+    assert 0 < result["total_ms"] <= DEFAULT_BUDGET_MS
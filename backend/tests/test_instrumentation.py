@@ -0,0 +1,96 @@
+"""Tests for per-request SQL instrumentation."""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from src.core.instrumentation import repeated_statements, statement_shape, track_queries
+from src.models.lead import Lead
+from src.models.lookup_value import LookupValue
+
+
+class TestStatementShape:
+    """Tests for statement_shape."""
+
+    def test_normalizes_placeholders_and_in_lists(self):
+        """Statements differing only in parameters share a shape."""
+        a = statement_shape("SELECT * FROM leads WHERE id IN ($1, $2, $3)")
+        b = statement_shape("SELECT *\n  FROM leads WHERE id IN (?)")
+        assert a == b == "SELECT * FROM leads WHERE id IN (?)"
+
+
+class TestTrackQueries:
+    """Tests for track_queries and N+1 detection."""
+
+    @pytest.mark.asyncio
+    async def test_counts_statements_and_rows(self, db_session, sample_lead: Lead):
+        """Statements, rows and time are recorded for the active scope."""
+        with track_queries() as stats:
+            result = await db_session.execute(select(Lead))
+            result.scalars().all()
+
+        assert stats["statements"] == 1
+        assert stats["rows"] == 1
+        assert stats["db_time_ms"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_flags_repeated_statements(self, db_session):
+        """The same statement shape in a loop is reported as repeated."""
+        with track_queries() as stats:
+            for lookup_id in range(6):
+                await db_session.execute(select(LookupValue).where(LookupValue.id == lookup_id))
+
+        repeated = repeated_statements(stats, threshold=5)
+        assert list(repeated.values()) == [6]
+
+    @pytest.mark.asyncio
+    async def test_nested_scopes_both_record(self, db_session):
+        """An outer scope also sees statements recorded by an inner scope."""
+        with track_queries() as outer:
+            with track_queries() as inner:
+                await db_session.execute(select(LookupValue))
+            await db_session.execute(select(LookupValue))
+
+        assert inner["statements"] == 1
+        assert outer["statements"] == 2
+
+
+class TestQueryStatsMiddleware:
+    """Tests for the Server-Timing header and the query-count helper."""
+
+    @pytest.mark.asyncio
+    async def test_server_timing_header(self, client: AsyncClient, sample_lead: Lead):
+        """Responses carry database statistics in Server-Timing."""
+        response = await client.get("/api/leads")
+
+        assert response.status_code == 200
+        assert response.headers["server-timing"].startswith("db;dur=")
+        assert "statements" in response.headers["server-timing"]
+
+    @pytest.mark.asyncio
+    async def test_list_leads_query_budget(
+        self, client: AsyncClient, multiple_leads: list[Lead], assert_max_queries
+    ):
+        """Listing leads does not issue per-row queries."""
+        with assert_max_queries(5):
+            response = await client.get("/api/leads")
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_reorder_lookup_values_query_budget(
+        self, client: AsyncClient, db_session, assert_max_queries
+    ):
+        """Reordering is one UPDATE regardless of the number of IDs."""
+        lookups = [
+            LookupValue(category="budget", value=f"v{i}", label=f"L{i}", sort_order=i)
+            for i in range(20)
+        ]
+        db_session.add_all(lookups)
+        await db_session.flush()
+
+        with assert_max_queries(1):
+            response = await client.post(
+                "/api/settings/lookups/budget/reorder",
+                json=[lv.id for lv in reversed(lookups)],
+            )
+        assert response.status_code == 200
+        assert response.json()["affected"] == 20
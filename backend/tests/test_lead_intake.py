@@ -0,0 +1,137 @@
+"""Tests for queued public lead intake."""
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import lead_intake
+from src.core.config import get_settings
+from src.core.lead_intake import LeadIntakeWorker
+from src.core.metrics import LEAD_INTAKE_DEPTH
+from src.models.company import Company
+from src.models.contact import Contact
+from src.models.contact_history import ContactHistory
+from src.models.lead import Lead
+from src.models.lead_intake import IntakeStatus, LeadIntake
+from tests.conftest import TestSessionLocal
+
+
+def _form(email: str, **fields) -> dict:
+    return {"first_name": "Max", "last_name": "Mustermann", "email": email, **fields}
+
+
+@pytest.fixture
+def async_intake(monkeypatch):
+    """Queue submissions instead of creating leads in the request."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "lead_intake_async", True)
+    monkeypatch.setattr(lead_intake, "_depth", [float("-inf"), 0])
+
+
+@pytest_asyncio.fixture
+async def worker():
+    return LeadIntakeWorker(session_factory=TestSessionLocal, batch_size=50)
+
+
+async def _submit(client: AsyncClient, db: AsyncSession, *forms: dict) -> list:
+    responses = [await client.post("/api/public/leads", json=form) for form in forms]
+    await db.commit()
+    return responses
+
+
+@pytest.mark.asyncio
+async def test_submission_is_queued(client: AsyncClient, db_session: AsyncSession, async_intake):
+    [response] = await _submit(client, db_session, _form("max@example.at", company_name="Muster GmbH"))
+
+    assert response.status_code == 202
+    entry = (await db_session.execute(select(LeadIntake))).scalar_one()
+    assert entry.status == IntakeStatus.PENDING
+    assert entry.payload["company_name"] == "Muster GmbH"
+    assert (await db_session.execute(select(func.count(Lead.id)))).scalar() == 0
+
+
+@pytest.mark.asyncio
+async def test_invalid_submission_is_rejected(client: AsyncClient, db_session: AsyncSession, async_intake):
+    [response] = await _submit(client, db_session, _form("keine-adresse"))
+
+    assert response.status_code == 422
+    assert (await db_session.execute(select(func.count(LeadIntake.id)))).scalar() == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_resolves_batch_in_sets(
+    client: AsyncClient, db_session: AsyncSession, sample_contact, sample_company, async_intake, worker,
+    assert_max_queries,
+):
+    await _submit(
+        client,
+        db_session,
+        _form(sample_contact.email, company_name="Test GmbH", utm_source="meta"),
+        _form("neu@example.at", first_name="Anna", company_name="Neu KG"),
+        _form("neu@example.at", first_name="Anna", company_name="Neu KG", utm_source="newsletter"),
+        _form("ohne@example.at"),
+    )
+
+    # SQLite returns ordered lead ids one INSERT per row; PostgreSQL uses one
+    with assert_max_queries(9 + 4):
+        assert await worker.run_once() == 4
+
+    leads = (await db_session.execute(select(Lead).order_by(Lead.id))).scalars().all()
+    assert len(leads) == 4
+    assert leads[0].contact_id == sample_contact.id
+    assert leads[0].utm_source == "meta"
+    assert leads[1].contact_id == leads[2].contact_id
+    assert {lead.source for lead in leads} == {"landing_page"}
+
+    anna = await db_session.get(Contact, leads[1].contact_id)
+    company = await db_session.get(Company, anna.company_id)
+    assert (anna.first_name, company.name) == ("Anna", "Neu KG")
+    assert (await db_session.execute(select(func.count(Company.id)))).scalar() == 2
+    assert (await db_session.execute(select(func.count(ContactHistory.id)))).scalar() == 4
+
+    entries = (await db_session.execute(select(LeadIntake).order_by(LeadIntake.id))).scalars().all()
+    assert [entry.status for entry in entries] == [IntakeStatus.DONE] * 4
+    assert [entry.lead_id for entry in entries] == [lead.id for lead in leads]
+    assert LEAD_INTAKE_DEPTH._value.get() == 0
+    assert await worker.run_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_bad_submission_does_not_block_batch(
+    client: AsyncClient, db_session: AsyncSession, async_intake, worker, monkeypatch
+):
+    monkeypatch.setattr(get_settings(), "lead_intake_max_attempts", 1)
+    await _submit(client, db_session, _form("gut@example.at"), _form("kaputt@example.at"))
+    broken = (await db_session.execute(select(LeadIntake).order_by(LeadIntake.id.desc()))).scalars().first()
+    broken.payload = {"email": "kaputt@example.at"}
+    broken_id = broken.id
+    await db_session.commit()
+
+    assert await worker.run_once() == 2
+
+    db_session.expire_all()
+    statuses = dict((await db_session.execute(select(LeadIntake.id, LeadIntake.status))).all())
+    assert statuses[broken_id] == IntakeStatus.FAILED
+    assert sorted(statuses.values()) == [IntakeStatus.DONE, IntakeStatus.FAILED]
+    assert "ValidationError" in (await db_session.get(LeadIntake, broken_id)).last_error
+    assert (await db_session.execute(select(func.count(Lead.id)))).scalar() == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_answers_503(client: AsyncClient, db_session: AsyncSession, async_intake, monkeypatch):
+    monkeypatch.setattr(get_settings(), "lead_intake_max_depth", 2)
+
+    responses = await _submit(client, db_session, *(_form(f"kunde{i}@example.at") for i in range(3)))
+
+    assert [response.status_code for response in responses] == [202, 202, 503]
+    assert responses[2].headers["Retry-After"] == "5"
+    assert (await db_session.execute(select(func.count(LeadIntake.id)))).scalar() == 2
+
+
+@pytest.mark.asyncio
+async def test_sync_mode_creates_lead(client: AsyncClient, db_session: AsyncSession):
+    response = await client.post("/api/public/leads", json=_form("direkt@example.at"))
+
+    assert response.status_code == 201
+    assert (await db_session.execute(select(func.count(Lead.id)))).scalar() == 1
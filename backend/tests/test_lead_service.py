@@ -231,6 +231,42 @@ class TestImportLeadsFromFile:
         company = company_result.scalar_one_or_none()
         assert company is not None
 
+    @pytest.mark.asyncio
+    async def test_import_reports_too_long_values_per_row(self, db_session: AsyncSession):
+        csv_content = f"vorname,nachname,email\nHans,Gruber,hans@test.at\nKlara,{'K' * 101},klara@test.at\n".encode()
+        
+        result = await lead_service.import_leads_from_file(
+            db_session, csv_content, "test.csv"
+        )
+        
+        assert result.imported == 1
+        assert result.failed == 1
+        assert result.errors == ["Row 3: last_name longer than allowed (100 characters)"]
+
+    @pytest.mark.asyncio
+    async def test_import_falls_back_to_rows_when_batch_fails(
+        self, db_session: AsyncSession, monkeypatch
+    ):
+        from src.services import contact_service
+        upsert = contact_service.upsert_contacts_by_email
+        
+        async def failing_upsert(db, contacts):
+            if any(contact["email"] == "kaputt@test.at" for contact in contacts):
+                raise ValueError("value too long for type character varying(50)")
+            return await upsert(db, contacts)
+        
+        monkeypatch.setattr(contact_service, "upsert_contacts_by_email", failing_upsert)
+        csv_content = b"vorname,nachname,email\nHans,Gruber,hans@test.at\nKarl,Kaputt,kaputt@test.at\nKlara,Klein,klara@test.at\n"
+        
+        result = await lead_service.import_leads_from_file(
+            db_session, csv_content, "test.csv"
+        )
+        
+        assert result.imported == 2
+        assert result.errors == ["Row 3: value too long for type character varying(50)"]
+        emails = (await db_session.execute(select(Contact.email).order_by(Contact.email))).scalars().all()
+        assert emails == ["hans@test.at", "klara@test.at"]
+
     @pytest.mark.asyncio
     async def test_import_reuses_existing_contact(
         self, db_session: AsyncSession, sample_contact: Contact
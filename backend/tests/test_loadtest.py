@@ -0,0 +1,59 @@
+"""Tests for the load-test harness."""
+import httpx
+import pytest
+from httpx import AsyncClient
+
+from perf.loadtest import LANDING_BURST_SIZE, MIXES, compare_results, percentile, run_load_test
+
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles."""
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_run_load_test_records_routes(client: AsyncClient, sample_contact):
+    """Test a short in-process run reports every route of the scenario."""
+    result = await run_load_test(client, MIXES["call-center"], users=2, iterations=1, scale=0.0001)
+
+    routes = result["routes"]
+    assert result["meta"]["scenarios_run"] == {"call_center": 2}
+    assert routes["GET /api/contacts/search"]["requests"] == 2
+    assert "POST /api/contacts/{contact_id}/calls" in routes
+    assert result["total"]["requests"] == sum(r["requests"] for r in routes.values())
+    assert {"p50_ms", "p95_ms", "p99_ms", "error_rate", "throughput_rps"} <= set(result["total"])
+
+
+@pytest.mark.asyncio
+async def test_landing_burst_spreads_client_addresses():
+    """Test burst submissions come from many addresses and 429s are reported apart from errors."""
+    addresses = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        addresses.append(request.headers["X-Forwarded-For"])
+        return httpx.Response(429 if len(addresses) == 1 else 201)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://loadtest") as client:
+        result = await run_load_test(client, MIXES["landing-burst"], users=1, iterations=1, scale=0.0001)
+
+    assert len(set(addresses)) == LANDING_BURST_SIZE
+    route = result["routes"]["POST /api/public/leads"]
+    assert (route["requests"], route["rate_limited"], route["errors"]) == (LANDING_BURST_SIZE, 1, 0)
+    assert result["total"]["rate_limited"] == 1
+
+
+def test_compare_results():
+    """Test comparison reports p95 changes per route."""
+    route = {"p95_ms": 100.0, "error_rate": 0.0}
+    baseline = {"routes": {"GET /api/leads": route}}
+    current = {"routes": {"GET /api/leads": {**route, "p95_ms": 150.0}, "GET /api/tasks": route}}
+
+    lines = compare_results(baseline, current)
+
+    assert "p95 100.0 -> 150.0 ms (+50%)" in lines[0]
+    assert lines[1] == "GET /api/tasks: new"
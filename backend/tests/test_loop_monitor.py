@@ -0,0 +1,92 @@
+"""Tests for the event-loop watchdog and strict blocking mode."""
+import asyncio
+import logging
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.core.config import get_settings
+from src.core.loop_monitor import (
+    LoopBlockedError,
+    LoopBlockGuardMiddleware,
+    start_loop_monitor,
+    stop_loop_monitor,
+)
+from src.core.metrics import EVENT_LOOP_BLOCKED
+
+
+def _blocked_count() -> float:
+    return next(
+        sample.value
+        for sample in EVENT_LOOP_BLOCKED.collect()[0].samples
+        if sample.name.endswith("_count")
+    )
+
+
+async def blocking_handler(scope, receive, send):
+    """Minimal ASGI app doing synchronous work on the loop."""
+    time.sleep(0.08)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def cooperative_handler(scope, receive, send):
+    await asyncio.sleep(0.08)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+@pytest.mark.asyncio
+async def test_watchdog_logs_blocking_stack(monkeypatch, caplog):
+    """Test a blocked loop is logged with the stack of the blocking coroutine."""
+    monkeypatch.setattr(get_settings(), "loop_block_threshold_ms", 20.0)
+    before = _blocked_count()
+
+    async def render_everything():
+        time.sleep(0.15)
+
+    task = start_loop_monitor(interval=0.01)
+    await asyncio.sleep(0.05)
+    with caplog.at_level(logging.WARNING, logger="src.core.loop_monitor"):
+        await render_everything()
+        await asyncio.sleep(0.1)
+    await stop_loop_monitor(task)
+
+    assert _blocked_count() > before
+    message = next(record.getMessage() for record in caplog.records if "Event loop blocked" in record.getMessage())
+    assert "render_everything" in message
+
+
+@pytest.mark.asyncio
+async def test_strict_mode_fails_blocking_request(monkeypatch):
+    """Test strict mode raises for a request with a long synchronous step."""
+    monkeypatch.setattr(get_settings(), "loop_block_strict_ms", 50.0)
+    transport = ASGITransport(app=LoopBlockGuardMiddleware(blocking_handler))
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        with pytest.raises(LoopBlockedError, match="GET /report blocked the event loop"):
+            await client.get("/report")
+
+
+@pytest.mark.asyncio
+async def test_strict_mode_allows_awaiting(monkeypatch):
+    """Test waiting without blocking passes strict mode."""
+    monkeypatch.setattr(get_settings(), "loop_block_strict_ms", 50.0)
+    transport = ASGITransport(app=LoopBlockGuardMiddleware(cooperative_handler))
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/report")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_strict_mode_off(monkeypatch):
+    monkeypatch.setattr(get_settings(), "loop_block_strict_ms", 0.0)
+    transport = ASGITransport(app=LoopBlockGuardMiddleware(blocking_handler))
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/report")
+
+    assert response.status_code == 200
@@ -0,0 +1,202 @@
+"""Tests for the email outbox and SMTP delivery worker."""
+import asyncio
+import socket
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from aiosmtpd.controller import Controller
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import get_settings
+from src.core.mailer import OutboxWorker, RateLimiter
+from src.models.contact import Contact
+from src.models.contact_history import ContactHistory, HistoryType
+from src.models.email_outbox import EmailOutbox, OutboxStatus
+from src.schemas.email_template import EmailTemplateCreate
+from src.services import email_service, outbox_service
+from tests.conftest import TestSessionLocal
+
+
+class RecordingHandler:
+    """aiosmtpd handler keeping delivered messages; rejects 'reject*' recipients."""
+
+    def __init__(self):
+        self.messages = []
+        self.connections = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("reject"):
+            return "550 5.1.1 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    """Local SMTP stand-in the worker delivers to."""
+    handler = RecordingHandler()
+    port = _free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    settings = get_settings()
+    monkeypatch.setattr(settings, "smtp_host", "127.0.0.1")
+    monkeypatch.setattr(settings, "smtp_port", port)
+    monkeypatch.setattr(settings, "smtp_user", "")
+    yield handler
+    controller.stop()
+
+
+@pytest_asyncio.fixture
+async def worker():
+    worker = OutboxWorker(session_factory=TestSessionLocal, pool_size=2, rate_per_minute=0)
+    yield worker
+    await worker.pool.close()
+
+
+async def _queue(db: AsyncSession, *addresses: str) -> list[EmailOutbox]:
+    messages = [
+        await outbox_service.enqueue_email(db, to_email=address, subject="Angebot", body="Grüß Gott!")
+        for address in addresses
+    ]
+    await db.commit()
+    return messages
+
+
+async def _statuses(db: AsyncSession) -> dict:
+    db.expire_all()
+    result = await db.execute(select(EmailOutbox.to_email, EmailOutbox.status))
+    return dict(result.all())
+
+
+@pytest.mark.asyncio
+async def test_send_endpoint_only_queues(client: AsyncClient, db_session: AsyncSession, sample_contact):
+    """Test the request path writes an outbox row without talking to SMTP."""
+    template = await email_service.create_template(
+        db_session, EmailTemplateCreate(name="Termin", subject="Termin mit {{contact.last_name}}", body="Hallo")
+    )
+
+    response = await client.post(
+        "/api/email-templates/send", json={"template_id": template.id, "contact_id": sample_contact.id}
+    )
+
+    assert response.status_code == 200
+    message = (await db_session.execute(select(EmailOutbox))).scalar_one()
+    assert message.status == OutboxStatus.PENDING
+    assert message.to_email == sample_contact.email
+    assert message.subject == "Termin mit Mustermann"
+
+
+@pytest.mark.asyncio
+async def test_worker_delivers_over_pooled_connections(db_session: AsyncSession, smtp_server, worker):
+    addresses = [f"kunde{i}@example.at" for i in range(6)]
+    await _queue(db_session, *addresses)
+
+    assert await worker.run_once() == 6
+
+    assert sorted(envelope.rcpt_tos[0] for envelope in smtp_server.messages) == sorted(addresses)
+    assert smtp_server.connections <= 2
+    assert set((await _statuses(db_session)).values()) == {OutboxStatus.SENT}
+    assert await worker.run_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_rejected_recipient_is_dead_lettered(db_session: AsyncSession, smtp_server, worker):
+    await _queue(db_session, "reject@example.at", "ok@example.at")
+
+    await worker.run_once()
+
+    statuses = await _statuses(db_session)
+    assert statuses == {"reject@example.at": OutboxStatus.DEAD, "ok@example.at": OutboxStatus.SENT}
+    dead = (await db_session.execute(select(EmailOutbox).where(EmailOutbox.status == OutboxStatus.DEAD))).scalar_one()
+    assert "SMTPRecipientsRefused" in dead.last_error
+
+
+@pytest.mark.asyncio
+async def test_history_is_written_on_delivery_only(db_session: AsyncSession, smtp_server, worker, sample_contact):
+    """Test a dead-lettered message leaves no 'gesendet' entry in the contact history."""
+    rejected = Contact(first_name="Karl", last_name="Abgelehnt", email="reject@example.at")
+    db_session.add(rejected)
+    template = await email_service.create_template(
+        db_session, EmailTemplateCreate(name="Termin", subject="Termin mit {{contact.last_name}}", body="Hallo")
+    )
+    for contact in (sample_contact, rejected):
+        await email_service.send_email(db_session, template.id, contact.id, created_by="vertrieb")
+    await db_session.commit()
+    history = select(ContactHistory).where(ContactHistory.type == HistoryType.EMAIL)
+    assert (await db_session.execute(history)).scalars().all() == []
+
+    await worker.run_once()
+
+    [entry] = (await db_session.execute(history)).scalars().all()
+    assert entry.contact_id == sample_contact.id
+    assert (entry.title, entry.content, entry.created_by) == (
+        "E-Mail gesendet: Termin mit Mustermann", "Vorlage: Termin", "vertrieb"
+    )
+    assert (await _statuses(db_session))["reject@example.at"] == OutboxStatus.DEAD
+
+
+@pytest.mark.asyncio
+async def test_unreachable_server_retries_with_backoff(db_session: AsyncSession, worker, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "smtp_host", "127.0.0.1")
+    monkeypatch.setattr(settings, "smtp_port", _free_port())
+    monkeypatch.setattr(settings, "smtp_max_attempts", 2)
+    [message] = await _queue(db_session, "later@example.at")
+
+    await worker.run_once()
+
+    await db_session.refresh(message)
+    assert message.status == OutboxStatus.PENDING
+    assert message.attempts == 1
+    assert message.next_attempt_at.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
+    assert await worker.run_once() == 0  # Not due yet
+
+    message.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await db_session.commit()
+    await worker.run_once()
+
+    await db_session.refresh(message)
+    assert message.status == OutboxStatus.DEAD
+    assert message.attempts == 2
+
+    assert await outbox_service.requeue_dead(db_session) == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_claims_are_reclaimed(db_session: AsyncSession):
+    [message] = await _queue(db_session, "stuck@example.at")
+    assert len(await outbox_service.claim_messages(db_session, 10, 300)) == 1
+    assert await outbox_service.claim_messages(db_session, 10, 300) == []
+
+    message.locked_at = datetime.now(timezone.utc) - timedelta(minutes=10)
+    await db_session.commit()
+
+    assert [m.id for m in await outbox_service.claim_messages(db_session, 10, 300)] == [message.id]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_caps_per_minute():
+    limiter = RateLimiter(per_minute=2)
+    await limiter.acquire()
+    await limiter.acquire()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(limiter.acquire(), timeout=0.05)
@@ -0,0 +1,132 @@
+"""Tests for the Prometheus metrics endpoint."""
+import pytest
+from httpx import AsyncClient
+from prometheus_client.parser import text_string_to_metric_families
+
+from src.core.metrics import record_cache
+
+
+def _samples(text: str) -> list:
+    return [
+        sample
+        for family in text_string_to_metric_families(text)
+        for sample in family.samples
+    ]
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_format(client: AsyncClient):
+    """Test /metrics serves the Prometheus text format."""
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    names = {sample.name for sample in _samples(response.text)}
+    assert "db_pool_size" in names
+    assert "db_pool_checked_out" in names
+
+
+@pytest.mark.asyncio
+async def test_request_latency_uses_route_template(client: AsyncClient):
+    """Test request latency is labelled with the route template, not the raw path."""
+    await client.get("/api/contacts/999999")
+    response = await client.get("/metrics")
+
+    routes = {
+        sample.labels.get("route")
+        for sample in _samples(response.text)
+        if sample.name == "http_request_duration_seconds_count"
+    }
+    assert "/api/contacts/{contact_id}" in routes
+    assert "/api/contacts/999999" not in routes
+
+
+@pytest.mark.asyncio
+async def test_unmatched_paths_share_one_label(client: AsyncClient):
+    """Test unknown paths don't create a label per path."""
+    await client.get("/does-not-exist/123")
+    response = await client.get("/metrics")
+
+    assert 'route="unmatched"' in response.text
+    assert "/does-not-exist/123" not in response.text
+
+
+@pytest.mark.asyncio
+async def test_statement_histogram(client: AsyncClient):
+    """Test SQL statements are recorded by operation."""
+    await client.get("/api/contacts")
+    response = await client.get("/metrics")
+
+    operations = {
+        sample.labels["operation"]
+        for sample in _samples(response.text)
+        if sample.name == "db_statement_duration_seconds_count"
+    }
+    assert "SELECT" in operations
+
+
+@pytest.mark.asyncio
+async def test_cache_counter(client: AsyncClient):
+    """Test cache lookups are counted per result."""
+    record_cache("test_cache", hit=True)
+    record_cache("test_cache", hit=False)
+    response = await client.get("/metrics")
+
+    counts = {
+        sample.labels["result"]: sample.value
+        for sample in _samples(response.text)
+        if sample.name == "cache_requests_total" and sample.labels["cache"] == "test_cache"
+    }
+    assert counts["hit"] >= 1
+    assert counts["miss"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_records_samples():
+    """Test the lag probe feeds the event-loop histogram."""
+    import asyncio
+
+    from src.core.loop_monitor import start_loop_monitor, stop_loop_monitor
+    from src.core.metrics import EVENT_LOOP_LAG_HISTOGRAM
+
+    def observed() -> float:
+        return next(
+            sample.value
+            for sample in EVENT_LOOP_LAG_HISTOGRAM.collect()[0].samples
+            if sample.name.endswith("_count")
+        )
+
+    before = observed()
+    task = start_loop_monitor(interval=0.01)
+    await asyncio.sleep(0.05)
+    await stop_loop_monitor(task)
+
+    assert observed() > before
+
+
+@pytest.mark.asyncio
+async def test_pool_wait_recorded_per_engine(tmp_path):
+    """Test connection checkouts record their wait under the engine label."""
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from src.core.database import TimedQueuePool
+    from src.core.metrics import DB_POOL_WAIT
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_logging_name="test_pool",
+    )
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        await engine.dispose()
+
+    count = next(
+        sample.value
+        for sample in DB_POOL_WAIT.collect()[0].samples
+        if sample.name.endswith("_count") and sample.labels["engine"] == "test_pool"
+    )
+    assert count >= 1
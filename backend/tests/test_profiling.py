@@ -0,0 +1,76 @@
+"""Tests for on-demand request profiling."""
+import pstats
+
+import pytest
+from httpx import AsyncClient
+
+from src.core import profiling
+from src.core.config import get_settings
+
+SECRET = "profile-secret"
+
+
+@pytest.fixture
+def profiling_on(monkeypatch, tmp_path):
+    """Enable profiling with a secret and a temporary profile directory."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "debug", True)
+    monkeypatch.setattr(settings, "profiling_secret", SECRET)
+    monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+    return tmp_path
+
+
+class TestProfilingGate:
+    """Tests for profiling_allowed."""
+
+    def test_requires_secret(self, profiling_on):
+        assert profiling.profiling_allowed(SECRET)
+        assert not profiling.profiling_allowed("wrong")
+        assert not profiling.profiling_allowed(None)
+
+    def test_disabled_without_configured_secret(self, profiling_on, monkeypatch):
+        monkeypatch.setattr(get_settings(), "profiling_secret", "")
+        assert not profiling.profiling_allowed("")
+
+    def test_disabled_outside_debug(self, profiling_on, monkeypatch):
+        monkeypatch.setattr(get_settings(), "debug", False)
+        assert not profiling.profiling_allowed(SECRET)
+
+        monkeypatch.setattr(get_settings(), "profiling_enabled", True)
+        assert profiling.profiling_allowed(SECRET)
+
+
+class TestProfilingMiddleware:
+    """Tests for profiling requests end to end."""
+
+    @pytest.mark.asyncio
+    async def test_unprofiled_request(self, client: AsyncClient, profiling_on):
+        """Requests without the header are not profiled."""
+        response = await client.get("/api/contacts")
+
+        assert "x-profile-id" not in response.headers
+        assert list(profiling_on.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_profiled_request_stores_profile(self, client: AsyncClient, sample_contact, profiling_on):
+        """A profiled request stores pstats, folded stacks and a summary with the time split."""
+        response = await client.get("/api/contacts", headers={"X-Profile": SECRET})
+
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+        assert pstats.Stats(str(profiling_on / f"{profile_id}.pstats")).total_calls > 0
+        assert (profiling_on / f"{profile_id}.folded").exists()
+
+        summary = (await client.get(f"/api/health/profiles/{profile_id}", headers={"X-Profile": SECRET})).json()
+        assert summary["path"] == "/api/contacts"
+        assert summary["db_statements"] >= 2
+        assert summary["validation_ms"] > 0
+        assert {"orm_hydration_ms", "db_ms", "top_functions"} <= set(summary)
+
+    @pytest.mark.asyncio
+    async def test_profile_routes_need_secret(self, client: AsyncClient, profiling_on):
+        """Listing and downloading profiles requires the secret."""
+        assert (await client.get("/api/health/profiles")).status_code == 404
+        assert (await client.get("/api/health/profiles", headers={"X-Profile": SECRET})).status_code == 200
+        unknown = await client.get("/api/health/profiles/../../etc/passwd", headers={"X-Profile": SECRET})
+        assert unknown.status_code == 404
@@ -0,0 +1,73 @@
+"""Tests for cached public campaign info."""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.campaign import Campaign
+from src.schemas.campaign import CampaignCreate, CampaignUpdate
+from src.services import campaign_service
+
+
+@pytest.mark.asyncio
+async def test_cached_with_etag(client: AsyncClient, sample_campaign: Campaign, assert_max_queries):
+    first = await client.get(f"/api/public/campaigns/{sample_campaign.id}")
+
+    assert first.status_code == 200
+    assert first.json() == {
+        "id": sample_campaign.id,
+        "name": "Winter Kampagne 2026",
+        "description": "Testkampagne für Q1",
+        "lead_magnet": None,
+    }
+    assert first.headers["Cache-Control"] == "public, max-age=60"
+    etag = first.headers["ETag"]
+
+    with assert_max_queries(0):
+        again = await client.get(f"/api/public/campaigns/{sample_campaign.id}")
+        revalidated = await client.get(
+            f"/api/public/campaigns/{sample_campaign.id}", headers={"If-None-Match": etag}
+        )
+
+    assert again.json() == first.json()
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert revalidated.content == b""
+
+
+@pytest.mark.asyncio
+async def test_update_invalidates(client: AsyncClient, db_session: AsyncSession, sample_campaign: Campaign):
+    etag = (await client.get(f"/api/public/campaigns/{sample_campaign.id}")).headers["ETag"]
+
+    await campaign_service.update_campaign(db_session, sample_campaign.id, CampaignUpdate(lead_magnet="checkliste.pdf"))
+    # Until the edit commits, the cached info stays, so no request re-caches the old row
+    assert (await client.get(f"/api/public/campaigns/{sample_campaign.id}")).headers["ETag"] == etag
+    await db_session.commit()
+    response = await client.get(f"/api/public/campaigns/{sample_campaign.id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.json()["lead_magnet"] == "checkliste.pdf"
+    assert response.headers["ETag"] != etag
+
+    await campaign_service.update_campaign(db_session, sample_campaign.id, CampaignUpdate(is_active=False))
+    await db_session.commit()
+    assert (await client.get(f"/api/public/campaigns/{sample_campaign.id}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_missing_campaign_is_negative_cached(
+    client: AsyncClient, db_session: AsyncSession, assert_max_queries
+):
+    missing = await client.get("/api/public/campaigns/1")
+
+    with assert_max_queries(0):
+        again = await client.get("/api/public/campaigns/1")
+
+    assert missing.status_code == again.status_code == 404
+    assert again.headers["Cache-Control"] == "public, max-age=30"
+
+    campaign = await campaign_service.create_campaign(
+        db_session, CampaignCreate(name="Frühling", type="landing_page")
+    )
+    assert campaign.id == 1
+    await db_session.commit()
+    assert (await client.get("/api/public/campaigns/1")).status_code == 200
@@ -0,0 +1,104 @@
+"""Tests for idempotent public form submissions."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import lead_intake
+from src.core.config import get_settings
+from src.models.contact_history import ContactHistory
+from src.models.lead import Lead
+from src.models.lead_intake import LeadIntake
+from src.models.submission_key import SubmissionKey
+from src.schemas.lead import LeadCreateFromForm
+from src.services import submission_service
+
+FORM = {
+    "first_name": "Max",
+    "last_name": "Mustermann",
+    "email": "max@example.at",
+    "utm_source": "meta",
+}
+
+
+async def _count(db: AsyncSession, model) -> int:
+    await db.flush()
+    return (await db.execute(select(func.count()).select_from(model))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_double_submit_creates_one_lead(client: AsyncClient, db_session: AsyncSession, assert_max_queries):
+    first = await client.post("/api/public/leads", json=FORM)
+
+    with assert_max_queries(1):
+        repeat = await client.post("/api/public/leads", json={**FORM, "email": "MAX@example.at "})
+
+    assert first.status_code == repeat.status_code == 201
+    assert repeat.json() == first.json()
+    assert repeat.headers["Idempotent-Replayed"] == "true"
+    assert await _count(db_session, Lead) == 1
+    assert await _count(db_session, ContactHistory) == 1
+
+
+@pytest.mark.asyncio
+async def test_different_utm_is_a_new_lead(client: AsyncClient, db_session: AsyncSession):
+    await client.post("/api/public/leads", json=FORM)
+    response = await client.post("/api/public/leads", json={**FORM, "utm_source": "google"})
+
+    assert "Idempotent-Replayed" not in response.headers
+    assert await _count(db_session, Lead) == 2
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_replays_after_dedup_window(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    monkeypatch.setattr(get_settings(), "submission_dedup_seconds", 0)
+    headers = {"Idempotency-Key": "4f1c9a"}
+
+    await client.post("/api/public/leads", json=FORM, headers=headers)
+    replayed = await client.post("/api/public/leads", json=FORM, headers=headers)
+    fresh = await client.post("/api/public/leads", json=FORM)
+
+    assert replayed.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in fresh.headers
+    assert await _count(db_session, Lead) == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_key_is_taken_over(client: AsyncClient, db_session: AsyncSession):
+    await client.post("/api/public/leads", json=FORM)
+    await db_session.execute(
+        update(SubmissionKey).values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+
+    response = await client.post("/api/public/leads", json=FORM)
+
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response.headers
+    assert await _count(db_session, Lead) == 2
+    assert await _count(db_session, SubmissionKey) == 1
+
+
+@pytest.mark.asyncio
+async def test_queued_submission_replays_202(client: AsyncClient, db_session: AsyncSession, monkeypatch):
+    monkeypatch.setattr(get_settings(), "lead_intake_async", True)
+    monkeypatch.setattr(lead_intake, "_depth", [float("-inf"), 0])
+
+    first = await client.post("/api/public/leads", json=FORM)
+    repeat = await client.post("/api/public/leads", json=FORM)
+
+    assert first.status_code == repeat.status_code == 202
+    assert repeat.headers["Idempotent-Replayed"] == "true"
+    assert await _count(db_session, LeadIntake) == 1
+
+
+@pytest.mark.asyncio
+async def test_claim_fails_for_held_key(db_session: AsyncSession):
+    keys = submission_service.submission_keys(LeadCreateFromForm(**FORM), "abc", 60, 60)
+
+    assert await submission_service.claim_keys(db_session, keys, 201, {"status": "success"})
+    assert not await submission_service.claim_keys(db_session, keys, 201, {"status": "success"})
+    assert (await submission_service.find_response(db_session, list(keys))).kind == "idempotency"
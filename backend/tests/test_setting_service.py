@@ -9,6 +9,7 @@ from src.schemas.setting import (
     SettingUpdate,
     LookupValueCreate,
     LookupValueUpdate,
+    LookupValueBulkItem,
 )
 from src.services import setting_service
 from src.services.seed_service import seed_lookup_values, get_seed_statistics, DEFAULT_LOOKUP_VALUES
@@ -289,6 +290,106 @@ class TestLookupValueService:
         assert lv1.sort_order == 1
         assert lv2.sort_order == 2
 
+    @pytest.mark.asyncio
+    async def test_reorder_lookup_values_reports_unknown_and_foreign_ids(self, db_session):
+        """Test reorder_lookup_values skips and reports IDs outside the category."""
+        lv1 = LookupValue(category="reorder_mix", value="v1", label="L1", sort_order=5)
+        other = LookupValue(category="elsewhere", value="v1", label="Other", sort_order=7)
+        db_session.add_all([lv1, other])
+        await db_session.commit()
+
+        result = await setting_service.reorder_lookup_values(
+            db_session, "reorder_mix", [other.id, 99999, lv1.id]
+        )
+
+        assert result.affected == 1
+        assert result.unknown_ids == [99999]
+        assert result.foreign_ids == [other.id]
+
+        await db_session.refresh(lv1)
+        await db_session.refresh(other)
+        assert lv1.sort_order == 2
+        assert other.sort_order == 7
+
+    @pytest.mark.asyncio
+    async def test_set_lookup_values_active(self, db_session):
+        """Test set_lookup_values_active toggles only values of the category."""
+        lv1 = LookupValue(category="bulk_status", value="v1", label="L1", is_active=True)
+        lv2 = LookupValue(category="bulk_status", value="v2", label="L2", is_active=True)
+        other = LookupValue(category="not_bulk_status", value="v3", label="L3", is_active=True)
+        db_session.add_all([lv1, lv2, other])
+        await db_session.commit()
+
+        result = await setting_service.set_lookup_values_active(
+            db_session, "bulk_status", [lv1.id, lv2.id, other.id], is_active=False
+        )
+
+        assert result.affected == 2
+        assert result.foreign_ids == [other.id]
+        lookups = await setting_service.get_lookup_values(db_session, "bulk_status")
+        assert lookups == []
+        await db_session.refresh(other)
+        assert other.is_active is True
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_lookup_values_skips_existing(self, db_session):
+        """Test bulk_create_lookup_values inserts new values and reports existing ones."""
+        existing = LookupValue(category="bulk_create", value="a", label="A")
+        db_session.add(existing)
+        await db_session.commit()
+
+        items = [
+            LookupValueBulkItem(value="a", label="A again"),
+            LookupValueBulkItem(value="b", label="B", sort_order=1),
+            LookupValueBulkItem(value="c", label="C", sort_order=2),
+            LookupValueBulkItem(value="c", label="C twice"),
+        ]
+        result = await setting_service.bulk_create_lookup_values(db_session, "bulk_create", items)
+
+        assert result.affected == 2
+        assert sorted(result.skipped_values) == ["a", "c"]
+        lookups = await setting_service.get_lookup_values(db_session, "bulk_create")
+        assert [lv.value for lv in lookups] == ["a", "b", "c"]
+        assert lookups[2].label == "C"
+
+    @pytest.mark.asyncio
+    async def test_import_lookup_values_upserts_rows(self, db_session):
+        """Test import_lookup_values inserts new rows, updates existing ones and reports errors."""
+        existing = LookupValue(category="import_cat", value="wien", label="Old", sort_order=9)
+        db_session.add(existing)
+        await db_session.commit()
+
+        content = (
+            "Wert;Bezeichnung;Reihenfolge;Aktiv\n"
+            "wien;Wien;0;ja\n"
+            "graz;Graz;;nein\n"
+            ";Ohne Wert;;\n"
+        ).encode("utf-8")
+        result = await setting_service.import_lookup_values(db_session, "import_cat", content)
+
+        assert result.affected == 2
+        assert len(result.errors) == 1
+        assert result.errors[0].startswith("Row 4")
+
+        db_session.expire_all()
+        lookups = await setting_service.get_lookup_values(
+            db_session, "import_cat", include_inactive=True
+        )
+        by_value = {lv.value: lv for lv in lookups}
+        assert by_value["wien"].label == "Wien"
+        assert by_value["wien"].sort_order == 0
+        assert by_value["graz"].sort_order == 1
+        assert by_value["graz"].is_active is False
+
+    @pytest.mark.asyncio
+    async def test_import_lookup_values_missing_columns(self, db_session):
+        """Test import_lookup_values rejects files without value and label columns."""
+        result = await setting_service.import_lookup_values(
+            db_session, "import_cat", b"name,description\nx,y\n"
+        )
+        assert result.affected == 0
+        assert "Required columns" in result.errors[0]
+
 
 class TestSeedService:
     """Tests for seed_service functions."""
@@ -0,0 +1,77 @@
+"""Tests for the slow-statement log."""
+import pytest
+from httpx import AsyncClient
+
+from src.api.routes import health
+from src.core import slow_queries
+from src.core.config import get_settings
+from src.services import contact_service
+
+
+@pytest.fixture
+def log_everything(monkeypatch):
+    """Treat every statement as slow and start with an empty buffer."""
+    monkeypatch.setattr(get_settings(), "slow_query_threshold_ms", 0.0001)
+    slow_queries.clear_slow_queries()
+    yield
+    slow_queries.clear_slow_queries()
+
+
+class TestSlowStatementLog:
+    """Tests for recording and grouping slow statements."""
+
+    @pytest.mark.asyncio
+    async def test_records_calling_service(self, db_session, sample_contact, log_everything):
+        """Entries name the service function that issued the statement."""
+        await contact_service.get_contact(db_session, sample_contact.id)
+
+        report = slow_queries.slow_query_report()
+        assert any("contact_service.get_contact" in group["services"] for group in report)
+
+    @pytest.mark.asyncio
+    async def test_groups_by_fingerprint(self, db_session, sample_contact, log_everything):
+        """Repeated executions of one statement shape form a single group."""
+        for _ in range(3):
+            await contact_service.get_contact(db_session, sample_contact.id)
+
+        report = slow_queries.slow_query_report()
+        group = next(g for g in report if "FROM contacts" in g["statement"])
+        assert group["count"] == 3
+        assert group["param_types"] == ["int"]
+        assert group["max_ms"] >= group["avg_ms"]
+
+    @pytest.mark.asyncio
+    async def test_threshold_disables_logging(self, db_session, sample_contact, monkeypatch):
+        """A threshold of 0 records nothing."""
+        monkeypatch.setattr(get_settings(), "slow_query_threshold_ms", 0)
+        slow_queries.clear_slow_queries()
+
+        await contact_service.get_contact(db_session, sample_contact.id)
+
+        assert slow_queries.slow_query_report() == []
+
+
+class TestSlowQueriesEndpoint:
+    """Tests for GET /api/health/slow-queries."""
+
+    @pytest.mark.asyncio
+    async def test_hidden_outside_debug(self, client: AsyncClient, monkeypatch):
+        """The endpoint is not available in production mode."""
+        monkeypatch.setattr(health.settings, "debug", False)
+
+        response = await client.get("/api/health/slow-queries")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_lists_worst_offenders(self, client: AsyncClient, sample_contact, log_everything, monkeypatch):
+        """Debug mode shows grouped statements."""
+        monkeypatch.setattr(health.settings, "debug", True)
+        await client.get(f"/api/contacts/{sample_contact.id}")
+
+        response = await client.get("/api/health/slow-queries")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["statements"]
+        assert {"fingerprint", "statement", "count", "total_ms", "services"} <= set(data["statements"][0])
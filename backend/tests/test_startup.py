@@ -0,0 +1,65 @@
+"""Tests for the coordinated startup."""
+import pytest
+from sqlalchemy import select
+
+from src.core.startup import (
+    STARTUP_MARKER_KEY,
+    coordinate_startup,
+    get_alembic_heads,
+    get_startup_fingerprint,
+)
+from src.models.lookup_value import LookupValue
+from src.models.setting import Setting
+from src.models.system_marker import SystemMarker
+from src.services.seed_service import DEFAULT_LOOKUP_VALUES
+from tests.conftest import TestSessionLocal
+
+
+class TestCoordinateStartup:
+    """Tests for coordinate_startup."""
+
+    @pytest.mark.asyncio
+    async def test_first_run_seeds_and_stores_fingerprint(self, db_session):
+        """The first worker prepares the database and records a fingerprint."""
+        report = await coordinate_startup(TestSessionLocal)
+
+        assert report["skipped"] is False
+        assert report["schema"] == "created"
+        assert report["seeded"] == sum(len(v) for v in DEFAULT_LOOKUP_VALUES.values())
+        assert report["duration_ms"] >= 0
+
+        marker = await db_session.execute(
+            select(SystemMarker.value).where(SystemMarker.key == STARTUP_MARKER_KEY)
+        )
+        assert marker.scalar_one() == get_startup_fingerprint(get_alembic_heads())
+        settings = await db_session.execute(select(Setting.key))
+        assert settings.scalars().all() == []
+
+    @pytest.mark.asyncio
+    async def test_later_workers_skip(self, db_session):
+        """Workers that find a matching fingerprint do no startup work."""
+        await coordinate_startup(TestSessionLocal)
+        report = await coordinate_startup(TestSessionLocal)
+
+        assert report["skipped"] is True
+        assert report["seeded"] == 0
+
+    @pytest.mark.asyncio
+    async def test_changed_fingerprint_reseeds_missing_values(self, db_session):
+        """A stale fingerprint triggers seeding of only the missing values."""
+        await coordinate_startup(TestSessionLocal)
+        async with TestSessionLocal() as session:
+            marker = await session.execute(
+                select(SystemMarker).where(SystemMarker.key == STARTUP_MARKER_KEY)
+            )
+            marker.scalar_one().value = "stale"
+            lookup = await session.execute(
+                select(LookupValue).where(LookupValue.category == "country", LookupValue.value == "LI")
+            )
+            await session.delete(lookup.scalar_one())
+            await session.commit()
+
+        report = await coordinate_startup(TestSessionLocal)
+
+        assert report["skipped"] is False
+        assert report["seeded"] == 1
@@ -0,0 +1,151 @@
+"""Tests for request, service and SQL tracing."""
+import json
+import logging
+
+import pytest
+from httpx import AsyncClient
+
+from src.core import tracing
+from src.core.config import get_settings
+from src.models.lead import Lead, LeadStatus
+
+
+@pytest.fixture
+def tracing_on(monkeypatch):
+    """Trace every request into the in-memory collector."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "tracing_enabled", True)
+    monkeypatch.setattr(settings, "tracing_exporter", "memory")
+    monkeypatch.setattr(settings, "tracing_sample_rate", 1.0)
+    tracing.instrument_services()
+    tracing.clear_collected_spans()
+    yield
+    tracing.clear_collected_spans()
+
+
+def test_parse_traceparent():
+    trace_id, span_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+    assert tracing.parse_traceparent(f"00-{trace_id}-{span_id}-01") == (trace_id, span_id, True)
+    assert tracing.parse_traceparent(f"00-{trace_id}-{span_id}-00") == (trace_id, span_id, False)
+    assert tracing.parse_traceparent("garbage") is None
+    assert tracing.parse_traceparent(f"00-{'0' * 32}-{span_id}-01") is None
+
+
+@pytest.mark.asyncio
+async def test_disabled_by_default(client: AsyncClient):
+    response = await client.get("/api/contacts")
+
+    assert "x-request-id" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_request_service_and_statement_spans(client: AsyncClient, db_session, sample_lead, tracing_on):
+    """Converting a lead yields the route span, the service span and one span per statement."""
+    sample_lead.status = LeadStatus.HOT
+    await db_session.flush()
+
+    response = await client.post(
+        f"/api/opportunities/convert/{sample_lead.id}",
+        json={"name": "Website-Relaunch"},
+        headers={"X-Request-ID": "req-123"},
+    )
+
+    assert response.status_code == 201
+    assert response.headers["x-request-id"] == "req-123"
+    spans = tracing.collected_spans()
+    root = next(span for span in spans if span["parent_span_id"] is None)
+    assert root["name"] == "POST /api/opportunities/convert/{lead_id}"
+    assert root["kind"] == "SERVER"
+    assert root["attributes"]["http.request_id"] == "req-123"
+    assert root["attributes"]["http.response.status_code"] == 201
+    assert response.headers["traceparent"] == f"00-{root['trace_id']}-{root['span_id']}-01"
+
+    service = next(span for span in spans if span["name"] == "opportunity_service.convert_lead_to_opportunity")
+    assert service["parent_span_id"] == root["span_id"]
+    statements = [span for span in spans if span["parent_span_id"] == service["span_id"]]
+    selects = [span for span in statements if span["attributes"]["db.operation"] == "SELECT"]
+    assert len(selects) >= 4
+    assert all(span["kind"] == "CLIENT" for span in statements)
+    assert all("db.rows" in span["attributes"] for span in selects)
+    assert all(span["end_time_unix_nano"] >= span["start_time_unix_nano"] for span in spans)
+    assert {span["trace_id"] for span in spans} == {root["trace_id"]}
+
+
+@pytest.mark.asyncio
+async def test_incoming_traceparent_continues_trace(client: AsyncClient, tracing_on):
+    trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+
+    response = await client.get("/api/contacts", headers={"traceparent": f"00-{trace_id}-{parent_id}-01"})
+
+    root = next(span for span in tracing.collected_spans(trace_id) if span["kind"] == "SERVER")
+    assert root["parent_span_id"] == parent_id
+    assert response.headers["x-request-id"] == root["attributes"]["http.request_id"]
+
+
+@pytest.mark.asyncio
+async def test_unsampled_requests_are_not_traced(client: AsyncClient, tracing_on, monkeypatch):
+    monkeypatch.setattr(get_settings(), "tracing_sample_rate", 0.0)
+
+    response = await client.get("/api/contacts")
+    echoed = await client.get("/api/contacts", headers={"X-Request-ID": "req-456"})
+
+    assert response.status_code == 200
+    assert response.headers["x-request-id"]
+    assert "traceparent" not in response.headers
+    assert echoed.headers["x-request-id"] == "req-456"
+    assert tracing.collected_spans() == []
+
+
+def test_request_id_log_filter():
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+    token = tracing._request_id.set("req-789")
+    try:
+        tracing.RequestIdLogFilter().filter(record)
+    finally:
+        tracing._request_id.reset(token)
+
+    assert record.request_id == "req-789"
+
+
+@pytest.mark.asyncio
+async def test_statement_attributes_configurable(client: AsyncClient, sample_contact, tracing_on, monkeypatch):
+    monkeypatch.setattr(get_settings(), "tracing_record_statements", False)
+    monkeypatch.setattr(get_settings(), "tracing_record_rows", False)
+
+    await client.get("/api/contacts")
+
+    statements = [span for span in tracing.collected_spans() if span["kind"] == "CLIENT"]
+    assert statements
+    assert all("db.statement" not in span["attributes"] for span in statements)
+    assert all("db.rows" not in span["attributes"] for span in statements)
+
+
+@pytest.mark.asyncio
+async def test_failing_service_marks_span_as_error(db_session, tracing_on):
+    async def explode(db):
+        await db.get(Lead, 1)
+        raise ValueError("kaputt")
+
+    with tracing.start_trace("job") as root:
+        with pytest.raises(ValueError):
+            await tracing.traced(explode, "job.explode")(db_session)
+
+    spans = tracing.collected_spans(root["trace_id"])
+    failed = next(span for span in spans if span["name"] == "job.explode")
+    assert failed["status"] == {"code": "ERROR", "message": "ValueError: kaputt"}
+
+
+def test_jsonl_exporter(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(get_settings(), "tracing_exporter", "jsonl")
+    monkeypatch.setattr(get_settings(), "tracing_file", str(path))
+
+    with tracing.start_trace("job", request_id="abc") as root:
+        with tracing.start_span("step", attributes={"items": 3}):
+            pass
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["name"] for record in records] == ["step", "job"]
+    assert records[0]["parent_span_id"] == root["span_id"]
+    assert records[0]["attributes"] == {"items": 3}
+    assert records[1]["resource"]["service.name"] == get_settings().app_name
@@ -0,0 +1,102 @@
+"""Helpers for capturing and inspecting PostgreSQL query plans."""
+import json
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+
+
+async def capture_plans(db: AsyncSession, service_call, *args, **kwargs) -> list[dict]:
+    """
+    Run a service call and EXPLAIN every SELECT it issued.
+
+    Returns:
+        One {"statement": ..., "plan": ...} dict per SELECT, in execution
+        order; "plan" is the root node of EXPLAIN (FORMAT JSON).
+    """
+    statements = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    sync_engine = db.get_bind()
+    event.listen(sync_engine, "before_cursor_execute", collect)
+    try:
+        await service_call(db, *args, **kwargs)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", collect)
+
+    conn = await db.connection()
+    captured = []
+    for statement, parameters in statements:
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        captured.append({"statement": statement, "plan": plan[0]["Plan"]})
+    return captured
+
+
+def find_plan(captured: list[dict], fragment: str) -> dict:
+    """The plan of the first captured statement containing `fragment`."""
+    for entry in captured:
+        if fragment in entry["statement"]:
+            return entry["plan"]
+    raise AssertionError(f"No captured statement contains {fragment!r}")
+
+
+def iter_nodes(plan: dict) -> Iterator[dict]:
+    """All nodes of a plan tree, depth first."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_nodes(child)
+
+
+def seq_scanned_tables(plan: dict) -> set[str]:
+    """Tables read with a sequential scan."""
+    return {node["Relation Name"] for node in iter_nodes(plan) if node["Node Type"] == "Seq Scan"}
+
+
+def indexed_tables(plan: dict) -> set[str]:
+    """Tables read through an index."""
+    return {
+        node["Relation Name"]
+        for node in iter_nodes(plan)
+        if node["Node Type"] in INDEX_NODES and "Relation Name" in node
+    }
+
+
+async def seq_scan_cost(db: AsyncSession, table: str) -> float:
+    """Estimated cost of reading a whole table, the reference for cost ceilings."""
+    conn = await db.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) SELECT * FROM {table}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]["Total Cost"]
+
+
+def assert_uses_index(plan: dict, table: str) -> None:
+    assert table in indexed_tables(plan), f"{table} not read through an index:\n{describe(plan)}"
+
+
+def assert_no_seq_scan(plan: dict, tables: set[str]) -> None:
+    scanned = seq_scanned_tables(plan) & tables
+    assert not scanned, f"Sequential scan on {sorted(scanned)}:\n{describe(plan)}"
+
+
+def assert_cost_below(plan: dict, ceiling: float) -> None:
+    assert plan["Total Cost"] <= ceiling, (
+        f"Estimated cost {plan['Total Cost']:.0f} above {ceiling:.0f}:\n{describe(plan)}"
+    )
+
+
+def describe(plan: dict, depth: int = 0) -> str:
+    """Compact text rendering of a plan for assertion messages."""
+    node = plan["Node Type"]
+    target = plan.get("Index Name") or plan.get("Relation Name") or ""
+    line = f"{'  ' * depth}{node} {target} (cost={plan['Total Cost']:.0f} rows={plan['Plan Rows']})"
+    return "\n".join([line] + [describe(child, depth + 1) for child in plan.get("Plans", [])])
@@ -0,0 +1,153 @@
+"""Query-plan regression tests for list, search and stats queries.
+
+Each test runs a service function against the seeded PostgreSQL database,
+EXPLAINs the statements it issued and checks index usage, sequential scans
+on large tables and the estimated cost. Ceilings are relative to a full
+scan of the table, so they hold at any dataset size.
+
+Known index gaps are marked xfail; remove the marker with the index.
+"""
+import pytest
+
+from src.models.lead import LeadStatus
+from src.services import (
+    contact_service,
+    history_service,
+    lead_service,
+    opportunity_service,
+    task_service,
+)
+from tests_pg.conftest import LARGE_TABLES
+from tests_pg.plans import (
+    assert_cost_below,
+    assert_no_seq_scan,
+    assert_uses_index,
+    capture_plans,
+    find_plan,
+    seq_scan_cost,
+)
+
+
+class TestContactQueries:
+    """Plans of contact_service queries."""
+
+    @pytest.mark.asyncio
+    async def test_contact_list_reads_name_index(self, pg_session):
+        """The default list sorted by name walks the last_name index."""
+        captured = await capture_plans(pg_session, contact_service.get_contacts)
+
+        plan = find_plan(captured, "ORDER BY contacts.last_name")
+        assert_uses_index(plan, "contacts")
+        assert_no_seq_scan(plan, LARGE_TABLES)
+
+    @pytest.mark.asyncio
+    async def test_contact_list_loads_companies_by_key(self, pg_session):
+        """The eager load of companies is a primary-key lookup."""
+        captured = await capture_plans(pg_session, contact_service.get_contacts)
+
+        plan = find_plan(captured, "FROM companies")
+        assert_uses_index(plan, "companies")
+
+    @pytest.mark.asyncio
+    async def test_contact_detail_is_key_lookup(self, pg_session):
+        """Loading one contact never scans a large table."""
+        captured = await capture_plans(pg_session, contact_service.get_contact, 1234)
+
+        ceiling = await seq_scan_cost(pg_session, "contacts") * 0.1
+        for entry in captured:
+            assert_no_seq_scan(entry["plan"], LARGE_TABLES)
+            assert_cost_below(entry["plan"], ceiling)
+
+    @pytest.mark.asyncio
+    @pytest.mark.xfail(reason="Substring ILIKE needs a pg_trgm index on contact names")
+    async def test_autocomplete_search_avoids_seq_scan(self, pg_session):
+        """Autocomplete search is served from an index."""
+        captured = await capture_plans(pg_session, contact_service.search_contacts, "grub")
+
+        assert_no_seq_scan(find_plan(captured, "FROM contacts"), LARGE_TABLES)
+
+
+class TestHistoryQueries:
+    """Plans of history_service queries."""
+
+    @pytest.mark.asyncio
+    async def test_contact_history_uses_contact_index(self, pg_session):
+        """History of one contact is read through the contact_id index."""
+        captured = await capture_plans(pg_session, history_service.get_contact_history, 4321)
+
+        ceiling = await seq_scan_cost(pg_session, "contact_history") * 0.1
+        for entry in captured:
+            assert_uses_index(entry["plan"], "contact_history")
+            assert_no_seq_scan(entry["plan"], LARGE_TABLES)
+            assert_cost_below(entry["plan"], ceiling)
+
+
+class TestTaskQueries:
+    """Plans of task_service queries."""
+
+    @pytest.mark.asyncio
+    async def test_overdue_tasks_use_due_date_index(self, pg_session):
+        """Overdue tasks are found through the due_date index."""
+        captured = await capture_plans(pg_session, task_service.get_tasks, is_overdue=True)
+
+        plan = find_plan(captured, "ORDER BY tasks.due_date")
+        assert_uses_index(plan, "tasks")
+        assert_no_seq_scan(plan, LARGE_TABLES)
+
+    @pytest.mark.asyncio
+    async def test_overdue_count_stays_below_full_scan(self, pg_session):
+        """Counting overdue tasks costs at most one pass over the table."""
+        captured = await capture_plans(pg_session, task_service.get_tasks, is_overdue=True)
+
+        ceiling = await seq_scan_cost(pg_session, "tasks") * 1.5
+        assert_cost_below(find_plan(captured, "count(tasks.id)"), ceiling)
+
+    @pytest.mark.asyncio
+    async def test_task_contacts_loaded_by_key(self, pg_session):
+        """The eager load of task contacts is a primary-key lookup."""
+        captured = await capture_plans(pg_session, task_service.get_tasks, is_overdue=True)
+
+        plan = find_plan(captured, "FROM contacts")
+        assert_uses_index(plan, "contacts")
+        assert_no_seq_scan(plan, LARGE_TABLES)
+
+    @pytest.mark.asyncio
+    @pytest.mark.xfail(reason="tasks.contact_id has no index")
+    async def test_tasks_of_contact_use_index(self, pg_session):
+        """Tasks of one contact are read through an index."""
+        captured = await capture_plans(pg_session, task_service.get_tasks, contact_id=4321)
+
+        assert_no_seq_scan(find_plan(captured, "FROM tasks"), LARGE_TABLES)
+
+
+class TestLeadQueries:
+    """Plans of lead_service queries."""
+
+    @pytest.mark.asyncio
+    async def test_leads_by_status_use_status_index(self, pg_session):
+        """A selective status filter uses the status index."""
+        captured = await capture_plans(pg_session, lead_service.get_leads, status=LeadStatus.DISQUALIFIED)
+
+        assert_uses_index(find_plan(captured, "count(leads.id)"), "leads")
+
+    @pytest.mark.asyncio
+    @pytest.mark.xfail(reason="leads.created_at has no index for the newest-first list")
+    async def test_lead_list_avoids_seq_scan(self, pg_session):
+        """The newest-first lead list is read from an index."""
+        captured = await capture_plans(pg_session, lead_service.get_leads)
+
+        assert_no_seq_scan(find_plan(captured, "ORDER BY leads.created_at"), LARGE_TABLES)
+
+
+class TestStatsQueries:
+    """Plans of aggregate queries."""
+
+    @pytest.mark.asyncio
+    async def test_pipeline_stats_single_pass(self, pg_session):
+        """Every pipeline aggregate reads opportunities at most once."""
+        captured = await capture_plans(pg_session, opportunity_service.get_pipeline_stats)
+
+        ceiling = await seq_scan_cost(pg_session, "opportunities") * 1.5
+        assert captured
+        for entry in captured:
+            assert_cost_below(entry["plan"], ceiling)